@@ -1,4 +1,11 @@
 from .pckg.source.cv_numbering import CentralVertexNumbering
+from .pckg.source.double_cvn import SSACycleDoubleCVN
 from .pckg.source.linear_formula import LinearFormula
 from .pckg.source.linear_relation import LinearRelation
 from .pckg.source.ntr_sequence import NTermRecursionSequence
+from .pckg.source.relation_set import RelationSet
+from .pckg.source.verifier import (
+    LabelingReport, verify_labeling, verify_total_labeling, verify_file)
+from .pckg.source.sweep import sweep
+from .pckg.source.pattern_verifier import verify_pattern
+from .pckg.source.search import search
@@ -1,3 +1,7 @@
+import heapq
+
+import numpy as np
+
 from .linear_formula import LinearFormula
 from .ntr_sequence import NTermRecursionSequence
 from .linear_relation import LinearRelation
@@ -54,6 +58,7 @@ class CentralVertexNumbering():
                 left_len=left_len,
                 right_len=right_len,
             )
+            self.set_cache_size(other_pattern._cache_size)
 
         # init with formulas and sequences
         elif len(args) == 3:
@@ -116,6 +121,13 @@ class CentralVertexNumbering():
             except KeyError:
                 pass
 
+            # the cache of <evaluate> is disabled by default
+            self.cache_hits = 0
+            self.cache_misses = 0
+            self.set_cache_size(0)
+
+            self._clear_cache()
+
         # raise error if the arguments cannot be interpreted
         else:
             raise TypeError('cannot interpret the arguments')
@@ -152,6 +164,11 @@ class CentralVertexNumbering():
             and self.right_seq == other.right_seq
         )
 
+    def __hash__(self):
+        # equal patterns have equal canonical keys, but patterns with equal
+        # canonical keys are not necessarily equal (see <equivalent>)
+        return hash(self.get_canonical_key())
+
     #-------------------------------------------------------------------------
 
 
@@ -164,6 +181,7 @@ class CentralVertexNumbering():
         self.center.zip(inplace=True)
         self.left_seq.zip(inplace=True)
         self.right_seq.zip(inplace=True)
+        self._clear_cache()
 
     @misc.inplace(default=False)
     def substitute(self, only_sequences=False, recursive=False, **kwargs):
@@ -197,6 +215,7 @@ class CentralVertexNumbering():
             inplace=True,
             formulas_only=only_sequences
         )
+        self._clear_cache()
 
     @misc.inplace(default=False)
     def reverse(self):
@@ -205,6 +224,7 @@ class CentralVertexNumbering():
         temp_seq = self.left_seq.copy()
         self.left_seq = self.right_seq.copy()
         self.right_seq = temp_seq
+        self._clear_cache()
 
     @misc.inplace(default=False)
     def set_lengths(self, l_len, r_len):
@@ -212,6 +232,7 @@ class CentralVertexNumbering():
 
         self.left_seq.set_length(LinearFormula(l_len), inplace=True)
         self.right_seq.set_length(LinearFormula(r_len), inplace=True)
+        self._clear_cache()
 
     @misc.inplace(default=False)
     def set_ntuple_index(self, variable):
@@ -224,6 +245,75 @@ class CentralVertexNumbering():
         self.left_seq.set_ntuple_index(variable, inplace=True)
         self.right_seq.set_ntuple_index(variable, inplace=True)
         self.ntuple_index = variable
+        self._clear_cache()
+
+    @misc.inplace(default=False)
+    def canonize(self):
+        """Transforms the pattern to it's canonical form"""
+        # the formulas are zipped, the sequences are minimized and ordered as
+        # in <get_canonical_key>, and the <ntuple_index> variable is renamed
+        # to 'i' (unless it is a global variable), so that equivalent
+        # patterns have the same canonical form.
+        # The segments of every formula are sorted - <ntuple_index> first,
+        # then the other variables in alphabetical order and the constant
+
+        self.zip(inplace=True)
+        self.left_seq.minimize(inplace=True)
+        self.right_seq.minimize(inplace=True)
+
+        _, left_key, right_key = self._get_keys()
+        if right_key < left_key:
+            self.reverse(inplace=True)
+
+        if 'i' not in self.get_variables(global_only=True):
+            self.set_ntuple_index('i', inplace=True)
+
+        def sort(formula):
+            segments = sorted(
+                zip(formula.variables, formula.multipliers),
+                key=lambda segment: (
+                    segment[0] != self.ntuple_index,
+                    segment[0] == '',
+                    segment[0]
+                )
+            )
+            return LinearFormula(
+                [multiplier for _, multiplier in segments],
+                [variable for variable, _ in segments]
+            )
+
+        self.center = sort(self.center)
+        for seq in (self.left_seq, self.right_seq):
+            seq.formulas = [sort(formula) for formula in seq.formulas]
+            seq.length = sort(seq.length)
+            seq._clear_cache()
+
+        self._clear_cache()
+
+    #-------------------------------------------------------------------------
+
+
+    #-CACHE-------------------------------------------------------------------
+
+    # The formulas of the edges (see <edges>) and the canonical key (see
+    # <get_canonical_key>) are computed once and reused
+    # until the pattern is modified by one of the modifiers above (modifying
+    # the formulas or the sequences directly requires calling
+    # <_clear_cache>).
+    # The values returned by <evaluate> can be kept in a bounded LRU cache
+    # (see <set_cache_size> and <misc.cached>), which is emptied in the same
+    # way.
+
+    def set_cache_size(self, size):
+        """Sets the maximal number of the values kept in the cache of
+        <evaluate>, 0 disables the cache"""
+        misc.set_cache_size(self, size)
+
+    def _clear_cache(self):
+        """Forgets the data computed from the formulas of the pattern"""
+        self._edges = None
+        self._canonical_key = None
+        self._cache.clear()
 
     #-------------------------------------------------------------------------
 
@@ -261,6 +351,7 @@ class CentralVertexNumbering():
         """Returns a copy of <self>"""
         return CentralVertexNumbering(self)
 
+    @misc.cached
     def evaluate(self, index):
         """Returns: the <index>-th right number if <index> > 0,
                     the <-index>-th left number if <index> < 0,
@@ -273,6 +364,177 @@ class CentralVertexNumbering():
         elif index < 0:
             return self.left_seq.evaluate(-index - 1)
 
+    def actualize(self, n, **values):
+        """Returns a numpy array (of type int64) with the numbers assigned to
+        the vertices v_0, v_1, ..., v_n-1 of the cycle of length <n>, given
+        the <values> of the global variables"""
+        # the lengths of the left and right-hand sequences have to add up to
+        # 'n - 1', the central number is assigned to v_0, the right-hand
+        # sequence to v_1, v_2, ... and the left-hand sequence to v_n-1,
+        # v_n-2, ...
+
+        left_len, right_len = self._get_lengths(n, values)
+
+        center = self.center.evaluate(**values)
+        limits = np.iinfo(np.int64)
+        if not limits.min <= center <= limits.max:
+            raise OverflowError(f'the value {center} does not fit into int64')
+
+        result = np.empty(n, dtype=np.int64)
+        result[0] = center
+        result[1:right_len + 1] = self.right_seq.to_array(right_len, **values)
+        result[right_len + 1:] = self.left_seq.to_array(
+            left_len, **values)[::-1]
+
+        return result
+
+    def edge_array(self, n, **values):
+        """Returns a numpy array (of type int64) with the values assigned to
+        the edges v_0 v_1, v_1 v_2, ..., v_n-1 v_0 of the cycle of length
+        <n>, given the <values> of the global variables"""
+        # the values are computed from the formulas of <edges>, the sequences
+        # of edges are evaluated at once (see
+        # <NTermRecursionSequence.to_array>)
+
+        left_len, right_len = self._get_lengths(n, values)
+        if left_len == 0 or right_len == 0:
+            # the formulas of the edges at the center do not apply
+            labels = self.actualize(n, **values)
+            return labels + np.roll(labels, -1)
+
+        edges = self.edges()
+        closing = edges['closing']
+        if closing is None:
+            closing = (
+                self.right_seq.evaluate(right_len - 1)
+                + self.left_seq.evaluate(left_len - 1)
+            )
+
+        result = np.empty(n, dtype=np.int64)
+        result[0] = edges['right center'].evaluate(**values)
+        result[1:right_len] = edges['right'].to_array(
+            right_len - 1, **values)
+        result[right_len] = closing.evaluate(**values)
+        result[right_len + 1:n - 1] = edges['left'].to_array(
+            left_len - 1, **values)[::-1]
+        result[n - 1] = edges['left center'].evaluate(**values)
+
+        return result
+
+    def actualize_to(self, path, n, chunk=2**20, **values):
+        """Writes the numbers assigned to the vertices and the values
+        assigned to the edges (see <actualize> and <edge_array>) of the cycle
+        of length <n> to a .npy file at <path>, <chunk> vertices at a time,
+        given the <values> of the global variables, and returns the file
+        mapped into memory"""
+        # the file holds an array of shape (2, n) - the numbers of the
+        # vertices and the weights of the edges, only <chunk> numbers are
+        # kept in memory at once, so that the labelings of huge cycles can be
+        # written and verified (see <verifier.verify_file>)
+
+        if type(chunk) != int:
+            raise TypeError('the chunk size must be an integer')
+        if chunk < 1:
+            raise ValueError('the chunk size must be positive')
+
+        lengths = self._get_lengths(n, values)
+        array = np.lib.format.open_memmap(
+            path, mode='w+', dtype=np.int64, shape=(2, n))
+
+        for start in range(0, n, chunk):
+            stop = min(start + chunk, n)
+
+            # the number of the vertex v_stop (or v_0) is needed for the
+            # weight of the last edge of the chunk
+            labels = self._actualize_range(start, stop + 1, lengths, values)
+            array[0, start:stop] = labels[:-1]
+            array[1, start:stop] = labels[:-1] + labels[1:]
+
+        array.flush()
+        return array
+
+    def _actualize_range(self, start, stop, lengths, values):
+        """Returns a numpy array (of type int64) with the numbers assigned to
+        the vertices v_start, v_start+1, ..., v_stop-1, given the <lengths>
+        of the sequences (see <_get_lengths>) and the <values> of the global
+        variables"""
+        # the indices are taken modulo n, so <stop> can exceed n by 1 to get
+        # the number of v_0 at the end
+
+        left_len, right_len = lengths
+        n = left_len + right_len + 1
+        if stop > n:
+            return np.concatenate((
+                self._actualize_range(start, n, lengths, values),
+                self._actualize_range(0, stop - n, lengths, values),
+            ))
+
+        parts = []
+        if start == 0 and stop > 0:
+            center = self.center.evaluate(**values)
+            limits = np.iinfo(np.int64)
+            if not limits.min <= center <= limits.max:
+                raise OverflowError(
+                    f'the value {center} does not fit into int64')
+
+            parts.append(np.array([center], dtype=np.int64))
+            start = 1
+
+        # the right-hand sequence is assigned to v_1, ..., v_right_len
+        right_stop = min(stop, right_len + 1)
+        if start < right_stop:
+            parts.append(self.right_seq.to_array(
+                right_stop - start, start=start - 1, **values))
+            start = right_stop
+
+        # the left-hand sequence is assigned to v_n-1, v_n-2, ...
+        if start < stop:
+            parts.append(self.left_seq.to_array(
+                stop - start, start=n - stop, **values)[::-1])
+
+        if parts == []:
+            return np.empty(0, dtype=np.int64)
+
+        return np.concatenate(parts)
+
+    def _get_lengths(self, n, values):
+        """Returns a tuple (left_len, right_len) with the lengths of the
+        sequences, given the <values> of the global variables, raises
+        ValueError if they do not add up to 'n - 1'"""
+
+        left_len = self.left_seq.length.substitute(**values).evaluate()
+        right_len = self.right_seq.length.substitute(**values).evaluate()
+        if left_len + right_len != n - 1:
+            raise ValueError(
+                f'the lengths of the sequences ({left_len} and {right_len})'
+                + f' do not add up to {n - 1}'
+            )
+
+        return (left_len, right_len)
+
+    def iter_sorted(self, **values):
+        """Yields tuples (value, index) with the numbers of the pattern in
+        ascending order and their indices (as in <evaluate>), after
+        substituting <values> for the global variables"""
+        # the central number and the sorted left-hand and right-hand
+        # sequences are merged (see <NTermRecursionSequence.iter_sorted>)
+
+        center = self.center.substitute(**values).zip()
+        if center.get_variables() != set():
+            raise ValueError(f'{center} is not a number')
+
+        left = (
+            (value, -index - 1)
+            for value, index in self.left_seq.iter_sorted(**values)
+        )
+        right = (
+            (value, index + 1)
+            for value, index in self.right_seq.iter_sorted(**values)
+        )
+
+        yield from heapq.merge(
+            [(center.evaluate(), 0)], left, right, key=lambda item: item[0])
+
     def get_variables(self, omit_zeros=False, global_only=False):
         """Returns a set of variables used in any of the formulas that
         determine the pattern"""
@@ -287,6 +549,67 @@ class CentralVertexNumbering():
 
         return result
 
+    def get_canonical_key(self):
+        """Returns a hashable canonical form of the pattern, two patterns
+        have the same canonical key if they differ only by the order of the
+        sequences (see <reverse>), the name of the <ntuple_index> variable
+        and the form of the formulas"""
+        # the key is the smaller of the keys (center, left, right) and
+        # (center, right, left) of the sequences and the central number (see
+        # <_get_keys>).
+        # The sequences are minimized, so refined patterns (see
+        # <NTermRecursionSequence.refine>) have the same key as well
+
+        if self._canonical_key is None:
+            center_key, left_key, right_key = self._get_keys()
+            self._canonical_key = min(
+                (center_key, left_key, right_key),
+                (center_key, right_key, left_key)
+            )
+
+        return self._canonical_key
+
+    @misc.convert_to_type('owners type')
+    def equivalent(self, other):
+        """Tells whether <self> and <other> are the same numbering up to the
+        order of the sequences, the name of the <ntuple_index> variable and
+        the form of the formulas"""
+        return self.get_canonical_key() == other.get_canonical_key()
+
+    def _get_keys(self):
+        """Returns a tuple (center_key, left_key, right_key) with the keys of
+        the central number and of the minimized sequences"""
+        # the key of a formula is a sorted tuple of pairs
+        # ((kind, variable), multiplier) without zero multipliers, where the
+        # kind is 0 for the constant, 1 for <self.ntuple_index> and 2 for the
+        # other variables, so the name of <self.ntuple_index> is omitted.
+        # The key of a sequence is a tuple (formula keys, length key)
+
+        def get_key(formula):
+            items = []
+            for variable, multiplier in zip(
+                    formula.variables, formula.multipliers):
+                if multiplier == 0:
+                    continue
+                elif variable == '':
+                    items.append(((0, ''), multiplier))
+                elif variable == self.ntuple_index:
+                    items.append(((1, ''), multiplier))
+                else:
+                    items.append(((2, variable), multiplier))
+
+            return tuple(sorted(items))
+
+        sequence_keys = []
+        for seq in (self.left_seq, self.right_seq):
+            seq = seq.minimize()
+            sequence_keys.append((
+                tuple(get_key(formula.zip()) for formula in seq.formulas),
+                get_key(seq.length.zip())
+            ))
+
+        return (get_key(self.center.zip()), *sequence_keys)
+
     def get_edge(self, side, key):
         """Returns a value assigned to the chosen edge of the graph based on
         the vertex numbering"""
@@ -309,4 +632,45 @@ class CentralVertexNumbering():
         else:
             raise ValueError(f'invalid key value: {key}')
 
+    def edges(self):
+        """Returns a dict with the formulas of the values assigned to all the
+        edges of the cycle based on the vertex numbering"""
+        # the keys are:
+        # 'right center'    - the edge v_0 v_1,
+        # 'right'           - the sequence of the edges v_1 v_2, v_2 v_3,
+        #                     ..., between the right numbers,
+        # 'closing'         - the edge between the last right and the last
+        #                     left number, None if the formulas of the last
+        #                     numbers depend on the lengths of the sequences
+        #                     modulo their numbers of formulas in a way that
+        #                     cannot be determined,
+        # 'left'            - the sequence of the edges v_n-2 v_n-1,
+        #                     v_n-3 v_n-2, ..., between the left numbers,
+        # 'left center'     - the edge v_n-1 v_0.
+        # The formulas are in the simplest form, both sequences are assumed
+        # to be non-empty.
+        # The formulas are computed once and cached, copies are returned, so
+        # that modifying them does not affect the cache
+
+        if self._edges is None:
+            try:
+                closing = (
+                    self.right_seq.last_value() + self.left_seq.last_value()
+                ).zip()
+            except ValueError:
+                closing = None
+
+            self._edges = {
+                'right center': self.get_edge('right', 'center').zip(),
+                'right': self.right_seq.edge_sequence(),
+                'closing': closing,
+                'left': self.left_seq.edge_sequence(),
+                'left center': self.get_edge('left', 'center').zip(),
+            }
+
+        return {
+            key: None if value is None else value.copy()
+            for key, value in self._edges.items()
+        }
+
     #-------------------------------------------------------------------------
@@ -0,0 +1,261 @@
+import numpy as np
+
+from .linear_formula import LinearFormula
+from .ntr_sequence import NTermRecursionSequence
+from .cv_numbering import CentralVertexNumbering
+from . import misc
+
+
+class SSACycleDoubleCVN():
+    """A class to represent a numbering pattern of the vertices and the edges
+    of a cycle (a total labeling, for example a super (a, d)-edge-antimagic
+    one) determined by two central vertex numberings"""
+    # The upper numbering numbers the vertices as in
+    # <CentralVertexNumbering>, the lower numbering numbers the edges - the
+    # number of the edge v_k-1 v_k is at the same position in the lower
+    # numbering as the number of the vertex v_k in the upper one:
+    # ..., l_2,         l_1,         c,           r_1,     r_2,     ...
+    # ..., v_n-2,       v_n-1,       v_0,         v_1,     v_2,     ...
+    # ..., v_n-3 v_n-2, v_n-2 v_n-1, v_n-1 v_0,   v_0 v_1, v_1 v_2, ...
+    # so both numberings have the same lengths of the sequences and the same
+    # <ntuple_index> variable.
+    # The weight of an edge is the sum of the numbers of its ends and the
+    # number of the edge.
+
+
+    #-INIT--------------------------------------------------------------------
+
+    def __init__(self, *args):
+        """Initializes the pattern"""
+        # <args> should consist of another instance of <SSACycleDoubleCVN> or
+        # of the upper and the lower numbering (instances of
+        # <CentralVertexNumbering>), the lengths and the <ntuple_index> of
+        # the lower numbering are set to the ones of the upper numbering
+
+        # init with other pattern
+        if len(args) == 1:
+            if type(args[0]) != SSACycleDoubleCVN:
+                raise TypeError('the argument is not a double numbering')
+
+            upper = args[0].upper
+            lower = args[0].lower
+
+        elif len(args) == 2:
+            upper, lower = args
+            for numbering in (upper, lower):
+                if type(numbering) != CentralVertexNumbering:
+                    raise TypeError(f'{numbering} is not a numbering')
+
+        else:
+            raise TypeError('cannot interpret the arguments')
+
+        self.upper = upper.copy()
+        self.lower = lower.set_ntuple_index(upper.ntuple_index)
+        self.lower.set_lengths(
+            self.upper.left_seq.length, self.upper.right_seq.length,
+            inplace=True
+        )
+
+        self._edges = None
+
+    #-------------------------------------------------------------------------
+
+
+    #-MAGIC-METHOD-OVERLOADS--------------------------------------------------
+
+    def __str__(self):
+        return f'SSACycleDoubleCVN(upper: {self.upper}, lower: {self.lower})'
+
+    def __eq__(self, other):
+        if type(other) != SSACycleDoubleCVN:
+            return False
+
+        return self.upper == other.upper and self.lower == other.lower
+
+    #-------------------------------------------------------------------------
+
+
+    #-MODIFIERS---------------------------------------------------------------
+
+    # the formulas of the weights of the edges (see <deduce_edges>) are
+    # computed once and reused until the pattern is modified by one of the
+    # modifiers below (modifying the numberings directly requires calling
+    # <_clear_cache>)
+
+    @misc.inplace(default=False)
+    def zip(self):
+        """Simplifies the formulas determining the pattern"""
+
+        self.upper.zip(inplace=True)
+        self.lower.zip(inplace=True)
+        self._clear_cache()
+
+    @misc.inplace(default=False)
+    def substitute(self, only_sequences=False, recursive=False, **kwargs):
+        """Substitutes given variables for given formulas in all formulas
+        determining the pattern"""
+
+        for numbering in (self.upper, self.lower):
+            numbering.substitute(
+                only_sequences=only_sequences, recursive=recursive,
+                inplace=True, **kwargs
+            )
+
+        self._clear_cache()
+
+    @misc.inplace(default=False)
+    def set_lengths(self, l_len, r_len):
+        """Sets the lengths of the left and right sequences of both
+        numberings"""
+
+        self.upper.set_lengths(l_len, r_len, inplace=True)
+        self.lower.set_lengths(l_len, r_len, inplace=True)
+        self._clear_cache()
+
+    def _clear_cache(self):
+        """Forgets the formulas of the weights of the edges"""
+        self._edges = None
+
+    #-------------------------------------------------------------------------
+
+
+    #-OTHER-------------------------------------------------------------------
+
+    def copy(self):
+        """Returns a copy of <self>"""
+        return SSACycleDoubleCVN(self)
+
+    def get_variables(self, omit_zeros=False, global_only=False):
+        """Returns a set of variables used in any of the formulas that
+        determine the pattern"""
+
+        return (
+            self.upper.get_variables(
+                omit_zeros=omit_zeros, global_only=global_only)
+            | self.lower.get_variables(
+                omit_zeros=omit_zeros, global_only=global_only)
+        )
+
+    def deduce_edges(self):
+        """Returns a dict with the formulas of the weights of the edges"""
+        # the keys are:
+        # 'left center'     - the weight of the edge v_n-1 v_0,
+        # 'right center'    - the weight of the edge v_0 v_1,
+        # 'left'            - the sequence of the weights of the edges
+        #                     v_n-2 v_n-1, v_n-3 v_n-2, ...,
+        # 'right'           - the sequence of the weights of the edges
+        #                     v_1 v_2, v_2 v_3, ...,
+        # 'closing'         - the weight of the edge between the last right
+        #                     and the last left number, None if it cannot be
+        #                     determined (see <CentralVertexNumbering.edges>).
+        # The sequences end at the last edge between two numbers of the same
+        # sequence, both sequences are assumed to be non-empty.
+        # The formulas are computed once and cached, copies are returned, so
+        # that modifying them does not affect the cache
+
+        if self._edges is None:
+            edges = self.upper.edges()
+            lower = self.lower
+
+            # the number of the edge between the (k + 1)-th and the
+            # (k + 2)-th right numbers is the (k + 1)-th number of the right
+            # sequence of <lower>, the number of the edge between the
+            # (k + 1)-th and the (k + 2)-th left numbers is the k-th number
+            # of the left sequence of <lower>
+            lower_left = NTermRecursionSequence(
+                lower.left_seq, length=edges['left'].length)
+            lower_right = NTermRecursionSequence(
+                *SSACycleDoubleCVN._shift(lower.right_seq),
+                length=edges['right'].length, ntuple_index=lower.ntuple_index
+            )
+
+            # the number of the closing edge is the last number of the left
+            # sequence of <lower>
+            closing = None
+            if edges['closing'] is not None:
+                try:
+                    closing = (
+                        edges['closing'] + lower.left_seq.last_value()).zip()
+                except ValueError:
+                    pass
+
+            self._edges = {
+                'left center': (edges['left center'] + lower.center).zip(),
+                'right center': (
+                    edges['right center'] + lower.right_seq.evaluate(0)
+                ).zip(),
+                'left': edges['left'] + lower_left,
+                'right': edges['right'] + lower_right,
+                'closing': closing,
+            }
+
+        return {
+            key: None if value is None else value.copy()
+            for key, value in self._edges.items()
+        }
+
+    def actualize(self, n, **values):
+        """Returns a tuple (vertex_labels, edge_labels) of numpy arrays (of
+        type int64) with the numbers assigned to the vertices v_0, v_1, ...,
+        v_n-1 and to the edges v_0 v_1, v_1 v_2, ..., v_n-1 v_0 of the cycle
+        of length <n>, given the <values> of the global variables"""
+        # see <CentralVertexNumbering.actualize>, the arrays can be checked
+        # with <verifier.verify_total_labeling>
+
+        vertex_labels = self.upper.actualize(n, **values)
+
+        # the k-th number of <lower> is the number of the edge v_k-1 v_k
+        edge_labels = np.roll(self.lower.actualize(n, **values), -1)
+
+        return (vertex_labels, edge_labels)
+
+    def actualize_to(self, path, n, chunk=2**20, **values):
+        """Writes the numbers assigned to the vertices and to the edges of
+        the cycle of length <n> (see <actualize>) and the weights of the
+        edges to a .npy file at <path>, <chunk> vertices at a time, given the
+        <values> of the global variables, and returns the file mapped into
+        memory"""
+        # see <CentralVertexNumbering.actualize_to>, the file holds an array
+        # of shape (3, n)
+
+        if type(chunk) != int:
+            raise TypeError('the chunk size must be an integer')
+        if chunk < 1:
+            raise ValueError('the chunk size must be positive')
+
+        lengths = self.upper._get_lengths(n, values)
+        array = np.lib.format.open_memmap(
+            path, mode='w+', dtype=np.int64, shape=(3, n))
+
+        for start in range(0, n, chunk):
+            stop = min(start + chunk, n)
+            vertex_labels = self.upper._actualize_range(
+                start, stop + 1, lengths, values)
+
+            # the (k + 1)-th number of <lower> is the number of the edge
+            # v_k v_k+1
+            edge_labels = self.lower._actualize_range(
+                start + 1, stop + 1, lengths, values)
+
+            array[0, start:stop] = vertex_labels[:-1]
+            array[1, start:stop] = edge_labels
+            array[2, start:stop] = (
+                vertex_labels[:-1] + vertex_labels[1:] + edge_labels)
+
+        array.flush()
+        return array
+
+    @classmethod
+    def _shift(cls, seq):
+        """Returns the formulas of a sequence that gives the values of <seq>
+        without the first one"""
+        # the first formula is moved to the end, with the ntuple index
+        # incremented
+
+        i = seq.ntuple_index
+        next_formula = seq.formulas[0].substitute(
+            **{i: LinearFormula([1, 1], [i, ''])}).zip()
+
+        return seq.formulas[1:] + [next_formula]
+
+    #-------------------------------------------------------------------------
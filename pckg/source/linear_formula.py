@@ -1,3 +1,5 @@
+import re
+
 from . import misc
 
 
@@ -64,153 +66,47 @@ class LinearFormula():
 
     #-STRING-TO-FORMULA-CONVERSION--------------------------------------------
 
+    # a segment of a formula - an operator (if there are more operators,
+    # the last one counts), a multiplier and a variable name, where at least
+    # one of the two latter is not empty. Only ' ' is treated as a space and
+    # there cannot be one between the multiplier and the variable name -
+    # for example '3 a' is read as '3 + a'
+    _segment_pattern = re.compile(
+        r'(?:[ +-]*([+-]))?[ ]*(?=[^ +-])(\d*)([^ +-]*)')
+
     def read_from_string(self, string):
         """Converts a string into a formula"""
         # I assume that <string> is made of substrings like this:
         # operator, multiplier, variable, operator, multiplier, variable, ...
         # where some of the substrings can be empty
-        
-        # the algorithm in essence works like this:
-        # 1. read operator
-        # 2. read multiplier
-        # 3. read variable
-        # 4. add segment
-        # 5. go back to point 1. if the string hasn't ended
-
-        # set up temporary data
-        self._setup_read_from_string()
-
-        for char in string:
-            self._process(char)
-
-        # this will add the last segment
-        self._process(' ')
-
-        self._tear_down_read_from_string()
-
-    def _setup_read_from_string(self):
-        """Sets up memory for the <read_from_string> function"""
-        self._current_operation = None
-        self._current_multiplier = None
-        self._current_variable = None
-        self._phase = 'operation'
-
-    def _tear_down_read_from_string(self):
-        """Deletes memory used by the <read_from_string> function"""
-        del self._current_operation
-        del self._current_multiplier
-        del self._current_variable
-        del self._phase
-
-    def _process(self, char):
-        """Choses the processing algorithm based on which phase the main
-        algorithm is in"""
-
-        if self._phase == 'operation':
-            self._process_operation(char)
-        elif self._phase == 'multiplier':
-            self._process_multiplier(char)
-        elif self._phase == 'variable':
-            self._process_variable(char)
-
-    # the 3 methods below:
-    # <_process_operation>, <_process_multiplier>, <_process_variable> 
-    # work like this:
-    # if <char> is "supported":
-    #     do stuff
-    # else:
-    #     clean up
-    #     go to the next phase 
-    #     pass <char> to the next _process_whatever method
-
-    def _process_operation(self, char):
-        """Processes <char> given that <char> is part of an operation
-        (+ or -)"""
-            
-        if char == ' ':
-            # in the middle of a string a space does not tell us anything
-            # also this prevents from going in circles when a space occurs 
-            # after a variable name
-            pass
-
-        elif LinearFormula._type_of_char(char) == 'operator':
-            if char == '+':
-                self._current_operation = '+'
-            elif char == '-':
-                self._current_operation = '-'
-            else:
-                raise ValueError(f'invalid operation - {char}')
-
-        else:
-            # clean up
-            if self._current_operation is None:
-                self._current_operation = '+'
-            
-            # next phase
-            self._phase = 'multiplier'
-            self._process_multiplier(char)
-
-    def _process_multiplier(self, char):
-        """Processes <char> given that <char> is part of a number"""
-
-        if LinearFormula._type_of_char(char) == 'number':
-            if self._current_multiplier is None:
-                self._current_multiplier = int(char)
-            else:
-                self._current_multiplier *= 10
-                self._current_multiplier += int(char)
 
-        else:
-            # clean up
-            if self._current_multiplier is None:
-                self._current_multiplier = 1
-
-            if self._current_operation == '-':
-                self._current_multiplier *= -1
-
-            # next phase
-            self._phase = 'variable'
-            self._process_variable(char)
+        multipliers, variables = LinearFormula._tokenize(string)
+        self.multipliers.extend(multipliers)
+        self.variables.extend(variables)
 
-    def _process_variable(self, char):
-        """Processes <char> given that <char> is part of a variable name"""
-    
-        if LinearFormula._type_of_char(char) in {'char', 'number'}:
-            # the first character of the variable name has to pass through
-            # the <self._process_number> method so it won't be a number
-
-            if self._current_variable is None:
-                self._current_variable = char
+    @classmethod
+    def _tokenize(cls, string):
+        """Returns the lists of multipliers and variables of the formula
+        represented by <string>"""
+        # the whole string is scanned once, by the <_segment_pattern> regex
+
+        multipliers = []
+        variables = []
+        for operator, multiplier, variable in (
+                cls._segment_pattern.findall(string)):
+
+            if multiplier == '':
+                multiplier = 1
             else:
-                self._current_variable += char
+                multiplier = int(multiplier)
 
-        else:
-            # clean up
-            if self._current_variable is None:
-                self._current_variable = ''
-
-            # add segment (part of clean up)
-            self.multipliers.append(self._current_multiplier)
-            self.variables.append(self._current_variable)
+            if operator == '-':
+                multiplier *= -1
 
-            # reset temporary data and go to the next phase
-            self._setup_read_from_string()
-            self._process_operation(char)
+            multipliers.append(multiplier)
+            variables.append(variable)
 
-    @classmethod
-    def _type_of_char(cls, char):
-        """Tells whether <char> is a number, space, operator or a regular
-        character"""
-        try:
-            int(char)
-            return 'number'
-        except ValueError:
-            if char == ' ':
-                return 'space'
-            elif char in {'+', '-'}:
-                return 'operator'
-            else:
-                return 'char'
+        return multipliers, variables
 
     #-------------------------------------------------------------------------
 
@@ -1,3 +1,6 @@
+import operator
+import re
+
 from .linear_formula import LinearFormula
 from . import misc
 
@@ -6,7 +9,9 @@ class LinearRelation():
     """A class to represent an equation of two linear formulas"""
 
     _relations = ['==', '<=', '>=', '<', '>']
-    _relations_in_str = ['==', '<=', '>=', '<', '>', '=']
+    # a relation in a string - the left side, the relation sign and the
+    # right side, where the sides are parsed by <LinearFormula>
+    _relation_pattern = re.compile(r'([^<>=]*)(==|<=|>=|<|>|=)([^<>=]*)')
     _reversed_rel = {
         '==': '==',
         '<=': '>=',
@@ -14,6 +19,13 @@ class LinearRelation():
         '<': '>',
         '>': '<'
     }
+    _operators = {
+        '==': operator.eq,
+        '<=': operator.le,
+        '>=': operator.ge,
+        '<': operator.lt,
+        '>': operator.gt
+    }
 
     #-INIT--------------------------------------------------------------------
 
@@ -52,6 +64,108 @@ class LinearRelation():
             raise TypeError(
                 'this constructor  takes at most 2 positional arguments')
 
+        # the normal form is computed when it's needed for the first time
+        self._normal_state = None
+
+    #-------------------------------------------------------------------------
+
+
+    #-NORMAL-FORM-------------------------------------------------------------
+
+    # Every relation 'L <relation> R' is stored also in a normal form, that
+    # is a single zipped formula 'L - R', divided by the greatest common
+    # divisor of it's multipliers and compared against 0. The <left> and
+    # <right> formulas are kept for display and for the methods that
+    # modify the sides separately.
+    # The normal form is computed once, when it's first needed, and then
+    # only if the relation has changed.
+
+    def _get_state(self):
+        """Returns a tuple that changes whenever the relation changes"""
+        return (
+            tuple(self.left.multipliers), tuple(self.left.variables),
+            tuple(self.right.multipliers), tuple(self.right.variables),
+            self.relation
+        )
+
+    def _update_normal_form(self):
+        """Computes the normal form of the relation"""
+
+        # zip 'L - R', a dict preserves the order in which the variables
+        # occur, the same way <LinearFormula.zip> does
+        multipliers = {}
+        for multiplier, variable in zip(
+                self.left.multipliers, self.left.variables):
+            multipliers[variable] = multipliers.get(variable, 0) + multiplier
+
+        for multiplier, variable in zip(
+                self.right.multipliers, self.right.variables):
+            multipliers[variable] = multipliers.get(variable, 0) - multiplier
+
+        multipliers = {
+            variable: multiplier
+            for variable, multiplier in multipliers.items() if multiplier != 0
+        }
+
+        # the solved relation - 'L - R' divided by the gcd of it's
+        # multipliers (note that for one multiplier <misc.gcd> keeps it's
+        # sign, so for example 'a-a <= b' becomes 'b >= 0')
+        gcd = misc.gcd(*multipliers.values())
+        if gcd == 0:
+            gcd = 1
+
+        relation = self.relation
+        if gcd < 0:
+            relation = LinearRelation._reversed_rel[relation]
+
+        self._solved = (
+            tuple(multiplier // gcd for multiplier in multipliers.values()),
+            tuple(multipliers.keys()),
+            relation
+        )
+
+        # the normal key - the solved relation with sorted variables and the
+        # relation being one of '==', '<=', '<', such that the keys of
+        # two relations are equal if and only if the relations are
+        # equivalent
+        gcd = misc.gcd(*(abs(m) for m in multipliers.values()))
+        items = sorted(
+            (variable, multiplier // gcd)
+            for variable, multiplier in multipliers.items()
+        )
+
+        relation = self.relation
+        if relation in {'>=', '>'}:
+            sign = -1
+            relation = LinearRelation._reversed_rel[relation]
+        elif relation == '==' and items != [] and items[0][1] < 0:
+            sign = -1
+        else:
+            sign = 1
+
+        self._normal_key = (
+            relation,
+            tuple((variable, sign*multiplier) for variable, multiplier in
+                  items)
+        )
+
+        self._normal_state = self._get_state()
+
+    def _check_normal_form(self):
+        """Updates the normal form if the relation has changed since it was
+        computed"""
+        if self._normal_state != self._get_state():
+            self._update_normal_form()
+
+    def get_normal_key(self):
+        """Returns a hashable normal form of the relation, two relations
+        have the same normal key if and only if they are equivalent"""
+        # for example the normal key of '2 >= 2a' is
+        # ('<=', (('', -1), ('a', 1)))
+
+        self._check_normal_form()
+        return self._normal_key
+
     #-------------------------------------------------------------------------
 
 
@@ -63,23 +177,39 @@ class LinearRelation():
         if type(string) != str:
             raise TypeError('the argument is not a string')
 
-        formulas = []
-        for relation in LinearRelation._relations_in_str:
-            formulas = string.split(relation)
-            if len(formulas) == 2:
-                if relation == '=':
-                    self.relation = '=='
-                else:
-                    self.relation = relation
-
-                break
-
-        if len(formulas) != 2:
+        match = LinearRelation._relation_pattern.fullmatch(string)
+        if match is None:
             raise ValueError(
                 'the provided string cannot be converted to any relation')
 
-        self.left = LinearFormula(formulas[0])
-        self.right = LinearFormula(formulas[1])
+        left, relation, right = match.groups()
+        if relation == '=':
+            relation = '=='
+
+        self.relation = relation
+        self.left = LinearFormula(left)
+        self.right = LinearFormula(right)
+
+    @classmethod
+    def read_many(cls, path):
+        """Yields the relations written in the file <path>, one relation per
+        line"""
+        # the relations are read lazily, empty lines and lines starting with
+        # '#' are skipped
+
+        with open(path) as file:
+            for line_number, line in enumerate(file, start=1):
+                line = line.strip()
+                if line == '' or line.startswith('#'):
+                    continue
+
+                try:
+                    relation = cls(line)
+                except ValueError:
+                    raise ValueError(
+                        f'line {line_number}: {line} is not a relation')
+
+                yield relation
 
     #-------------------------------------------------------------------------
 
@@ -238,14 +368,12 @@ class LinearRelation():
         """Reduces the equation to the simplest equation in the form
         'L == 0'"""
 
-        self -= self.right
-        self.zip(inplace=True)
-
-        gcd = misc.gcd(*self.left.multipliers)
-        if gcd == 0:
-            gcd = 1
+        self._check_normal_form()
+        multipliers, variables, relation = self._solved
 
-        self /= gcd
+        self.left = LinearFormula(list(multipliers), list(variables))
+        self.right = LinearFormula([], [])
+        self.relation = relation
 
     @misc.inplace(default=False)
     def expose(self, variable):
@@ -296,21 +424,12 @@ class LinearRelation():
         """Returns the logical status of the equation
         (true, false or unknown)"""
 
-        solved_eq = self.solve()
-        if solved_eq.get_variables() != set():
+        relation, items = self.get_normal_key()
+        multipliers = dict(items)
+        if set(multipliers) - {''} != set():
             return 'unknown'
 
-        solved_left = solved_eq.left.evaluate()
-        if solved_eq.relation == '==':
-            status = solved_left == 0
-        elif solved_eq.relation == '<=':
-            status = solved_left <= 0
-        elif solved_eq.relation == '>=':
-            status = solved_left >= 0
-        elif solved_eq.relation == '<':
-            status = solved_left < 0
-        elif solved_eq.relation == '>':
-            status = solved_left > 0
+        status = LinearRelation._operators[relation](multipliers.get('', 0), 0)
 
         if status == False:
             return 'false'
@@ -318,49 +437,66 @@ class LinearRelation():
         elif status == True:
             return 'true'
 
-    @misc.convert_to_type('owners type')
-    def equivalent(self, other):
-        """Tells the user whether <self> is equivalent to <other>"""
+    def compile(self, *variables):
+        """Returns a function that takes the values of <variables> as
+        positional arguments and tells whether the relation holds for them"""
+        # the values can be numbers or numpy arrays, in the latter case the
+        # function returns an array of booleans, for example:
+        # >>> check = LinearRelation('a + 2b <= 5').compile('a', 'b')
+        # >>> check(1, 2)
+        # True
+        # >>> check(numpy.array([1, 3]), numpy.array([2, 2]))
+        # array([ True, False])
+
+        # if <variables> are not given, they are sorted alphabetically
+        if variables == ():
+            variables = tuple(sorted(self.get_variables(omit_zeros=True)))
+
+        for variable in variables:
+            if type(variable) != str:
+                raise TypeError(f'invalid variable: {variable}')
+
+        # use the solved relation, so that the returned function only has to
+        # compute 'L' in 'L <relation> 0'
+        self._check_normal_form()
+        solved_multipliers, solved_variables, relation = self._solved
+
+        missing = set(solved_variables) - {''} - set(variables)
+        if missing != set():
+            raise ValueError(
+                f'the values of {", ".join(sorted(missing))} are not given')
 
-        # two relations of different type cannot be equivalent
-        if (other.relation not in
-                {self.relation, LinearRelation._reversed_rel[self.relation]}):
-            return False
-
-        # given 2 relations, ex. 'L1 == P1' and 'L2 == P2', we want to
-        # transform them to the form 'L1 - P1 == 0' and 'L2 - P2 == 0'
-        # and return something like "'L1 - P1'.equivalent(L2 - P2)"
-        self_solved = self.solve()
-        other_solved = other.solve()
-
-        # note that the <solve> method divides the relation by the greatest
-        # common divisor of the 'L - P' formula's multipliers, so the only
-        # case when 'L1 - P1' == 'a*(L2 - P2)' that we have to take into
-        # account is when 'a' == -1 and the relation in question is '=='
-        # (or if the 2 relations are '<=' and '>=' or '<' and '>', but then
-        # we will reverse one of them)
-
-        if self.relation == '==':
-            if self_solved.left.equivalent(other_solved.left):
-                return True
-            elif self_solved.left.equivalent(-other_solved.left):
-                # the aforementioned case when 'L1 - P1' == '-(L2 - P2)'
-                return True
-            else:
-                return False
+        multipliers = dict(zip(solved_variables, solved_multipliers))
+        constant = multipliers.get('', 0)
+        coefficients = []
+        for i, variable in enumerate(variables):
+            if multipliers.get(variable, 0) != 0:
+                coefficients.append((i, multipliers[variable]))
 
-        else:
-            if other_solved.relation != self_solved.relation:
-                # relations are reversed so we need to reverse one of the
-                # relations'
-                other_solved *= -1
+        compare = LinearRelation._operators[relation]
+        n_variables = len(variables)
 
-            return self_solved.left.equivalent(other_solved.left)
+        def predicate(*values):
+            if len(values) != n_variables:
+                raise TypeError(
+                    f'expected {n_variables} values, got {len(values)}')
 
+            result = constant
+            for i, multiplier in coefficients:
+                result = result + multiplier*values[i]
 
+            return compare(result, 0)
 
+        predicate.variables = variables
+        return predicate
 
+    @misc.convert_to_type('owners type')
+    def equivalent(self, other):
+        """Tells the user whether <self> is equivalent to <other>"""
 
+        # the normal keys are equal if and only if the relations are
+        # equivalent, see <_update_normal_form>
+        return self.get_normal_key() == other.get_normal_key()
 
     #-------------------------------------------------------------------------
 
@@ -1,4 +1,6 @@
+from collections import OrderedDict
 from functools import reduce
+from inspect import signature
 from math import gcd as old_gcd
 
 
@@ -85,6 +87,56 @@ def convert_to_type(target_type, arg_index=0, operator=False):
     return decorator
 
 
+def cached(method):
+    # caches the results of <method> in the LRU cache of its owner - an
+    # OrderedDict <owner._cache> of at most <owner._cache_size> items, the
+    # cache is disabled if the size is 0.
+    # The results are keyed by the name of the method and the arguments and
+    # are copied, so that modifying them does not affect the cache, the
+    # owner counts the hits and misses in <owner.cache_hits> and
+    # <owner.cache_misses>
+
+    method_signature = signature(method)
+
+    def real_method(owner, *args, **kwargs):
+        if owner._cache_size == 0:
+            return method(owner, *args, **kwargs)
+
+        # the same call with positional or keyword arguments has the same key
+        arguments = method_signature.bind(owner, *args, **kwargs)
+        arguments.apply_defaults()
+        key = (method.__name__, tuple(arguments.arguments.items())[1:])
+        try:
+            result = owner._cache[key]
+        except KeyError:
+            owner.cache_misses += 1
+            result = method(owner, *args, **kwargs)
+            owner._cache[key] = result
+            if len(owner._cache) > owner._cache_size:
+                owner._cache.popitem(last=False)
+        except TypeError:
+            # unhashable arguments
+            return method(owner, *args, **kwargs)
+        else:
+            owner.cache_hits += 1
+            owner._cache.move_to_end(key)
+
+        return result.copy()
+
+    return real_method
+
+
+def set_cache_size(owner, size):
+    # sets the size of the cache used by <cached> and empties the cache
+    if type(size) != int:
+        raise TypeError('the size of the cache must be an integer')
+    if size < 0:
+        raise ValueError('the size of the cache cannot be negative')
+
+    owner._cache_size = size
+    owner._cache = OrderedDict()
+
+
 def gcd(*args):
     if len(args) == 0:
         return 1
@@ -92,6 +144,31 @@ def gcd(*args):
     return reduce(old_gcd, args)
 
 
+def lcm(*args):
+    if len(args) == 0:
+        return 1
+
+    return reduce(lambda a, b: a*b // old_gcd(a, b), args)
+
+
+def extended_gcd(a, b):
+    # returns a tuple (g, x, y) such that 'a*x + b*y == g' and g is the
+    # (non-negative) greatest common divisor of <a> and <b>
+    old_r, r = a, b
+    old_x, x = 1, 0
+    old_y, y = 0, 1
+    while r != 0:
+        q = old_r // r
+        old_r, r = r, old_r - q*r
+        old_x, x = x, old_x - q*x
+        old_y, y = y, old_y - q*y
+
+    if old_r < 0:
+        return (-old_r, -old_x, -old_y)
+
+    return (old_r, old_x, old_y)
+
+
 
 
 
@@ -1,3 +1,8 @@
+import heapq
+import itertools
+
+import numpy as np
+
 from .linear_formula import LinearFormula
 from .linear_relation import LinearRelation
 from . import misc
@@ -35,6 +40,7 @@ class NTermRecursionSequence():
                 self, *args[0].formulas,
                 length=length, ntuple_index=ntuple_index
             )
+            self.set_cache_size(args[0]._cache_size)
 
         # init with formulas
         else:
@@ -64,6 +70,13 @@ class NTermRecursionSequence():
             if self.ntuple_index in self.length.variables:
                 raise ValueError('length uses the ntuple_index variable')
 
+            # the cache of <evaluate> is disabled by default
+            self.cache_hits = 0
+            self.cache_misses = 0
+            self.set_cache_size(0)
+
+            self._clear_cache()
+
     #-------------------------------------------------------------------------
 
 
@@ -87,6 +100,57 @@ class NTermRecursionSequence():
             and self.length == other.length
         )
 
+    def __neg__(self):
+        result = self.copy()
+        result *= -1
+        return result
+
+    @misc.convert_to_type('owners type', operator=True)
+    def __iadd__(self, other):
+        # the sequences are aligned to the same number of formulas - the
+        # least common multiple of their numbers of formulas
+        other_formulas = self._align(other)
+        for i in range(self.n):
+            self.formulas[i] += other_formulas[i]
+            self.formulas[i].zip(inplace=True)
+
+        self._clear_cache()
+        return self
+
+    @misc.convert_to_type('owners type', operator=True)
+    def __isub__(self, other):
+        self += -other
+        return self
+
+    @misc.convert_to_type(int, operator=True)
+    def __imul__(self, other):
+        for i in range(self.n):
+            self.formulas[i] *= other
+
+        self._clear_cache()
+        return self
+
+    @misc.assignment_to_binary('+=')
+    def __add__(self, other):
+        pass
+
+    @misc.assignment_to_binary('-=')
+    def __sub__(self, other):
+        pass
+
+    @misc.assignment_to_binary('*=')
+    def __mul__(self, other):
+        pass
+
+    def __radd__(self, other):
+        return self + other
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __rmul__(self, other):
+        return self * other
+
     #-------------------------------------------------------------------------
 
 
@@ -98,6 +162,7 @@ class NTermRecursionSequence():
         for i in range(self.n):
             self.formulas[i].zip(inplace=True)
         self.length.zip(inplace=True)
+        self._clear_cache()
 
     @misc.inplace(default=False)
     def substitute(self, formulas_only=False, recursive=False, **kwargs):
@@ -119,12 +184,16 @@ class NTermRecursionSequence():
             self.formulas[i].substitute(
                 **kwargs, recursive=recursive, inplace=True)
 
+        self._clear_cache()
+
     @misc.inplace(default=False)
     def set_length(self, length):
         self.length = LinearFormula(length)
         if self.ntuple_index in self.length.variables:
             raise ValueError(f'{length} is using the ntuple_index variable')
 
+        self._clear_cache()
+
     @misc.inplace(default=False)
     def set_ntuple_index(self, variable):
         """Sets the value of <self.ntuple_index> and modifies the formulas so
@@ -140,6 +209,108 @@ class NTermRecursionSequence():
             formulas_only=True, inplace=True
         )
         self.ntuple_index = variable
+        self._clear_cache()
+
+    @misc.inplace(default=False)
+    def minimize(self):
+        """Reduces the number of formulas of the sequence to the smallest
+        number that gives the same values"""
+        # for example the sequence given by '2i', '5', '2i + 1', '5' is
+        # reduced to 'i', '5'.
+        # The sequence given by formulas f0, ..., f(n-1) is an m-term
+        # sequence if m divides n and the formulas f(q), f(q + m), f(q + 2m),
+        # ... continue one another, which is checked symbolically for every
+        # divisor m of n, starting with the smallest
+
+        for m in range(1, self.n):
+            if self.n % m == 0:
+                slopes = self._get_period_slopes(m)
+                if slopes is not None:
+                    break
+        else:
+            return
+
+        formulas = []
+        for q in range(m):
+            formula = self.formulas[q].zip()
+            for i, variable in enumerate(formula.variables):
+                if variable == self.ntuple_index:
+                    formula.multipliers[i] = slopes[q]
+
+            formulas.append(formula)
+
+        self.formulas = formulas
+        self.n = m
+        self._clear_cache()
+
+    @misc.inplace(default=False)
+    def refine(self, k):
+        """Replaces the formulas of the sequence with <k> times more formulas
+        that give the same values"""
+        # for example the sequence given by 'i', '5' is refined with k == 2
+        # to '2i', '5', '2i + 1', '5'.
+        # The formula f(r + n*p) of the new sequence is the formula f(r) with
+        # '<k>*<self.ntuple_index> + p' substituted for <self.ntuple_index>
+
+        if type(k) != int:
+            raise TypeError('the argument must be an integer')
+        if k < 1:
+            raise ValueError('the argument must be positive')
+
+        formulas = []
+        for p in range(k):
+            new_ntuple_index = LinearFormula([k, p], [self.ntuple_index, ''])
+            for formula in self.formulas:
+                formulas.append(formula.substitute(
+                    **{self.ntuple_index: new_ntuple_index}).zip())
+
+        self.formulas = formulas
+        self.n *= k
+        self._clear_cache()
+
+    #-------------------------------------------------------------------------
+
+
+    #-CACHE-------------------------------------------------------------------
+
+    # Every formula of the sequence is split into the multiplier of
+    # <self.ntuple_index> (slope) and the rest of the formula (intercept).
+    # The split and the sequence of edges (see <edge_sequence>) are computed
+    # once and reused until the sequence is modified by one of the modifiers
+    # above (modifying <self.formulas> directly requires calling
+    # <_clear_cache>).
+    # The values returned by <evaluate> can be kept in a bounded LRU cache
+    # (see <set_cache_size> and <misc.cached>), which is emptied in the same
+    # way.
+
+    def set_cache_size(self, size):
+        """Sets the maximal number of the values kept in the cache of
+        <evaluate>, 0 disables the cache"""
+        misc.set_cache_size(self, size)
+
+    def _clear_cache(self):
+        """Forgets the data computed from the formulas of the sequence"""
+        self._decomposition = None
+        self._edge_sequence = None
+        self._cache.clear()
+
+    def _get_decomposition(self):
+        """Returns a list of tuples (slope, constant, intercept), one for
+        each formula, such that the formula is
+        'intercept + slope*<self.ntuple_index>' and <constant> is the
+        constant of <intercept>"""
+
+        if self._decomposition is None:
+            self._decomposition = []
+            for formula in self.formulas:
+                slope, intercept = self._split_formula(formula)
+                constant = dict(
+                    zip(intercept.variables, intercept.multipliers)
+                ).get('', 0)
+
+                self._decomposition.append((slope, constant, intercept))
+
+        return self._decomposition
 
     #-------------------------------------------------------------------------
 
@@ -181,12 +352,321 @@ class NTermRecursionSequence():
 
         return string
 
+    @misc.cached
     def evaluate(self, index):
         """Returns <index>-th value of the sequence, in the simplest form"""
 
         r = index % self.n
         i = index // self.n
-        return self.formulas[r].substitute(**{self.ntuple_index: i}).zip()
+        slope, constant, intercept = self._get_decomposition()[r]
+        return NTermRecursionSequence._with_constant(
+            intercept, constant + slope*i)
+
+    def iter_values(self, start=0, stop=None, **values):
+        """Yields the values of the sequence from the <start>-th to the
+        (<stop> - 1)-th, after substituting <values> for the global
+        variables"""
+        # the values are numbers if they don't depend on any variable,
+        # otherwise they are formulas in the simplest form.
+        # If <stop> is not given, the values are yielded until the end of the
+        # sequence or infinitely if the length is not a number
+
+        if values != {}:
+            sequence = self.substitute(**values)
+        else:
+            sequence = self
+
+        if stop is None:
+            try:
+                stop = sequence.length.evaluate()
+            except TypeError:
+                stop = None
+
+        # every formula is linear in the ntuple index, so the next value
+        # given by a formula is the previous one plus the multiplier of the
+        # ntuple index in that formula
+        decomposition = sequence._get_decomposition()
+        slopes = [slope for slope, _, _ in decomposition]
+        intercepts = [intercept for _, _, intercept in decomposition]
+
+        numeric = all(
+            intercept.get_variables(omit_zeros=True) == set()
+            for intercept in intercepts
+        )
+
+        # the constants of the current values given by each formula
+        i = start // self.n
+        r = start % self.n
+        current = []
+        for no_formula in range(self.n):
+            constant = decomposition[no_formula][1]
+            if no_formula < r:
+                constant += slopes[no_formula]*(i + 1)
+            else:
+                constant += slopes[no_formula]*i
+
+            current.append(constant)
+
+        index = start
+        while stop is None or index < stop:
+            if numeric:
+                yield current[r]
+            else:
+                yield NTermRecursionSequence._with_constant(
+                    intercepts[r], current[r])
+
+            current[r] += slopes[r]
+            r += 1
+            if r == self.n:
+                r = 0
+            index += 1
+
+    def iter_sorted(self, **values):
+        """Yields tuples (value, index) with the values of the sequence in
+        ascending order and their indices, after substituting <values> for
+        the global variables"""
+        # every formula gives a monotonic sequence, so the sequences given by
+        # the formulas are merged using a heap of size n (see <heapq.merge>).
+        # The values given by a decreasing formula are yielded from the last
+        # one, so an infinite sequence can be sorted only if none of it's
+        # formulas is decreasing
+
+        iterators = []
+        for no_formula, (slope, constant, count) in enumerate(
+                self._get_progressions(values)):
+
+            if count is None:
+                if slope < 0:
+                    raise ValueError(
+                        f'the values given by {self.formulas[no_formula]}'
+                        + ' are not bounded from below'
+                    )
+                ntuple_indices = itertools.count()
+            elif slope < 0:
+                ntuple_indices = range(count - 1, -1, -1)
+            else:
+                ntuple_indices = range(count)
+
+            iterators.append(NTermRecursionSequence._iter_progression(
+                slope, constant, ntuple_indices, self.n, no_formula))
+
+        yield from heapq.merge(*iterators)
+
+    def to_array(self, length, start=0, **values):
+        """Returns a numpy array (of type int64) with <length> values of the
+        sequence, starting with the <start>-th one, given the <values> of
+        the global variables"""
+        # the array is computed at once for all the formulas, as
+        # <intercepts> + <slopes>*<ntuple_index>, without evaluating the
+        # formulas one by one
+
+        if length < 0:
+            raise ValueError('the length cannot be negative')
+        if start < 0:
+            raise ValueError('the start cannot be negative')
+
+        if values != {}:
+            sequence = self.substitute(**values)
+        else:
+            sequence = self
+
+        slopes = []
+        constants = []
+        for slope, constant, intercept in sequence._get_decomposition():
+            if intercept.get_variables(omit_zeros=True) != set():
+                raise TypeError('Not all values are provided')
+
+            slopes.append(slope)
+            constants.append(constant)
+
+        # the n-tuples from the <first>-th one are needed to get the values
+        first, offset = divmod(start, self.n)
+        rows = -(-(offset + length) // self.n)
+
+        # every formula gives an arithmetic progression, so the values with
+        # the greatest absolute values are the first and the last ones
+        limits = np.iinfo(np.int64)
+        last = first + max(rows - 1, 0)
+        for slope, constant in zip(slopes, constants):
+            for value in (
+                    constant + slope*first, slope*last, constant + slope*last):
+                if not limits.min <= value <= limits.max:
+                    raise OverflowError(
+                        f'the value {value} does not fit into int64')
+
+        ntuple_indices = np.arange(
+            first, first + rows, dtype=np.int64)[:, np.newaxis]
+        result = (
+            np.array(constants, dtype=np.int64)
+            + np.array(slopes, dtype=np.int64)*ntuple_indices
+        )
+
+        return result.ravel()[offset:offset + length]
+
+    def index_of(self, value, **values):
+        """Returns the smallest index of <value> in the sequence, after
+        substituting <values> for the global variables, raises ValueError if
+        there is no such index"""
+        # every formula is solved for <self.ntuple_index>, so the cost does
+        # not depend on the length of the sequence
+
+        index = None
+        for no_formula, (slope, constant, count) in enumerate(
+                self._get_progressions(values)):
+
+            if slope == 0:
+                if value != constant or count == 0:
+                    continue
+                ntuple_index = 0
+            else:
+                ntuple_index, remainder = divmod(value - constant, slope)
+                if remainder != 0 or ntuple_index < 0:
+                    continue
+                if count is not None and ntuple_index >= count:
+                    continue
+
+            candidate = self.n*ntuple_index + no_formula
+            if index is None or candidate < index:
+                index = candidate
+
+        if index is None:
+            raise ValueError(f'{value} is not in the sequence')
+
+        return index
+
+    def index_of_array(self, array, **values):
+        """Returns a numpy array (of type int64) with the smallest indices of
+        the values from <array> in the sequence, after substituting <values>
+        for the global variables"""
+        # the values that are not in the sequence get the index -1
+
+        array = np.asarray(array, dtype=np.int64)
+
+        # greater than any index that can be found
+        missing = np.iinfo(np.int64).max
+        result = np.full(array.shape, missing, dtype=np.int64)
+
+        for no_formula, (slope, constant, count) in enumerate(
+                self._get_progressions(values)):
+
+            if slope == 0:
+                ntuple_indices = np.zeros(array.shape, dtype=np.int64)
+                found = array == constant
+            else:
+                ntuple_indices, remainders = np.divmod(array - constant, slope)
+                found = (remainders == 0) & (ntuple_indices >= 0)
+
+            if count is not None:
+                found &= ntuple_indices < count
+
+            candidates = np.where(
+                found, self.n*ntuple_indices + no_formula, missing)
+            np.minimum(result, candidates, out=result)
+
+        result[result == missing] = -1
+        return result
+
+    def _align(self, other):
+        """Refines the sequence and returns the formulas of <other> refined,
+        so that both have the same number of formulas, sets the length of
+        the sequence to the common length"""
+        # a sequence of infinite length (for example a number converted to a
+        # sequence) can be aligned with a sequence of any length
+
+        infinity = LinearFormula('inf')
+        if self.length.zip() == infinity:
+            length = other.length.copy()
+        elif other.length.zip() == infinity:
+            length = self.length
+        elif (self.length - other.length).zip() == LinearFormula(0):
+            length = self.length
+        else:
+            raise ValueError(
+                f'the lengths {self.length} and {other.length} are different')
+
+        if other.ntuple_index != self.ntuple_index:
+            other = other.set_ntuple_index(self.ntuple_index)
+
+        period = self.n*other.n // misc.gcd(self.n, other.n)
+        self.refine(period // self.n, inplace=True)
+        self.set_length(length, inplace=True)
+
+        return other.refine(period // other.n).formulas
+
+    def _get_period_slopes(self, m):
+        """Returns a list of the multipliers of <self.ntuple_index> in the
+        formulas of the sequence reduced to <m> formulas, or None if it
+        cannot be reduced to <m> formulas"""
+        # the formula f(q + m*p) has to be equal to the formula f(q) with
+        # 'ratio*<self.ntuple_index> + p' substituted for
+        # <self.ntuple_index>, where 'ratio == n // m'
+
+        decomposition = self._get_decomposition()
+        ratio = self.n // m
+
+        slopes = []
+        for q in range(m):
+            slope, _, intercept = decomposition[q]
+            if slope % ratio != 0:
+                return None
+
+            new_slope = slope // ratio
+            for p in range(1, ratio):
+                other_slope, _, other_intercept = decomposition[q + m*p]
+                if other_slope != slope:
+                    return None
+
+                difference = (other_intercept - intercept).zip()
+                if (difference.get_variables() != set()
+                        or difference.evaluate() != new_slope*p):
+                    return None
+
+            slopes.append(new_slope)
+
+        return slopes
+
+    def _split_formula(self, formula):
+        """Returns a tuple (slope, intercept) such that the formula is
+        'intercept + slope*<self.ntuple_index>'"""
+        # <intercept> is zipped, but it keeps the segments with zero
+        # multipliers and the constant segment is placed where the first
+        # constant or <self.ntuple_index> segment of <formula> is, so that
+        # <_with_constant> can reproduce the simplest form of the values
+        # exactly
+
+        slope = 0
+        multipliers = {}
+        for multiplier, variable in zip(
+                formula.multipliers, formula.variables):
+            if variable == self.ntuple_index:
+                slope += multiplier
+                multipliers[''] = multipliers.get('', 0)
+            else:
+                multipliers[variable] = (
+                    multipliers.get(variable, 0) + multiplier)
+
+        intercept = LinearFormula(
+            list(multipliers.values()), list(multipliers.keys()))
+
+        return (slope, intercept)
+
+    @classmethod
+    def _with_constant(cls, intercept, constant):
+        """Returns <intercept> with the constant replaced by <constant> in
+        the simplest form"""
+
+        multipliers = []
+        variables = []
+        for multiplier, variable in zip(
+                intercept.multipliers, intercept.variables):
+            if variable == '':
+                multiplier = constant
+
+            if multiplier != 0:
+                multipliers.append(multiplier)
+                variables.append(variable)
+
+        return LinearFormula(multipliers, variables)
 
     def get_variables(self, omit_zeros=False, global_only=False):
         """Returns a set of variables used by the sequence"""
@@ -245,21 +725,21 @@ class NTermRecursionSequence():
         that the current formula is the <no_formula>-th formula, if such
         bound can be determined"""
 
-        no_last_formula = (self.get_length_mod_n() - 1) % self.n
-        relation = self.get_ntuple_index_inequality(
-            no_formula, no_last_formula)
+        if not 0 <= no_formula < self.n:
+            raise ValueError(
+                "the 'no_formula' argument must be in [0, ..., n)")
 
-        relation.expose(self.ntuple_index, inplace=True)
-        if relation.relation != '<=':
-            # this should never happen
-            raise ValueError(f'something went wrong: {relation}')
+        # if <self.length> == n*q + m, where 0 <= m < n, then the first m
+        # formulas are used q + 1 times and the other ones q times
+        length_mod_n = self.get_length_mod_n()
 
-        multiplier = relation.left[self.ntuple_index]
-        if multiplier != 1:
-            raise ValueError(
-                f'cannot generate the upper bound of {self.ntuple_index}')
+        # all the multipliers of <self.length> - m are divisible by n, so the
+        # division is exact
+        bound = (self.length - length_mod_n).zip() // self.n
+        if no_formula >= length_mod_n:
+            bound -= 1
 
-        return relation.right
+        return bound.zip()
 
     def get_edge(self, key):
         """Returns a value assigned to the chosen edge of the graph based on
@@ -272,15 +752,408 @@ class NTermRecursionSequence():
             return self.formulas[key] + self.formulas[key + 1]
 
         elif key == self.n - 1:
-            # the ntuple index is incremented in the next formula
-            this_formula = self.formulas[key]
-            next_formula = self.formulas[0].substitute(
-                **{self.ntuple_index: f'{self.ntuple_index} + 1'})
+            # the ntuple index is incremented in the next formula, which
+            # increases it's value by it's slope
+            slope = self._get_decomposition()[0][0]
+            next_formula = self.formulas[0].copy()
+            if slope != 0:
+                next_formula.add_segment(slope, '', inplace=True)
 
-            return this_formula + next_formula
+            return self.formulas[key] + next_formula
 
         else:
             raise ValueError(f'invalid key value: {key}')
 
+    def last_value(self):
+        """Returns the last value of the sequence in the simplest form, if
+        the length of the sequence modulo n can be determined"""
+
+        if self.length.zip() == LinearFormula('inf'):
+            raise ValueError('the sequence is infinite')
+
+        # the last index is 'length - 1 == n*i + no_formula', where
+        # 'length == n*q + length_mod_n'
+        length_mod_n = self.get_length_mod_n()
+        no_formula = (length_mod_n - 1) % self.n
+        ntuple_index = (
+            (self.length - length_mod_n).zip() // self.n
+            + (length_mod_n - 1 - no_formula) // self.n
+        ).zip()
+
+        slope, constant, intercept = self._get_decomposition()[no_formula]
+        return (intercept + ntuple_index*slope).zip()
+
+    def edge_sequence(self):
+        """Returns the sequence of the values assigned to the edges of the
+        graph based on the vertex numbering"""
+        # the <key>-th formula of the returned sequence is
+        # <self.get_edge(key)> in the simplest form, so the <index>-th value
+        # is the sum of the <index>-th and (<index> + 1)-th values of the
+        # sequence.
+        # The sequence is computed once and cached, a copy is returned, so
+        # that modifying it does not affect the cache
+
+        if self._edge_sequence is None:
+            if self.length.zip() == LinearFormula('inf'):
+                length = self.length.copy()
+            else:
+                length = (self.length - 1).zip()
+
+            self._edge_sequence = NTermRecursionSequence(
+                *(self.get_edge(key).zip() for key in range(self.n)),
+                length=length, ntuple_index=self.ntuple_index
+            )
+
+        return self._edge_sequence.copy()
+
+    def range_sum(self, start=0, stop=None, **values):
+        """Returns the sum of the values of the sequence from the <start>-th
+        to the (<stop> - 1)-th, after substituting <values> for the global
+        variables"""
+        # every formula gives an arithmetic progression, so the sum is
+        # computed in closed form for each formula.
+        # If the number of values given by a formula depends on variables,
+        # the sum is linear only if that formula is a number, otherwise a
+        # ValueError is raised
+
+        sequence, ranges = self._get_ranges(start, stop, values)
+
+        total = LinearFormula([], [])
+        for (slope, constant, intercept), (first, last, count) in zip(
+                sequence._get_decomposition(), ranges):
+
+            if count.get_variables() == set():
+                count = max(count.evaluate(), 0)
+
+                # sum(intercept + slope*i for i in [first, first + count))
+                total += intercept*count
+                total += first*(slope*count)
+                total += slope*count*(count - 1)//2
+
+            elif slope == 0 and intercept.get_variables(omit_zeros=True) == (
+                    set()):
+                total += count*constant
+
+            else:
+                raise ValueError('the sum is not a linear formula')
+
+        return NTermRecursionSequence._simplest(total)
+
+    def range_min(self, start=0, stop=None, **values):
+        """Returns the smallest of the values of the sequence from the
+        <start>-th to the (<stop> - 1)-th, after substituting <values> for
+        the global variables"""
+        return self._range_extreme(start, stop, values, minimum=True)
+
+    def range_max(self, start=0, stop=None, **values):
+        """Returns the greatest of the values of the sequence from the
+        <start>-th to the (<stop> - 1)-th, after substituting <values> for
+        the global variables"""
+        return self._range_extreme(start, stop, values, minimum=False)
+
+    def count_between(self, low, high, start=0, stop=None, **values):
+        """Returns how many of the values of the sequence from the <start>-th
+        to the (<stop> - 1)-th are in [<low>, <high>], after substituting
+        <values> for the global variables"""
+        # the result has to be a number, so the values of all the variables
+        # have to be known
+
+        sequence, ranges = self._get_ranges(start, stop, values)
+        low = NTermRecursionSequence._number(LinearFormula(low), values)
+        high = NTermRecursionSequence._number(LinearFormula(high), values)
+
+        result = 0
+        for (slope, constant, intercept), (first, last, count) in zip(
+                sequence._get_decomposition(), ranges):
+
+            constant = NTermRecursionSequence._number(intercept, {})
+            first = NTermRecursionSequence._number(first, {})
+            last = NTermRecursionSequence._number(last, {})
+
+            # find the ntuple indices for which 'low <= value <= high'
+            if slope == 0:
+                if not low <= constant <= high:
+                    continue
+            elif slope > 0:
+                first = max(first, -((constant - low) // slope))
+                last = min(last, (high - constant) // slope)
+            else:
+                first = max(first, -((high - constant) // -slope))
+                last = min(last, (constant - low) // -slope)
+
+            result += max(last - first + 1, 0)
+
+        return result
+
+    def find_collisions(self, other=None, **values):
+        """Returns a list of tuples (index, other_index) such that the
+        <index>-th value of the sequence is equal to the <other_index>-th
+        value of <other>, after substituting <values> for the global
+        variables"""
+        # there is one tuple for every pair of formulas that give a common
+        # value - the one with the smallest index of the first formula.
+        # If <other> is not given, the collisions within the sequence are
+        # returned, as tuples with <index> < <other_index>.
+        # Every formula gives an arithmetic progression, so the common values
+        # of two formulas are found by solving a linear diophantine equation,
+        # without evaluating the sequences
+
+        progressions = self._get_progressions(values)
+        if other is None:
+            other_progressions = progressions
+        else:
+            other_progressions = other._get_progressions(values)
+
+        collisions = []
+        for no_formula, progression in enumerate(progressions):
+            for other_no_formula, other_progression in enumerate(
+                    other_progressions):
+
+                if other is None and other_no_formula < no_formula:
+                    continue
+
+                if other is None and other_no_formula == no_formula:
+                    # a formula collides with itself only if it is constant
+                    slope, _, count = progression
+                    if slope == 0 and (count is None or count > 1):
+                        collisions.append((no_formula, no_formula + self.n))
+                    continue
+
+                solution = NTermRecursionSequence._find_common_value(
+                    progression, other_progression)
+                if solution is None:
+                    continue
+
+                i, j = solution
+                if other is None:
+                    collisions.append(tuple(sorted([
+                        self.n*i + no_formula,
+                        self.n*j + other_no_formula
+                    ])))
+                else:
+                    collisions.append((
+                        self.n*i + no_formula,
+                        other.n*j + other_no_formula
+                    ))
+
+        return collisions
+
+    def _get_ranges(self, start, stop, values):
+        """Returns the sequence after substituting <values> and a list of
+        tuples (first, last, count), one for each formula, such that the
+        formula gives the values from the <start>-th to the (<stop> - 1)-th
+        for ntuple indices in [first, last] and count == last - first + 1"""
+        # <first>, <last> and <count> are formulas, the values of <start> and
+        # <stop> modulo n have to be known
+
+        if values != {}:
+            sequence = self.substitute(**values)
+            start = LinearFormula(start).substitute(**values)
+        else:
+            sequence = self
+            start = LinearFormula(start)
+
+        if stop is None:
+            if sequence.length == LinearFormula('inf'):
+                raise ValueError('the sequence is infinite')
+            stop = sequence.length
+        else:
+            stop = LinearFormula(stop).substitute(**values)
+
+        ranges = []
+        for no_formula in range(self.n):
+            # 'start <= n*i + no_formula < stop'
+            first = NTermRecursionSequence._floor_div(
+                start - no_formula + self.n - 1, self.n)
+            last = NTermRecursionSequence._floor_div(
+                stop - no_formula - 1, self.n)
+            count = (last - first + 1).zip()
+
+            ranges.append((first, last, count))
+
+        return sequence, ranges
+
+    def _range_extreme(self, start, stop, values, minimum):
+        """Returns the smallest (if <minimum> is True) or the greatest of the
+        values of the sequence from the <start>-th to the (<stop> - 1)-th"""
+        # every formula gives a monotonic sequence, so the extreme values are
+        # the first or the last ones given by each formula.
+        # If the number of values given by a formula depends on variables,
+        # that formula is assumed to give at least one value
+
+        sequence, ranges = self._get_ranges(start, stop, values)
+
+        result = None
+        for (slope, constant, intercept), (first, last, count) in zip(
+                sequence._get_decomposition(), ranges):
+
+            if count.get_variables() == set() and count.evaluate() <= 0:
+                continue
+
+            if (slope >= 0) == minimum:
+                candidate = (intercept + first*slope).zip()
+            else:
+                candidate = (intercept + last*slope).zip()
+
+            if result is None:
+                result = candidate
+                continue
+
+            difference = (candidate - result).zip()
+            if difference.get_variables() != set():
+                raise ValueError(f'cannot compare {candidate} and {result}')
+
+            if (difference.evaluate() < 0) == minimum:
+                result = candidate
+
+        if result is None:
+            raise ValueError('there are no values in the given range')
+
+        return NTermRecursionSequence._simplest(result)
+
+    def _get_progressions(self, values):
+        """Returns a list of tuples (slope, constant, count), one for each
+        formula, such that the formula gives the values
+        'constant + slope*<self.ntuple_index>' for
+        '0 <= <self.ntuple_index> < count', after substituting <values> for
+        the global variables"""
+        # <count> is None if the sequence is infinite
+
+        if values != {}:
+            sequence = self.substitute(**values)
+        else:
+            sequence = self
+
+        if sequence.length == LinearFormula('inf'):
+            counts = [None]*self.n
+        else:
+            _, ranges = sequence._get_ranges(0, None, {})
+            counts = [
+                max(NTermRecursionSequence._number(count, {}), 0)
+                for _, _, count in ranges
+            ]
+
+        progressions = []
+        for (slope, _, intercept), count in zip(
+                sequence._get_decomposition(), counts):
+
+            constant = NTermRecursionSequence._number(intercept, {})
+            progressions.append((slope, constant, count))
+
+        return progressions
+
+    @classmethod
+    def _find_common_value(cls, progression, other_progression):
+        """Returns a tuple (i, j) with the smallest <i> such that the <i>-th
+        value of <progression> is equal to the <j>-th value of
+        <other_progression>, or None if there is no such tuple"""
+        # the progressions are tuples (slope, constant, count) returned by
+        # <_get_progressions>
+
+        slope, constant, count = progression
+        other_slope, other_constant, other_count = other_progression
+        if count == 0 or other_count == 0:
+            return None
+
+        # 'slope*i - other_slope*j == difference'
+        difference = other_constant - constant
+
+        if slope == 0 or other_slope == 0:
+            if slope == 0 and other_slope == 0:
+                return (0, 0) if difference == 0 else None
+            elif slope == 0:
+                i, (j, remainder) = 0, divmod(-difference, other_slope)
+                limit = other_count
+            else:
+                (i, remainder), j = divmod(difference, slope), 0
+                limit = count
+
+            if remainder != 0 or min(i, j) < 0:
+                return None
+            if limit is not None and max(i, j) >= limit:
+                return None
+
+            return (i, j)
+
+        gcd, x, y = misc.extended_gcd(slope, -other_slope)
+        if difference % gcd != 0:
+            return None
+
+        # all the solutions are 'i == i0 + step*t', 'j == j0 + other_step*t'
+        i0 = x*(difference // gcd)
+        j0 = y*(difference // gcd)
+        step = other_slope // gcd
+        other_step = slope // gcd
+
+        # every condition is 'start + multiplier*t >= 0'
+        conditions = [(i0, step), (j0, other_step)]
+        if count is not None:
+            conditions.append((count - 1 - i0, -step))
+        if other_count is not None:
+            conditions.append((other_count - 1 - j0, -other_step))
+
+        lower, upper = None, None
+        for start, multiplier in conditions:
+            if multiplier > 0:
+                bound = -(start // multiplier)
+                if lower is None or bound > lower:
+                    lower = bound
+            else:
+                bound = start // -multiplier
+                if upper is None or bound < upper:
+                    upper = bound
+
+        if lower is not None and upper is not None and lower > upper:
+            return None
+
+        # 'i >= 0', so the smallest <i> is given by a finite bound of t
+        t = lower if step > 0 else upper
+        return (i0 + step*t, j0 + other_step*t)
+
+    @classmethod
+    def _iter_progression(cls, slope, constant, ntuple_indices, n, no_formula):
+        """Yields tuples (value, index) with the values
+        'constant + slope*<ntuple_index>' and the indices
+        'n*<ntuple_index> + no_formula' for every <ntuple_index> in
+        <ntuple_indices>"""
+
+        for ntuple_index in ntuple_indices:
+            yield (constant + slope*ntuple_index, n*ntuple_index + no_formula)
+
+    @classmethod
+    def _floor_div(cls, formula, n):
+        """Returns the formula equal to <formula> // <n>, if the value
+        <formula> % <n> can be determined"""
+
+        formula = formula.zip()
+        try:
+            remainder = formula.modulo(n).evaluate()
+        except TypeError:
+            raise ValueError(f'the value {formula} % {n} is ambiguous')
+
+        return (formula - remainder).zip() // n
+
+    @classmethod
+    def _simplest(cls, formula):
+        """Returns <formula> in the simplest form or it's value if it doesn't
+        depend on any variable"""
+
+        formula = formula.zip()
+        if formula.get_variables() == set():
+            return formula.evaluate()
+        else:
+            return formula
+
+    @classmethod
+    def _number(cls, formula, values):
+        """Returns the value of <formula> after substituting <values>, raises
+        ValueError if it is not a number"""
+
+        formula = formula.substitute(**values).zip()
+        if formula.get_variables() != set():
+            raise ValueError(f'{formula} is not a number')
+
+        return formula.evaluate()
+
     #-------------------------------------------------------------------------
 
@@ -0,0 +1,491 @@
+from .linear_formula import LinearFormula
+from .verifier import LabelingReport
+from .sweep import sweep
+from . import misc
+
+
+class PatternReport():
+    """A class to represent the result of verifying the properties of the
+    labelings given by a numbering pattern for all cycle lengths"""
+    # The cycle lengths are split into residue classes modulo
+    # <self.modulus>. In every class the properties are proven symbolically
+    # for all the cycle lengths from some point, the lengths before that
+    # point are verified one by one.
+    # <self.proofs> is a dict {(residue, property): n}, where n is the
+    # smallest cycle length of the class from which the property is proven.
+    # <self.failures> is a list of tuples (n, property, counterexample) with
+    # the failures found by verifying the labelings one by one (see
+    # <LabelingReport>).
+    # <self.unproven> is a list of tuples (residue, property) of the
+    # properties that could be neither proven nor disproven.
+
+
+    #-INIT--------------------------------------------------------------------
+
+    def __init__(self, properties, modulus, proofs, failures, unproven):
+        """Initializes the report"""
+
+        # the verified properties
+        self.properties = list(properties)
+
+        self.modulus = modulus
+        self.proofs = proofs
+        self.failures = failures
+        self.unproven = unproven
+
+    #-------------------------------------------------------------------------
+
+
+    #-MAGIC-METHOD-OVERLOADS--------------------------------------------------
+
+    def __str__(self):
+        content = ', '.join(
+            f'{prop}: {self.holds(prop)}' for prop in self.properties)
+
+        return f'PatternReport(modulus: {self.modulus}, {content})'
+
+    #-------------------------------------------------------------------------
+
+
+    #-OTHER-------------------------------------------------------------------
+
+    def holds(self, prop):
+        """Tells whether the property <prop> is proven for all the cycle
+        lengths"""
+        if prop not in self.properties:
+            raise ValueError(f'the property {prop} was not verified')
+
+        return (
+            self.get_failures(prop) == []
+            and all(other != prop for _, other in self.unproven)
+        )
+
+    def get_failures(self, *props):
+        """Returns a list of tuples (n, property, counterexample) with the
+        failures of the properties from <props> (all properties by
+        default)"""
+
+        if props == ():
+            props = self.properties
+
+        return [failure for failure in self.failures if failure[1] in props]
+
+    #-------------------------------------------------------------------------
+
+
+def verify_pattern(
+        pattern, properties=LabelingReport.properties, size_variable='n',
+        samples=3, **values):
+    """Returns a <PatternReport> with the properties of the labelings given
+    by <pattern> for all cycle lengths, given the <values> of the global
+    variables"""
+    # The lengths of the sequences of <pattern> have to depend on at most
+    # one variable x that is not given (or on <size_variable>, which stands
+    # for the cycle length n). The cycle lengths are split into classes in
+    # which x == x0 + M*t + c, where x0 is the smallest value of x for which
+    # the lengths are not negative and M is the least common multiple of the
+    # numbers of formulas of the sequences, so that all the formulas and the
+    # numbers of values given by every formula are linear in t (t >= 0).
+    # In every class the properties are proven symbolically for t >= T (the
+    # values are compared with closed-form range bounds and the pairs of
+    # formulas are shown to give disjoint values), the cycle lengths for
+    # t < T are verified one by one. If a property cannot be proven, the
+    # cycle lengths for the next <samples> values of t are verified, to find
+    # a counterexample.
+
+    for prop in properties:
+        if prop not in LabelingReport.properties:
+            raise ValueError(f'invalid property: {prop}')
+
+    parameter, n_formula, smallest = _get_parameter(
+        pattern, size_variable, values)
+
+    def verify(ns):
+        # verifies the cycle lengths <ns> one by one
+        results = sweep(
+            pattern, ns, workers=1, properties=properties,
+            size_variable=size_variable, **values
+        )
+        return [
+            (n, prop, counterexample)
+            for n, failures in results for prop, counterexample in failures
+        ]
+
+    if parameter is None:
+        # there is only one cycle length
+        n = n_formula.evaluate()
+        return PatternReport(properties, 0, {}, verify([n]), [])
+
+    # the pattern depends only on <parameter>
+    pattern = pattern.substitute(**values)
+    if size_variable != parameter:
+        pattern.substitute(**{size_variable: n_formula}, inplace=True)
+
+    t = _get_new_variable(pattern)
+    period = misc.lcm(pattern.left_seq.n, pattern.right_seq.n)
+    modulus = n_formula[parameter]*period
+
+    proofs = {}
+    failures = []
+    unproven = []
+    for c in range(period):
+        x = LinearFormula([period, smallest + c], [t, ''])
+        class_pattern = pattern.substitute(**{parameter: x})
+        n_of_t = n_formula.substitute(**{parameter: x}).zip()
+        residue = n_of_t.substitute(**{t: 0}).zip().evaluate() % modulus
+
+        thresholds = {
+            prop: _prove(class_pattern, n_of_t, prop, t)
+            for prop in properties
+        }
+
+        # the cycle lengths before the proofs hold
+        last = max(
+            [threshold for threshold in thresholds.values()
+             if threshold is not None],
+            default=0
+        )
+        failures += verify(
+            [n_of_t.evaluate(**{t: i}) for i in range(last)])
+
+        if None in thresholds.values():
+            sample_failures = verify([
+                n_of_t.evaluate(**{t: i})
+                for i in range(last, last + samples)
+            ])
+        else:
+            sample_failures = []
+
+        for prop, threshold in thresholds.items():
+            if threshold is not None:
+                proofs[(residue, prop)] = n_of_t.evaluate(**{t: threshold})
+                continue
+
+            prop_failures = [
+                failure for failure in sample_failures if failure[1] == prop]
+            if prop_failures == []:
+                unproven.append((residue, prop))
+            failures += prop_failures
+
+    failures.sort(key=lambda failure: failure[0])
+    return PatternReport(properties, modulus, proofs, failures, unproven)
+
+
+def _get_parameter(pattern, size_variable, values):
+    """Returns a tuple (parameter, n_formula, smallest) where <parameter> is
+    the variable the lengths of the sequences of <pattern> depend on,
+    <n_formula> is the cycle length as a formula of <parameter> and
+    <smallest> is the smallest value of <parameter> for which the lengths
+    are not negative"""
+    # <parameter> and <smallest> are None if the lengths are numbers
+
+    lengths = [
+        seq.length.substitute(**values).zip()
+        for seq in (pattern.left_seq, pattern.right_seq)
+    ]
+    total = (lengths[0] + lengths[1]).zip()
+    variables = total.get_variables()
+
+    if variables == set():
+        return (None, (total + 1).zip(), None)
+
+    if len(variables) > 1:
+        raise ValueError(
+            f'cannot deduce the values of {variables} from the cycle length')
+
+    parameter = variables.pop()
+    if parameter == size_variable:
+        if (total - parameter + 1).zip() != LinearFormula(0):
+            raise ValueError(
+                'the lengths of the sequences do not add up to'
+                + f' {size_variable} - 1'
+            )
+
+    # 'multiplier*parameter + constant >= 0' for both lengths
+    smallest = None
+    for length in lengths:
+        multiplier, constant = _get_coefficients(length, parameter)
+        if multiplier < 0:
+            raise ValueError(
+                f'the length {length} decreases with {parameter}')
+        elif multiplier == 0:
+            if constant < 0:
+                raise ValueError(f'the length {length} is negative')
+            continue
+
+        # rounding up
+        bound = -(constant // multiplier)
+        if smallest is None or bound > smallest:
+            smallest = bound
+
+    return (parameter, (total + 1).zip(), smallest)
+
+
+def _get_new_variable(pattern):
+    """Returns a variable that is not used by <pattern>"""
+
+    variable = 't'
+    while variable in pattern.get_variables() | {pattern.ntuple_index}:
+        variable += "'"
+
+    return variable
+
+
+#-PROOFS----------------------------------------------------------------------
+
+# The proofs work with progressions - tuples (slope, intercept, count) of a
+# number and two formulas of t, representing the values
+# 'intercept + slope*i' for 0 <= i < count.
+# Every proof returns the smallest threshold T >= 0, such that the proven
+# statement holds for all t >= T, or None if the statement cannot be proven.
+
+
+def _prove(pattern, n, prop, t):
+    """Returns the threshold from which the property <prop> of the
+    labelings given by <pattern> is proven"""
+    # <n> is the cycle length as a formula of t
+
+    sides = []
+    for seq in (pattern.left_seq, pattern.right_seq):
+        if seq.length.zip() != LinearFormula(0):
+            sides.append(seq)
+
+    if prop == 'bijective':
+        progressions = [(0, pattern.center, LinearFormula(1))]
+        for seq in sides:
+            progressions += _get_progressions(seq)
+
+        thresholds = [
+            _get_validity(progressions, sides, t),
+            _prove_injective(progressions, t)
+        ]
+        for progression in progressions:
+            minimum, maximum = _get_extremes(progression)
+            thresholds.append(_get_threshold(minimum - 1, t))
+            thresholds.append(_get_threshold(n - maximum, t))
+
+        return _combine(thresholds)
+
+    progressions = _get_edge_progressions(pattern, sides)
+    thresholds = [
+        _get_validity(progressions, sides, t),
+        _prove_injective(progressions, t)
+    ]
+
+    if prop in {'consecutive', 'arithmetic'}:
+        thresholds.append(_prove_progression(
+            progressions, n, t, 1 if prop == 'consecutive' else None))
+
+    return _combine(thresholds)
+
+
+def _get_progressions(seq):
+    """Returns a list of the progressions given by the formulas of <seq>"""
+
+    _, ranges = seq._get_ranges(0, None, {})
+    progressions = []
+    for (slope, _, intercept), (_, _, count) in zip(
+            seq._get_decomposition(), ranges):
+
+        if count != LinearFormula(0):
+            progressions.append((slope, intercept, count))
+
+    return progressions
+
+
+def _get_edge_progressions(pattern, sides):
+    """Returns a list of the progressions of the weights of the edges of
+    the cycle labeled by <pattern>"""
+
+    progressions = []
+    for seq in sides:
+        progressions += _get_progressions(seq.edge_sequence())
+
+        # the edge between the central vertex and the first vertex of <seq>
+        progressions.append(
+            (0, pattern.center + seq.evaluate(0), LinearFormula(1)))
+
+    # the edge between the last vertices of the sequences or between the
+    # last vertex of the only sequence and the central vertex
+    last_values = [
+        LinearFormula(seq.range_max(seq.length - 1, seq.length))
+        for seq in sides
+    ]
+    if len(sides) == 1:
+        last_values.append(pattern.center)
+
+    progressions.append((0, last_values[0] + last_values[1], LinearFormula(1)))
+
+    return progressions
+
+
+def _get_validity(progressions, sides, t):
+    """Returns the threshold from which the sequences in <sides> and all the
+    <progressions> are not empty"""
+
+    thresholds = [_get_threshold(seq.length - 1, t) for seq in sides]
+    thresholds += [
+        _get_threshold(count - 1, t) for _, _, count in progressions]
+
+    return _combine(thresholds)
+
+
+def _prove_injective(progressions, t):
+    """Returns the threshold from which no two values of <progressions> are
+    equal"""
+
+    thresholds = []
+    for k, progression in enumerate(progressions):
+        slope, _, count = progression
+        if slope == 0:
+            thresholds.append(_get_threshold(-(count - 1), t))
+
+        for other_progression in progressions[k + 1:]:
+            thresholds.append(
+                _prove_disjoint(progression, other_progression, t))
+
+    return _combine(thresholds)
+
+
+def _prove_disjoint(progression, other_progression, t):
+    """Returns the threshold from which the values of <progression> and
+    <other_progression> are different"""
+
+    minimum, maximum = _get_extremes(progression)
+    other_minimum, other_maximum = _get_extremes(other_progression)
+
+    # one of the progressions is below the other one
+    options = [
+        _get_threshold(other_minimum - maximum - 1, t),
+        _get_threshold(minimum - other_maximum - 1, t),
+    ]
+
+    # the values of the progressions are different modulo the greatest
+    # common divisor of the slopes, or the progressions are constant and
+    # different
+    slope, intercept, _ = progression
+    other_slope, other_intercept, _ = other_progression
+    gcd = misc.gcd(abs(slope), abs(other_slope))
+    p, q = _get_coefficients(other_intercept - intercept, t)
+
+    if gcd != 0:
+        if p % gcd == 0 and q % gcd != 0:
+            options.append(0)
+    elif p == 0:
+        if q != 0:
+            options.append(0)
+    elif q % p == 0 and -q // p >= 0:
+        options.append(-q // p + 1)
+    else:
+        options.append(0)
+
+    options = [option for option in options if option is not None]
+    return min(options, default=None)
+
+
+def _prove_progression(progressions, n, t, difference):
+    """Returns the threshold from which the values of <progressions> are
+    n consecutive terms of an arithmetic progression with the difference
+    <difference> (any difference if None), given that they are distinct"""
+    # the values are such terms if they are equal modulo the difference and
+    # the difference between the greatest and the smallest one is
+    # 'difference*(n - 1)'
+
+    minimum, minimum_threshold = _get_envelope(
+        [_get_extremes(progression)[0] for progression in progressions],
+        t, smallest=True
+    )
+    maximum, maximum_threshold = _get_envelope(
+        [_get_extremes(progression)[1] for progression in progressions],
+        t, smallest=False
+    )
+
+    span_p, span_q = _get_coefficients(maximum - minimum, t)
+    n_p, n_q = _get_coefficients(n - 1, t)
+
+    if difference is None:
+        if n_p == 0 or span_p % n_p != 0:
+            return None
+        difference = span_p // n_p
+
+    if difference <= 0 or (span_p, span_q) != (
+            difference*n_p, difference*n_q):
+        return None
+
+    for slope, intercept, _ in progressions:
+        p, q = _get_coefficients(intercept - minimum, t)
+        if slope % difference != 0 or p % difference != 0:
+            return None
+        if q % difference != 0:
+            return None
+
+    return _combine([minimum_threshold, maximum_threshold])
+
+
+def _get_envelope(formulas, t, smallest):
+    """Returns a tuple (formula, threshold) with the smallest (or the
+    greatest) of the <formulas> of t for all t >= threshold"""
+
+    if smallest:
+        key = lambda formula: _get_coefficients(formula, t)
+    else:
+        key = lambda formula: tuple(-c for c in _get_coefficients(formula, t))
+
+    result = min(formulas, key=key)
+    if smallest:
+        thresholds = [_get_threshold(formula - result, t)
+                      for formula in formulas]
+    else:
+        thresholds = [_get_threshold(result - formula, t)
+                      for formula in formulas]
+
+    return (result, _combine(thresholds))
+
+
+def _get_extremes(progression):
+    """Returns a tuple (minimum, maximum) with the formulas of the smallest
+    and the greatest values of <progression>"""
+
+    slope, intercept, count = progression
+    last = intercept + (count - 1)*slope
+    if slope >= 0:
+        return (intercept, last)
+    else:
+        return (last, intercept)
+
+
+def _get_coefficients(formula, t):
+    """Returns a tuple (p, q) such that <formula> is 'p*t + q'"""
+
+    formula = LinearFormula(formula).zip()
+    variables = formula.get_variables() - {t}
+    if variables != set():
+        raise ValueError(f'the values of {variables} are not given')
+
+    coefficients = dict(zip(formula.variables, formula.multipliers))
+    return (coefficients.get(t, 0), coefficients.get('', 0))
+
+
+def _get_threshold(formula, t):
+    """Returns the threshold from which '<formula> >= 0'"""
+
+    p, q = _get_coefficients(formula, t)
+    if p == 0:
+        return 0 if q >= 0 else None
+    elif p < 0:
+        return None
+    else:
+        # rounding up
+        return max(-(q // p), 0)
+
+
+def _combine(thresholds):
+    """Returns the threshold from which all the statements with the
+    <thresholds> hold"""
+
+    if None in thresholds:
+        return None
+
+    return max(thresholds, default=0)
+
+#------------------------------------------------------------------------------
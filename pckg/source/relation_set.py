@@ -0,0 +1,341 @@
+from collections import deque
+from fractions import Fraction
+
+from .linear_formula import LinearFormula
+from .linear_relation import LinearRelation
+from . import misc
+
+
+class RelationSet():
+    """A class to represent a set of linear relations without duplicates and
+    without inequalities implied by other inequalities of the set"""
+    # the relations are identified by their normal keys (see
+    # <LinearRelation.get_normal_key>), so for example 'a == b' and
+    # '2b == 2a' are the same relation.
+    # Inequalities with the same left side (after moving the constant to the
+    # right side) are compared, for example 'L <= 3' makes 'L <= 5'
+    # redundant, so only the former is kept.
+
+
+    #-INIT--------------------------------------------------------------------
+
+    def __init__(self, *args):
+        """Initializes the set"""
+        # <args> should consist of another instance of <RelationSet> or of
+        # relations (values convertible to <LinearRelation>)
+
+        # {normal key: relation}
+        self._relations = {}
+
+        # {left side: normal key of the tightest inequality with that side}
+        self._inequalities = {}
+
+        if len(args) == 1 and type(args[0]) == RelationSet:
+            args = list(args[0])
+
+        for relation in args:
+            self.add(relation)
+
+    #-------------------------------------------------------------------------
+
+
+    #-MAGIC-METHOD-OVERLOADS--------------------------------------------------
+
+    def __str__(self):
+        relations = ', '.join(str(relation) for relation in self)
+        return f'{{{relations}}}'
+
+    def __eq__(self, other):
+        if type(other) != RelationSet:
+            return False
+
+        return set(self._relations) == set(other._relations)
+
+    def __len__(self):
+        return len(self._relations)
+
+    def __iter__(self):
+        return iter(self._relations.values())
+
+    @misc.convert_to_type(LinearRelation)
+    def __contains__(self, relation):
+        return relation.get_normal_key() in self._relations
+
+    #-------------------------------------------------------------------------
+
+
+    #-MODIFIERS---------------------------------------------------------------
+
+    @misc.convert_to_type(LinearRelation)
+    def add(self, relation):
+        """Adds <relation> to the set, unless it is already there or it is
+        implied by one of the inequalities in the set, returns whether the
+        relation was added"""
+        # the relation is copied by <misc.convert_to_type>, so modifying the
+        # original relation does not affect the set
+
+        key = relation.get_normal_key()
+        if key in self._relations:
+            return False
+
+        inequality = RelationSet._split_inequality(key)
+        if inequality is not None:
+            left, bound = inequality
+
+            try:
+                old_key = self._inequalities[left]
+            except KeyError:
+                old_key = None
+
+            if old_key is not None:
+                old_bound = RelationSet._split_inequality(old_key)[1]
+                if old_bound <= bound:
+                    # the new inequality is implied by the old one
+                    return False
+
+                # the old inequality is implied by the new one
+                del self._relations[old_key]
+
+            self._inequalities[left] = key
+
+        self._relations[key] = relation
+        return True
+
+    def update(self, *relations):
+        """Adds all of <relations> to the set"""
+        for relation in relations:
+            self.add(relation)
+
+    @misc.convert_to_type(LinearRelation)
+    def remove(self, relation):
+        """Removes <relation> from the set, raises KeyError if it is not
+        there"""
+
+        key = relation.get_normal_key()
+        if key not in self._relations:
+            raise KeyError(f'{relation}')
+
+        del self._relations[key]
+
+        inequality = RelationSet._split_inequality(key)
+        if inequality is not None:
+            del self._inequalities[inequality[0]]
+
+    @misc.convert_to_type(LinearRelation)
+    def discard(self, relation):
+        """Removes <relation> from the set if it is there"""
+        try:
+            self.remove(relation)
+        except KeyError:
+            pass
+
+    #-------------------------------------------------------------------------
+
+
+    #-OTHER-------------------------------------------------------------------
+
+    def copy(self):
+        """Returns a copy of the set"""
+        return RelationSet(self)
+
+    @misc.convert_to_type(LinearRelation)
+    def implies(self, relation):
+        """Tells whether <relation> is in the set or is implied by one of the
+        inequalities in the set"""
+
+        key = relation.get_normal_key()
+        if key in self._relations:
+            return True
+
+        inequality = RelationSet._split_inequality(key)
+        if inequality is None:
+            return False
+
+        left, bound = inequality
+        try:
+            old_key = self._inequalities[left]
+        except KeyError:
+            return False
+
+        return RelationSet._split_inequality(old_key)[1] <= bound
+
+    def propagate_bounds(
+            self, lower_bounds={}, upper_bounds={}, max_revisions=100000):
+        """Returns a tuple (lower_bounds, upper_bounds) of dicts
+        {variable: number} with the tightest bounds of the variables that
+        can be deduced from the relations and the given bounds"""
+        # The variables are assumed to be integers. The returned dicts can be
+        # passed to <LinearFormula.get_bounds>.
+        # Only the given bounds that are numbers are used.
+
+        # Every variable has an interval [lower, upper], where None means
+        # there is no bound. The intervals are tightened by the relations
+        # until nothing changes - when a bound of a variable changes, only the
+        # relations that use that variable are revised again.
+        # <max_revisions> limits the number of revisions, which otherwise
+        # could be infinite for some contradictory relations, for example
+        # 'a < b', 'b < a' with no upper bounds, a ValueError is raised if
+        # the limit is reached before the bounds stop changing.
+
+        lower = RelationSet._numeric_bounds(lower_bounds)
+        upper = RelationSet._numeric_bounds(upper_bounds)
+
+        # every relation is represented by constraints in the form
+        # 'sum(multiplier*variable) + constant <= 0'
+        constraints = []
+        for key in self._relations:
+            relation, items = key
+            multipliers = dict(items)
+            constant = multipliers.pop('', 0)
+
+            if multipliers == {}:
+                if not LinearRelation._operators[relation](constant, 0):
+                    raise ValueError('the relations are contradictory')
+                continue
+
+            if relation == '<':
+                # 'L < 0' is equivalent to 'L + 1 <= 0' for integers
+                constant += 1
+
+            constraints.append((multipliers, constant))
+            if relation == '==':
+                constraints.append((
+                    {variable: -multiplier
+                     for variable, multiplier in multipliers.items()},
+                    -constant
+                ))
+
+        # {variable: indices of constraints that use it}
+        watchers = {}
+        for index, (multipliers, _) in enumerate(constraints):
+            for variable in multipliers:
+                watchers.setdefault(variable, []).append(index)
+
+        queue = deque(range(len(constraints)))
+        queued = set(queue)
+        revisions = 0
+
+        while queue and revisions < max_revisions:
+            index = queue.popleft()
+            queued.discard(index)
+            revisions += 1
+
+            multipliers, constant = constraints[index]
+            changed = RelationSet._revise(multipliers, constant, lower, upper)
+
+            for variable in changed:
+                if (variable in lower and variable in upper
+                        and lower[variable] > upper[variable]):
+                    raise ValueError('the relations are contradictory')
+
+                for other_index in watchers[variable]:
+                    if other_index not in queued:
+                        queue.append(other_index)
+                        queued.add(other_index)
+
+        if queue:
+            raise ValueError(
+                f'the bounds did not converge in {max_revisions} revisions')
+
+        return (lower, upper)
+
+    @classmethod
+    def _revise(cls, multipliers, constant, lower, upper):
+        """Tightens the bounds in <lower> and <upper> using the constraint
+        'sum(multiplier*variable) + constant <= 0', returns a list of the
+        variables whose bounds have changed"""
+
+        # the minimal values of the terms 'multiplier*variable', the terms
+        # without a minimum (because of a missing bound) are counted
+        minimum = constant
+        unbounded = 0
+        term_minimums = {}
+        for variable, multiplier in multipliers.items():
+            if multiplier > 0:
+                bound = lower.get(variable)
+            else:
+                bound = upper.get(variable)
+
+            if bound is None:
+                unbounded += 1
+            else:
+                term_minimums[variable] = multiplier*bound
+                minimum += multiplier*bound
+
+        changed = []
+        for variable, multiplier in multipliers.items():
+
+            # the minimum of the rest of the constraint
+            if variable in term_minimums:
+                if unbounded > 0:
+                    continue
+                rest = minimum - term_minimums[variable]
+            else:
+                if unbounded > 1:
+                    continue
+                rest = minimum
+
+            # 'multiplier*variable <= -rest'
+            if multiplier > 0:
+                bound = (-rest) // multiplier
+                if variable not in upper or bound < upper[variable]:
+                    upper[variable] = bound
+                    changed.append(variable)
+            else:
+                # rounding up
+                bound = -((-rest) // -multiplier)
+                if variable not in lower or bound > lower[variable]:
+                    lower[variable] = bound
+                    changed.append(variable)
+
+        return changed
+
+    @classmethod
+    def _numeric_bounds(cls, bounds):
+        """Returns a dict {variable: number} with the bounds from <bounds>
+        that are numbers"""
+
+        result = {}
+        for variable, bound in bounds.items():
+            bound = LinearFormula(bound)
+            if bound.get_variables(omit_zeros=True) == set():
+                result[variable] = bound.zip().evaluate()
+
+        return result
+
+    @classmethod
+    def _split_inequality(cls, key):
+        """Returns a tuple (left, bound) such that the inequality represented
+        by the normal key <key> is equivalent to 'left <= bound' or
+        'left < bound', or None if <key> does not represent such inequality"""
+        # <left> is a tuple of (variable, multiplier) pairs divided by their
+        # greatest common divisor, <bound> is a tuple (number, strict),
+        # so that the bounds can be compared - a smaller bound is a stronger
+        # one and 'left < b' is stronger than 'left <= b'
+
+        relation, items = key
+        if relation == '==':
+            return None
+
+        constant = 0
+        left = []
+        for variable, multiplier in items:
+            if variable == '':
+                constant = multiplier
+            else:
+                left.append((variable, multiplier))
+
+        if left == []:
+            # the relation does not depend on any variable
+            return None
+
+        gcd = misc.gcd(*(abs(multiplier) for _, multiplier in left))
+        left = tuple(
+            (variable, multiplier // gcd) for variable, multiplier in left)
+
+        # strict inequalities get 0, so that they come first
+        bound = (Fraction(-constant, gcd), 0 if relation == '<' else 1)
+
+        return (left, bound)
+
+    #-------------------------------------------------------------------------
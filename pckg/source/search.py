@@ -0,0 +1,408 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .linear_formula import LinearFormula
+from .ntr_sequence import NTermRecursionSequence
+from .cv_numbering import CentralVertexNumbering
+from .verifier import LabelingReport, verify_labeling
+
+
+# the data sent to every worker process once, by <_init_worker>
+_worker_data = None
+
+
+def search(
+        left_len, right_len, left_n=1, right_n=1, slopes=range(-2, 3),
+        multipliers=range(-2, 3), constants=range(-2, 3),
+        properties=('bijective', 'distinct'), samples=4, workers=None):
+    """Yields the numbering patterns (instances of
+    <CentralVertexNumbering>) with the lengths of the sequences <left_len>
+    and <right_len>, whose labelings have the <properties> for <samples>
+    cycle lengths"""
+    # The left and right-hand sequences consist of <left_n> and <right_n>
+    # formulas 's*i + a*k + b' and the central number is 'a*k + b', where k
+    # is the variable used by the lengths, s is from <slopes>, a is from
+    # <multipliers> and b is from <constants>.
+    # The candidates are built formula by formula - the central number, the
+    # right-hand and then the left-hand formulas. Every formula gives an
+    # arithmetic progression of labels, and so do the edges between the
+    # formulas, so after adding a formula the partial candidate is checked
+    # in closed form for every sample cycle length, and pruned if
+    # - a label is out of range or is the label of another vertex (for the
+    #   property 'bijective'),
+    # - the weight of an edge is the weight of another edge (for 'distinct'
+    #   and 'consecutive'),
+    # - the weight of an edge is out of the range of the consecutive weights
+    #   of the labels 1, 2, ..., n (for 'bijective' and 'consecutive').
+    # The complete candidates are verified for the sample cycle lengths (see
+    # <verify_labeling>), the patterns that pass can be verified for all
+    # cycle lengths with <verify_pattern>.
+
+    # The sample cycle lengths are the ones given by the <samples> smallest
+    # values of k for which every formula and every edge between two
+    # formulas is used. The equivalent patterns (see
+    # <CentralVertexNumbering.get_canonical_key>) are yielded once.
+
+    # The candidates are split into tasks by the first two formulas, which
+    # are searched by a pool of <workers> processes (by default one for
+    # every CPU). The patterns found by a task are yielded as soon as the
+    # task is finished, if <workers> is 1, the candidates are searched in
+    # this process and the patterns are yielded as soon as they are found.
+
+    for prop in properties:
+        if prop not in LabelingReport.properties:
+            raise ValueError(f'invalid property: {prop}')
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('the number of workers must be positive')
+
+    if left_n < 1 or right_n < 1:
+        raise ValueError('the numbers of formulas must be positive')
+
+    left_len = LinearFormula(left_len).zip()
+    right_len = LinearFormula(right_len).zip()
+    variables = left_len.get_variables() | right_len.get_variables()
+    if len(variables) > 1:
+        raise ValueError(
+            f'the lengths depend on more than one variable: {variables}')
+
+    variable = variables.pop() if variables else None
+    if variable == 'i':
+        raise ValueError("the variable 'i' is used by the sequences")
+    if variable is None:
+        multipliers = [0]
+
+    values = _get_samples(left_len, right_len, left_n, right_n, samples)
+    data = (
+        _get_slots(left_n, right_n),
+        list(itertools.product(multipliers, constants)),
+        list(itertools.product(slopes, multipliers, constants)),
+        tuple(properties),
+        [_get_sample(left_len, right_len, variable, value)
+         for value in values]
+    )
+
+    def get_formula(coefficients):
+        # 's*i + a*k + b' or 'a*k + b', without k if the lengths are numbers
+        names = ['i', variable, ''][-len(coefficients):]
+        segments = [
+            (multiplier, name)
+            for multiplier, name in zip(coefficients, names)
+            if name is not None
+        ]
+        return LinearFormula(
+            [multiplier for multiplier, _ in segments],
+            [name for _, name in segments]
+        ).zip()
+
+    def get_pattern(path):
+        formulas = [get_formula(coefficients) for coefficients in path[1:]]
+        return CentralVertexNumbering(
+            get_formula(path[0]),
+            NTermRecursionSequence(*formulas[right_n:]),
+            NTermRecursionSequence(*formulas[:right_n]),
+            left_len=left_len,
+            right_len=right_len
+        )
+
+    found = set()
+
+    def new_patterns(paths):
+        for path in paths:
+            pattern = get_pattern(path)
+            key = pattern.get_canonical_key()
+            if key not in found:
+                found.add(key)
+                yield pattern
+
+    if workers == 1:
+        yield from new_patterns(_search_subtree((), data))
+        return
+
+    tasks = list(_iter_prefixes(data, 2))
+    executor = ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(data,))
+    try:
+        futures = [executor.submit(_search_task, task) for task in tasks]
+        for future in as_completed(futures):
+            yield from new_patterns(future.result())
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _get_samples(left_len, right_len, left_n, right_n, samples):
+    """Returns a list with the <samples> smallest values of the variable of
+    the lengths, such that the left and right lengths are at least
+    '2*<left_n>' and '2*<right_n>'"""
+    # a single value (None) is returned if the lengths are numbers
+
+    variables = left_len.get_variables() | right_len.get_variables()
+    if variables == set():
+        for length, n in [(left_len, left_n), (right_len, right_n)]:
+            if length.evaluate() < 2*n:
+                raise ValueError(
+                    f'the length {length} is too small for {n} formulas')
+
+        return [None]
+
+    variable = variables.pop()
+    smallest = None
+    for length, n in [(left_len, left_n), (right_len, right_n)]:
+        # 'multiplier*variable + constant >= 2*n'
+        try:
+            multiplier = length[variable]
+        except KeyError:
+            multiplier = 0
+        constant = length.substitute(**{variable: 0}).zip().evaluate()
+        if multiplier < 0:
+            raise ValueError(f'the length {length} decreases with {variable}')
+        elif multiplier == 0:
+            if constant < 2*n:
+                raise ValueError(
+                    f'the length {length} is too small for {n} formulas')
+            continue
+
+        # rounding up
+        bound = max(-((constant - 2*n) // multiplier), 0)
+        if smallest is None or bound > smallest:
+            smallest = bound
+
+    return list(range(smallest, smallest + samples))
+
+
+def _get_sample(left_len, right_len, variable, value):
+    """Returns a tuple (value, n, right_len, left_len) with the lengths for
+    the <value> of <variable>"""
+
+    if variable is None:
+        lengths = (right_len.evaluate(), left_len.evaluate())
+        value = 0
+    else:
+        lengths = (
+            right_len.evaluate(**{variable: value}),
+            left_len.evaluate(**{variable: value})
+        )
+
+    return (value, sum(lengths) + 1, *lengths)
+
+
+def _get_slots(left_n, right_n):
+    """Returns a list of tuples (side, no_formula, n) with the positions of
+    the formulas in the order in which they are chosen"""
+    # the side of the central number is None
+
+    return (
+        [(None, 0, 1)]
+        + [(0, no_formula, right_n) for no_formula in range(right_n)]
+        + [(1, no_formula, left_n) for no_formula in range(left_n)]
+    )
+
+
+def _init_worker(data):
+    """Stores the data shared by all the tasks of a worker process"""
+    global _worker_data
+    _worker_data = data
+
+
+def _search_task(prefix):
+    """Returns a list of the complete candidates starting with <prefix>"""
+    return list(_search_subtree(prefix, _worker_data))
+
+
+def _iter_prefixes(data, depth):
+    """Yields the partial candidates with <depth> formulas that are not
+    pruned"""
+    for path, _ in _iter_partial((), None, data, depth):
+        yield path
+
+
+def _search_subtree(prefix, data):
+    """Yields the complete candidates starting with <prefix> that have the
+    properties for all the sample cycle lengths"""
+    # a candidate is a tuple of the coefficients of the formulas in the
+    # order of <_get_slots>
+
+    slots, _, _, properties, samples = data
+
+    # the progressions of <prefix>
+    states = None
+    for depth in range(len(prefix)):
+        states = _extend(prefix[:depth + 1], states, data)
+        if states is None:
+            return
+
+    for path, _ in _iter_partial(prefix, states, data, len(slots)):
+        if _verify_candidate(path, data):
+            yield path
+
+
+def _iter_partial(path, states, data, depth):
+    """Yields tuples (path, states) with the partial candidates with <depth>
+    formulas that extend <path> and are not pruned"""
+    # <states> are the progressions of the labels and the weights of <path>
+    # for every sample cycle length (see <_extend>)
+
+    slots, center_coefficients, coefficients = data[:3]
+    if len(path) == depth:
+        yield (path, states)
+        return
+
+    if len(path) == 0:
+        candidates = center_coefficients
+    else:
+        candidates = coefficients
+
+    for candidate in candidates:
+        new_path = path + (candidate,)
+        new_states = _extend(new_path, states, data)
+        if new_states is not None:
+            yield from _iter_partial(new_path, new_states, data, depth)
+
+
+def _extend(path, states, data):
+    """Returns the progressions of the labels and the weights of the
+    partial candidate <path> for every sample cycle length, given the
+    progressions <states> of <path> without the last formula, or None if
+    the candidate is pruned"""
+    # the state of a sample is a tuple (labels, weights) of lists of
+    # progressions (slope, constant, count), as in
+    # <NTermRecursionSequence._get_progressions>
+
+    slots, _, _, properties, samples = data
+    bijective = 'bijective' in properties
+    consecutive = 'consecutive' in properties
+    distinct = consecutive or 'distinct' in properties
+
+    side, no_formula, n_formulas = slots[len(path) - 1]
+    new_states = []
+    for sample_index, (value, n, *lengths) in enumerate(samples):
+        if states is None:
+            labels, weights = [], []
+        else:
+            labels, weights = states[sample_index]
+
+        if side is None:
+            a, b = path[0]
+            new_labels = [(0, a*value + b, 1)]
+            new_weights = []
+        else:
+            new_labels, new_weights = _get_progressions(
+                path, slots, value, lengths)
+
+        if bijective:
+            for slope, constant, count in new_labels:
+                if count > 0 and not (
+                        1 <= constant <= n
+                        and 1 <= constant + slope*(count - 1) <= n):
+                    return None
+
+            for progression in new_labels:
+                for other in labels:
+                    if NTermRecursionSequence._find_common_value(
+                            progression, other) is not None:
+                        return None
+
+        if bijective and consecutive:
+            # the n consecutive weights add up to twice the sum of the
+            # labels 1, 2, ..., n, so they are (n + 3)/2, ..., (3n + 1)/2
+            for slope, constant, count in new_weights:
+                for weight in (constant, constant + slope*(count - 1)):
+                    if count > 0 and not n + 3 <= 2*weight <= 3*n + 1:
+                        return None
+
+        if distinct:
+            for k, progression in enumerate(new_weights):
+                for other in weights + new_weights[:k]:
+                    if NTermRecursionSequence._find_common_value(
+                            progression, other) is not None:
+                        return None
+
+        new_states.append((labels + new_labels, weights + new_weights))
+
+    return new_states
+
+
+def _get_progressions(path, slots, value, lengths):
+    """Returns a tuple (labels, weights) with the progressions of the labels
+    given by the last formula of <path> and of the weights of the edges
+    between that formula and the previous formulas"""
+    # the formulas of a side are <path>[first:first + n_formulas], the
+    # 'no_formula'-th formula gives the labels with the indices
+    # 'n_formulas*i + no_formula' of the sequence
+
+    side, no_formula, n_formulas = slots[len(path) - 1]
+    length = lengths[side]
+    first = len(path) - 1 - no_formula
+
+    def get_count(length, no_formula):
+        # the number of indices in [0, length) equal to <no_formula> modulo
+        # <n_formulas>
+        return max((length - no_formula + n_formulas - 1) // n_formulas, 0)
+
+    def get_constant(coefficients):
+        slope, a, b = coefficients
+        return a*value + b
+
+    slope = path[-1][0]
+    constant = get_constant(path[-1])
+    labels = [(slope, constant, get_count(length, no_formula))]
+
+    weights = []
+    if no_formula == 0:
+        # the edge between the central vertex and the first number
+        a, b = path[0]
+        if length > 0:
+            weights.append((0, a*value + b + constant, 1))
+    else:
+        # the edge between the previous formula and this one
+        previous = path[-2]
+        weights.append((
+            previous[0] + slope,
+            get_constant(previous) + constant,
+            get_count(length - 1, no_formula - 1)
+        ))
+
+    if no_formula == n_formulas - 1:
+        # the edge between this formula and the first one, with the ntuple
+        # index incremented
+        first_formula = path[first]
+        weights.append((
+            slope + first_formula[0],
+            constant + get_constant(first_formula) + first_formula[0],
+            get_count(length - 1, no_formula)
+        ))
+
+    return (labels, weights)
+
+
+def _verify_candidate(path, data):
+    """Tells whether the labelings given by the complete candidate <path>
+    have the properties for all the sample cycle lengths"""
+
+    slots, _, _, properties, samples = data
+    right_n = sum(1 for side, _, _ in slots if side == 0)
+
+    center = path[0]
+    formulas = path[1:]
+    for value, n, right_len, left_len in samples:
+        right = NTermRecursionSequence(*(
+            LinearFormula([s, a*value + b], ['i', ''])
+            for s, a, b in formulas[:right_n]
+        ))
+        left = NTermRecursionSequence(*(
+            LinearFormula([s, a*value + b], ['i', ''])
+            for s, a, b in formulas[right_n:]
+        ))
+
+        labels = CentralVertexNumbering(
+            center[0]*value + center[1], left, right,
+            left_len=left_len, right_len=right_len
+        ).actualize(n)
+
+        if verify_labeling(labels).get_failures(*properties) != []:
+            return False
+
+    return True
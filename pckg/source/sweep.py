@@ -0,0 +1,178 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from .verifier import LabelingReport, verify_numbering
+
+
+# the data sent to every worker process once, by <_init_worker>
+_worker_data = None
+
+
+def sweep(
+        pattern, n_range, workers=None, chunk_size=None,
+        properties=LabelingReport.properties, stop_on_failure=False,
+        size_variable='n', **values):
+    """Yields tuples (n, failures) for every cycle length n from <n_range>,
+    where <failures> is a list of tuples (property, counterexample) with
+    the properties from <properties> that the labeling of the cycle of
+    length n given by <pattern> does not have"""
+    # The values of the variables used by the lengths of the sequences of
+    # <pattern> are deduced from n (see <get_values>), the other global
+    # variables should be given in <values>. If the variable <size_variable>
+    # is used by the pattern, n is substituted for it. The cycle lengths that
+    # the pattern does not cover are skipped.
+
+    # <n_range> (any iterable, possibly unbounded) is split lazily into
+    # chunks of <chunk_size> lengths, which are verified by a pool of
+    # <workers> processes (by default one for every CPU), at most two chunks
+    # for every process are pending at once. The default <chunk_size> is
+    # based on the length of <n_range> if it is a <range>, otherwise it is
+    # 100. The pattern is sent to every process once, when the process
+    # starts. The results of a chunk are yielded as soon as the chunk is
+    # verified, so they are not necessarily in the order of <n_range>.
+    # If <stop_on_failure> is True, the sweep stops after the first chunk
+    # with a failure (the remaining results of that chunk are yielded).
+    # If <workers> is 1, the lengths are verified in this process.
+
+    for prop in properties:
+        if prop not in LabelingReport.properties:
+            raise ValueError(f'invalid property: {prop}')
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('the number of workers must be positive')
+
+    if chunk_size is None:
+        if type(n_range) == range:
+            # a few chunks for every worker, so that the work is balanced
+            chunk_size = max(len(n_range) // (4*workers), 1)
+        else:
+            chunk_size = 100
+
+    chunks = _iter_chunks(n_range, chunk_size)
+    data = (pattern, tuple(properties), size_variable, values)
+
+    if workers == 1:
+        for chunk in chunks:
+            results = _verify_chunk(chunk, data)
+            yield from results
+            if stop_on_failure and _has_failure(results):
+                return
+
+        return
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(data,))
+    try:
+        futures = set()
+        while True:
+            for chunk in itertools.islice(chunks, 2*workers - len(futures)):
+                futures.add(executor.submit(_verify_chunk, chunk))
+            if not futures:
+                return
+
+            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                results = future.result()
+                yield from results
+                if stop_on_failure and _has_failure(results):
+                    return
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def get_values(pattern, n, size_variable='n', **values):
+    """Returns a dict with <values> and the values of the variables used by
+    the lengths of the sequences of <pattern>, such that the pattern
+    determines a labeling of the cycle of length <n>, or None if there are
+    no such values"""
+    # the lengths have to add up to 'n - 1', so they can depend on at most
+    # one variable that is not given
+
+    values = dict(values)
+    if size_variable in pattern.get_variables():
+        values[size_variable] = n
+
+    left_len = pattern.left_seq.length.substitute(**values)
+    right_len = pattern.right_seq.length.substitute(**values)
+
+    # 'multiplier*variable + constant == 0'
+    equation = (left_len + right_len - (n - 1)).zip()
+    variables = equation.get_variables()
+    if len(variables) > 1:
+        raise ValueError(
+            f'cannot deduce the values of {variables} from the cycle length')
+
+    if len(variables) == 1:
+        variable = variables.pop()
+        multiplier = equation[variable]
+        constant = equation.substitute(**{variable: 0}).zip().evaluate()
+
+        if constant % multiplier != 0:
+            return None
+        values[variable] = -constant // multiplier
+
+    elif equation.evaluate() != 0:
+        return None
+
+    for length in (left_len, right_len):
+        if length.substitute(**values).zip().evaluate() < 0:
+            return None
+
+    return values
+
+
+def _iter_chunks(values, chunk_size):
+    """Yields lists of at most <chunk_size> consecutive <values>, without
+    reading more values than needed"""
+
+    iterator = iter(values)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if chunk == []:
+            return
+
+        yield chunk
+
+
+def _init_worker(data):
+    """Stores the data shared by all the tasks of a worker process"""
+    global _worker_data
+    _worker_data = data
+
+
+def _verify_chunk(chunk, data=None):
+    """Returns a list of tuples (n, failures) for the cycle lengths from
+    <chunk> (see <sweep>)"""
+    # <data> is the data stored by <_init_worker> unless it is given
+
+    if data is None:
+        data = _worker_data
+    pattern, properties, size_variable, values = data
+
+    results = []
+    for n in chunk:
+        pattern_values = get_values(pattern, n, size_variable, **values)
+        if pattern_values is None:
+            continue
+
+        # <size_variable> cannot be passed as a keyword argument if it is
+        # 'n', so it is substituted before
+        if size_variable in pattern_values:
+            del pattern_values[size_variable]
+            sized_pattern = pattern.substitute(**{size_variable: n})
+        else:
+            sized_pattern = pattern
+
+        report = verify_numbering(sized_pattern, n, **pattern_values)
+        results.append((n, report.get_failures(*properties)))
+
+    return results
+
+
+def _has_failure(results):
+    """Tells whether one of the <results> of <_verify_chunk> is a
+    failure"""
+    return any(failures != [] for _, failures in results)
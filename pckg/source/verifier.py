@@ -0,0 +1,455 @@
+import tempfile
+
+import numpy as np
+
+
+class LabelingReport():
+    """A class to represent the result of checking the properties of a
+    labeling of the vertices of a cycle"""
+    # the properties are:
+    # 'bijective'       - the labels are 1, 2, ..., n (in any order), for
+    #                     total labelings the labels of the vertices are
+    #                     1, 2, ..., n and the labels of the edges are
+    #                     n + 1, n + 2, ..., 2n,
+    # 'distinct'        - the weights of the edges are distinct,
+    # 'consecutive'     - the weights of the edges are consecutive numbers,
+    # 'arithmetic'      - the weights of the edges form an arithmetic
+    #                     progression (in some order).
+    # The weight of the edge k is the sum of the labels of the vertices
+    # v_k and v_k+1 (and v_n-1 and v_0 for the last edge), plus the label of
+    # the edge for total labelings.
+    # Every property has a counterexample, which is None if the property
+    # holds, otherwise it is:
+    # 'bijective'       - a tuple (vertex, label) with the first vertex
+    #                     whose label is out of range or repeats the label
+    #                     of one of the previous vertices (the edges of a
+    #                     total labeling follow the vertices, so the label
+    #                     of the edge k is the (n + k)-th label),
+    # 'distinct'        - a tuple (edge, other_edge) with the first edge
+    #                     whose weight is the weight of one of the previous
+    #                     edges and that previous edge,
+    # 'consecutive',
+    # 'arithmetic'      - a tuple (weight, next_weight) with the first two
+    #                     weights (in ascending order) whose difference is
+    #                     wrong.
+
+    properties = ['bijective', 'distinct', 'consecutive', 'arithmetic']
+
+
+    #-INIT--------------------------------------------------------------------
+
+    def __init__(self, labels, edge_weights, counterexamples, difference):
+        """Initializes the report"""
+
+        self.n = len(edge_weights)
+        self.labels = labels
+        self.edge_weights = edge_weights
+
+        # {property: counterexample}
+        self.counterexamples = counterexamples
+
+        # the difference of the arithmetic progression of the weights, or
+        # None if the weights don't form one
+        self.difference = difference
+
+    #-------------------------------------------------------------------------
+
+
+    #-MAGIC-METHOD-OVERLOADS--------------------------------------------------
+
+    def __str__(self):
+        content = ', '.join(
+            f'{prop}: {self.holds(prop)}' for prop in self.properties)
+
+        return f'LabelingReport(n: {self.n}, {content})'
+
+    #-------------------------------------------------------------------------
+
+
+    #-OTHER-------------------------------------------------------------------
+
+    def holds(self, prop):
+        """Tells whether the labeling has the property <prop>"""
+        if prop not in self.properties:
+            raise ValueError(f'invalid property: {prop}')
+
+        return self.counterexamples[prop] is None
+
+    def get_counterexample(self, prop):
+        """Returns the counterexample for the property <prop> or None if the
+        labeling has that property"""
+        if prop not in self.properties:
+            raise ValueError(f'invalid property: {prop}')
+
+        return self.counterexamples[prop]
+
+    def get_failures(self, *props):
+        """Returns a list of tuples (property, counterexample) with the
+        properties from <props> (all properties by default) that the
+        labeling does not have"""
+
+        if props == ():
+            props = self.properties
+
+        return [
+            (prop, self.get_counterexample(prop))
+            for prop in props if not self.holds(prop)
+        ]
+
+    #-------------------------------------------------------------------------
+
+
+def verify_labeling(labels):
+    """Returns a <LabelingReport> with the properties of the labeling of the
+    cycle v_0, v_1, ..., v_n-1, where <labels> are the labels of the
+    vertices"""
+
+    labels = np.asarray(labels, dtype=np.int64)
+    if labels.ndim != 1 or len(labels) == 0:
+        raise ValueError('the labels must be a non-empty 1-dimensional array')
+
+    n = len(labels)
+    in_range = (labels >= 1) & (labels <= n)
+    edge_weights = labels + np.roll(labels, -1)
+
+    return _verify(labels, in_range, edge_weights)
+
+
+def verify_total_labeling(vertex_labels, edge_labels):
+    """Returns a <LabelingReport> with the properties of the total labeling
+    of the cycle v_0, v_1, ..., v_n-1, where <vertex_labels> are the labels
+    of the vertices and <edge_labels> are the labels of the edges v_0 v_1,
+    v_1 v_2, ..., v_n-1 v_0"""
+
+    vertex_labels = np.asarray(vertex_labels, dtype=np.int64)
+    edge_labels = np.asarray(edge_labels, dtype=np.int64)
+    if vertex_labels.ndim != 1 or len(vertex_labels) == 0:
+        raise ValueError('the labels must be a non-empty 1-dimensional array')
+    if edge_labels.shape != vertex_labels.shape:
+        raise ValueError(
+            'the numbers of the labels of the vertices and the edges differ')
+
+    n = len(vertex_labels)
+    labels = np.concatenate((vertex_labels, edge_labels))
+    in_range = np.concatenate((
+        (vertex_labels >= 1) & (vertex_labels <= n),
+        (edge_labels >= n + 1) & (edge_labels <= 2*n)
+    ))
+    edge_weights = vertex_labels + np.roll(vertex_labels, -1) + edge_labels
+
+    return _verify(labels, in_range, edge_weights)
+
+
+def verify_numbering(pattern, n, **values):
+    """Returns a <LabelingReport> for the labeling of the cycle of length
+    <n> given by the numbering pattern <pattern>, given the <values> of
+    the global variables"""
+    # see <CentralVertexNumbering.actualize>, patterns of total labelings
+    # (for example <SSACycleDoubleCVN>) return the labels of the vertices
+    # and of the edges
+
+    labels = pattern.actualize(n, **values)
+    if type(labels) == tuple:
+        return verify_total_labeling(*labels)
+
+    return verify_labeling(labels)
+
+
+def verify_file(path, chunk=2**20, bitmap_dir=None):
+    """Returns a <LabelingReport> for the labeling stored in the .npy file
+    at <path>, reading <chunk> numbers at a time"""
+    # The file should hold an array of shape (2, n) with the labels of the
+    # vertices and the weights of the edges, or of shape (3, n) with the
+    # labels of the vertices, the labels of the edges and the weights of the
+    # edges (see <CentralVertexNumbering.actualize_to> and
+    # <SSACycleDoubleCVN.actualize_to>), the labels and the weights of the
+    # report are mapped into memory.
+    # The used labels and weights are marked in bitmaps mapped into memory
+    # from temporary files (in the directory <bitmap_dir>) - one bit for
+    # every label and two bits for every number between the smallest and the
+    # greatest weight, so the weights should not be too spread out.
+    # The counterexamples are the same as the ones of <verify_labeling> and
+    # <verify_total_labeling>.
+
+    if type(chunk) != int:
+        raise TypeError('the chunk size must be an integer')
+    if chunk < 1:
+        raise ValueError('the chunk size must be positive')
+
+    array = np.load(path, mmap_mode='r')
+    if array.ndim != 2 or array.shape[0] not in (2, 3) or array.shape[1] == 0:
+        raise ValueError('the array must have 2 or 3 non-empty rows')
+    if array.dtype != np.int64:
+        raise ValueError('the array must be of type int64')
+
+    n = array.shape[1]
+    labels = array[:-1].reshape(-1)
+    edge_weights = array[-1]
+    counterexamples = {}
+
+    with tempfile.TemporaryFile(dir=bitmap_dir) as file:
+        used = _new_bitmap(file, len(labels))
+        counterexamples['bijective'] = _stream_bijective(
+            labels, n, used, chunk)
+
+    smallest, greatest = None, None
+    for start in range(0, n, chunk):
+        weights = edge_weights[start:start + chunk]
+        if smallest is None or weights.min() < smallest:
+            smallest = int(weights.min())
+        if greatest is None or weights.max() > greatest:
+            greatest = int(weights.max())
+
+    with tempfile.TemporaryFile(dir=bitmap_dir) as seen_file, \
+            tempfile.TemporaryFile(dir=bitmap_dir) as repeated_file:
+        size = greatest - smallest + 1
+        seen = _new_bitmap(seen_file, size)
+        repeated = _new_bitmap(repeated_file, size)
+
+        counterexamples['distinct'] = _stream_distinct(
+            edge_weights, smallest, seen, repeated, chunk)
+
+        # the difference of the two smallest weights
+        if n == 1 or _get_bit(repeated, 0):
+            difference = 0
+        else:
+            difference = next(_iter_set_bits(seen, 1, chunk))
+
+        counterexamples['arithmetic'] = _stream_wrong_difference(
+            smallest, seen, repeated, difference, chunk)
+        counterexamples['consecutive'] = _stream_wrong_difference(
+            smallest, seen, repeated, 1, chunk)
+
+    if counterexamples['arithmetic'] is not None:
+        difference = None
+
+    return LabelingReport(labels, edge_weights, counterexamples, difference)
+
+
+def _new_bitmap(file, size):
+    """Returns a bitmap of <size> zeros mapped into memory from <file>"""
+    return np.memmap(file, dtype=np.uint8, mode='w+', shape=(-(-size // 8),))
+
+
+def _get_bit(bitmap, index):
+    """Tells whether the <index>-th bit of <bitmap> is set"""
+    return bool(bitmap[index >> 3] >> (index & 7) & 1)
+
+
+def _get_bits(bitmap, indices):
+    """Returns a boolean array telling which of the <indices> of <bitmap>
+    are set"""
+    return (bitmap[indices >> 3] >> (indices & 7).astype(np.uint8) & 1) == 1
+
+
+def _set_bits(bitmap, indices):
+    """Sets the bits of <bitmap> with the given <indices>"""
+    np.bitwise_or.at(
+        bitmap, indices >> 3, np.left_shift(1, indices & 7).astype(np.uint8))
+
+
+def _repeats_in_chunk(values):
+    """Returns a boolean array telling which of the <values> are equal to
+    one of the previous values"""
+
+    order = np.argsort(values, kind='stable')
+    sorted_values = values[order]
+    result = np.zeros(len(values), dtype=bool)
+    result[order[1:]] = sorted_values[1:] == sorted_values[:-1]
+
+    return result
+
+
+def _stream_bijective(labels, n, used, chunk):
+    """Returns the counterexample of the property 'bijective' (see
+    <LabelingReport>) of the <labels> of the vertices (and of the edges) of
+    the cycle of length <n>, marking the labels in the bitmap <used>"""
+    # the chunks do not cross the rows, so that the range of the labels is
+    # the same in the whole chunk
+
+    for row_start in range(0, len(labels), n):
+        for start in range(row_start, row_start + n, chunk):
+            stop = min(start + chunk, row_start + n)
+            values = np.asarray(labels[start:stop])
+            in_range = (values > row_start) & (values <= row_start + n)
+
+            indices = values[in_range] - 1
+            wrong = ~in_range
+            wrong[in_range] = (
+                _get_bits(used, indices) | _repeats_in_chunk(indices))
+
+            if wrong.any():
+                vertex = start + int(np.argmax(wrong))
+                return (vertex, int(labels[vertex]))
+
+            _set_bits(used, indices)
+
+    return None
+
+
+def _stream_distinct(edge_weights, smallest, seen, repeated, chunk):
+    """Returns the counterexample of the property 'distinct' (see
+    <LabelingReport>) of the <edge_weights>, marking the weights (minus
+    <smallest>) in the bitmap <seen> and the repeated ones in the bitmap
+    <repeated>"""
+
+    first_repeat = None
+    for start in range(0, len(edge_weights), chunk):
+        indices = np.asarray(edge_weights[start:start + chunk]) - smallest
+        repeats = _get_bits(seen, indices) | _repeats_in_chunk(indices)
+
+        if first_repeat is None and repeats.any():
+            first_repeat = start + int(np.argmax(repeats))
+
+        _set_bits(repeated, indices[repeats])
+        _set_bits(seen, indices)
+
+    if first_repeat is None:
+        return None
+
+    # the first edge with the same weight
+    weight = edge_weights[first_repeat]
+    for start in range(0, first_repeat, chunk):
+        equal = np.asarray(edge_weights[start:start + chunk]) == weight
+        if equal.any():
+            return (first_repeat, start + int(np.argmax(equal)))
+
+
+def _iter_set_bits(bitmap, start, chunk):
+    """Yields the indices of the set bits of <bitmap> from the <start>-th
+    one in ascending order"""
+
+    step = max(chunk // 8, 1)
+    for byte in range(start >> 3, len(bitmap), step):
+        bits = np.unpackbits(bitmap[byte:byte + step], bitorder='little')
+        for index in np.flatnonzero(bits) + 8*byte:
+            if index >= start:
+                yield int(index)
+
+
+def _stream_wrong_difference(smallest, seen, repeated, difference, chunk):
+    """Returns a tuple (weight, next_weight) with the first two weights (in
+    ascending order) whose difference is not <difference>, or None if there
+    are no such weights"""
+    # the sorted weights are the set bits of <seen> (plus <smallest>), the
+    # ones set in <repeated> occur at least twice, the difference between
+    # equal weights comes after the difference between the weight and the
+    # previous one
+
+    step = max(chunk // 8, 1)
+    previous = None
+    for byte in range(0, len(seen), step):
+        bits = np.unpackbits(seen[byte:byte + step], bitorder='little')
+        indices = np.flatnonzero(bits) + 8*byte
+        if len(indices) == 0:
+            continue
+
+        if previous is None:
+            differences = np.diff(indices, prepend=indices[0] - difference)
+        else:
+            differences = np.diff(indices, prepend=previous)
+
+        wrong_gap = differences != difference
+        wrong_repeat = _get_bits(repeated, indices) & (difference != 0)
+        wrong = wrong_gap | wrong_repeat
+        if wrong.any():
+            k = int(np.argmax(wrong))
+            weight = int(indices[k]) + smallest
+            if wrong_gap[k]:
+                return (weight - int(differences[k]), weight)
+
+            return (weight, weight)
+
+        previous = indices[-1]
+
+    return None
+
+
+def _verify(labels, in_range, edge_weights):
+    """Returns a <LabelingReport> for the <labels> and the <edge_weights>
+    of a labeling, where <in_range> tells which labels are in their
+    ranges"""
+    # the checks are vectorized, only finding the counterexample of a
+    # failed check costs more than a pass over the labels
+
+    n = len(edge_weights)
+    counterexamples = {}
+
+    # bijection onto 1, 2, ..., len(labels)
+    if not in_range.all():
+        first_out_of_range = int(np.argmin(in_range))
+        repeat = _find_first_repeat(labels[:first_out_of_range])
+    else:
+        first_out_of_range = None
+        ones = np.bincount(labels, minlength=len(labels) + 1)[1:] == 1
+        if ones.all():
+            repeat = None
+        else:
+            repeat = _find_first_repeat(labels)
+
+    if repeat is not None:
+        vertex = repeat[0]
+    else:
+        vertex = first_out_of_range
+
+    if vertex is None:
+        counterexamples['bijective'] = None
+    else:
+        counterexamples['bijective'] = (vertex, int(labels[vertex]))
+
+    # the weights are distinct if the differences of the sorted weights are
+    # not zeros
+    sorted_weights = np.sort(edge_weights)
+    differences = np.diff(sorted_weights)
+
+    if differences.all():
+        counterexamples['distinct'] = None
+    else:
+        counterexamples['distinct'] = _find_first_repeat(edge_weights)
+
+    difference = int(differences[0]) if n > 1 else 0
+    counterexamples['arithmetic'] = _find_wrong_difference(
+        sorted_weights, differences, difference)
+    counterexamples['consecutive'] = _find_wrong_difference(
+        sorted_weights, differences, 1)
+
+    if counterexamples['arithmetic'] is not None:
+        difference = None
+
+    return LabelingReport(labels, edge_weights, counterexamples, difference)
+
+
+def _find_first_repeat(values):
+    """Returns a tuple (index, earlier_index) with the first index of
+    <values> whose value is at the earlier index, or None if the values are
+    distinct"""
+
+    # after a stable sort the first occurrence of every value is the first
+    # one in the group of equal values
+    order = np.argsort(values, kind='stable')
+    sorted_values = values[order]
+    repeated = sorted_values[1:] == sorted_values[:-1]
+    if not repeated.any():
+        return None
+
+    positions = np.flatnonzero(repeated) + 1
+    k = positions[np.argmin(order[positions])]
+
+    # the first occurrence of the value
+    first = np.searchsorted(sorted_values, sorted_values[k])
+
+    return (int(order[k]), int(order[first]))
+
+
+def _find_wrong_difference(sorted_values, differences, difference):
+    """Returns a tuple (value, next_value) with the first two consecutive
+    values of <sorted_values> whose difference is not <difference>, or None
+    if there are no such values"""
+    # <differences> are the differences of the consecutive values
+
+    wrong = differences != difference
+    if not wrong.any():
+        return None
+
+    k = int(np.argmax(wrong))
+    return (int(sorted_values[k]), int(sorted_values[k + 1]))
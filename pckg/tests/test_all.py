@@ -7,8 +7,15 @@ from .test_lf_other import TestOther
 
 from .test_ntr_sequence import TestNTRSequence
 from .test_cv_numbering import TestCVN
+from .test_double_cvn import TestDoubleCVN
 
 from .test_linear_relation import TestLinearRelation
+from .test_relation_set import TestRelationSet
+
+from .test_verifier import TestVerifier
+from .test_sweep import TestSweep
+from .test_pattern_verifier import TestPatternVerifier
+from .test_search import TestSearch
 
 if __name__ == '__main__':
 
@@ -1,4 +1,7 @@
+import os
+import tempfile
 import unittest
+import numpy as np
 from ..source.cv_numbering import CentralVertexNumbering
 from ..source.ntr_sequence import NTermRecursionSequence
 from ..source.linear_formula import LinearFormula
@@ -532,6 +535,123 @@ class TestCVN(unittest.TestCase):
                 expected_result = LinearFormula(value).zip()
                 self.assertEqual(result, expected_result)
 
+    def test_evaluate_cache(self):
+
+        pattern = CentralVertexNumbering(
+            'a', ('i', '2i'), ('i + 1',), left_len='k', right_len='k')
+        pattern.set_cache_size(3)
+        for index in [0, 1, -1, 0, 1, -2, 0]:
+            pattern.evaluate(index)
+
+        self.assertEqual((pattern.cache_hits, pattern.cache_misses), (3, 4))
+
+        # the cache is emptied by the modifiers, copies keep its size
+        test_data = [
+            # modifier/
+            # /args/
+            # /index/
+            # /value before/
+            # /value after
+            ('substitute', {'a': 5}, 0, 'a', 5),
+            ('set_lengths', {'l_len': 3, 'r_len': 4}, 1, 1, 1),
+            ('set_ntuple_index', {'variable': 'j'}, -3, 1, 1),
+            ('reverse', {}, 1, 1, 0),
+        ]
+
+        for info in test_data:
+            copy = pattern.copy()
+            self.assertEqual(copy.evaluate(info[2]), LinearFormula(info[3]))
+
+            getattr(copy, info[0])(**info[1], inplace=True)
+            self.assertEqual(copy.evaluate(info[2]), LinearFormula(info[4]))
+            self.assertEqual((copy.cache_hits, copy.cache_misses), (0, 2))
+
+        # the index given as a keyword argument, with the cache off and on
+        for size in [0, 3]:
+            copy = pattern.copy()
+            copy.set_cache_size(size)
+            self.assertEqual(copy.evaluate(index=1), LinearFormula(1))
+            self.assertEqual(copy.evaluate(1), LinearFormula(1))
+            self.assertEqual(copy.evaluate(index=0), LinearFormula('a'))
+
+        self.assertRaises(TypeError, pattern.set_cache_size, None)
+        self.assertRaises(ValueError, pattern.set_cache_size, -3)
+
+    def test_actualize(self):
+
+        test_data = [
+            # init args/
+            # /values/
+            # /cycle length
+            (('2k', ('2i + 1', '2i + 2'), ('-i + 20',), '2k', 'k + 1'),
+             {'k': 2}, 8),
+            ((4, ('i', 'i'), ('2i', '2i'), 3, 'a'), {'a': 4}, 8),
+            (('a', ('i',), ('a',), 0, 2), {'a': 7}, 3),
+            ((1, ('i',), ('i',), 0, 0), {}, 1),
+        ]
+
+        for info in test_data:
+            pattern = CentralVertexNumbering(
+                *info[0][:3], left_len=info[0][3], right_len=info[0][4])
+            n = info[2]
+
+            result = pattern.actualize(n, **info[1])
+            self.assertEqual(result.dtype, np.int64)
+            self.assertEqual(len(result), n)
+
+            right_len = pattern.right_seq.length.evaluate(**info[1])
+            for vertex in range(n):
+                if vertex <= right_len:
+                    index = vertex
+                else:
+                    index = vertex - n
+
+                value = pattern.evaluate(index).evaluate(**info[1])
+                self.assertEqual(result[vertex], value)
+
+        pattern = CentralVertexNumbering(
+            'a', ('i',), ('2i',), left_len='k', right_len='k')
+        self.assertEqual(list(pattern.actualize(5, a=9, k=2)), [9, 0, 2, 1, 0])
+        self.assertRaises(ValueError, pattern.actualize, 6, a=9, k=2)
+        self.assertRaises(TypeError, pattern.actualize, 5, k=2)
+        self.assertRaises(TypeError, pattern.actualize, 5, a=9)
+
+    def test_iter_sorted(self):
+
+        test_data = [
+            # init args/
+            # /values/
+            # /sorted (value, index) tuples
+            (('2k', ('2i + 1', '2i + 2'), ('-i + 20',), '2k', 5),
+             {'k': 2},
+             [(1, -1), (2, -2), (3, -3), (4, 0), (4, -4),
+              (16, 5), (17, 4), (18, 3), (19, 2), (20, 1)]),
+
+            ((4, ('i', 'i'), ('2i', '2i'), 3, 'a'),
+             {'a': 4},
+             [(0, -1), (0, -2), (0, 1), (0, 2), (1, -3),
+              (2, 3), (2, 4), (4, 0)]),
+
+            (('a', ('i',), ('a',), 0, 2),
+             {'a': 7},
+             [(7, 0), (7, 1), (7, 2)]),
+        ]
+
+        for info in test_data:
+            pattern = CentralVertexNumbering(
+                *info[0][:3], left_len=info[0][3], right_len=info[0][4])
+            result = list(pattern.iter_sorted(**info[1]))
+            self.assertEqual(result, info[2])
+
+            for value, index in result:
+                self.assertEqual(
+                    pattern.evaluate(index).substitute(**info[1]).evaluate(),
+                    value
+                )
+
+        pattern = CentralVertexNumbering('a', ('i',), ('i',))
+        self.assertRaises(ValueError, next, pattern.iter_sorted())
+
     def test_get_variables(self):
 
         test_data = [
@@ -649,4 +769,238 @@ class TestCVN(unittest.TestCase):
                     LinearFormula(right[i]).substitute(i='j')
                 )
 
+
+    def test_edges(self):
+
+        test_data = [
+            # init args/
+            # /expected edges: right center, right, closing, left,
+            # left center
+            ((1, ('i', 'i+1', 'i+2'), ('i-1', 'i-2'), '3k', '2k'),
+             ('0', ('2i - 3', '2i - 2'), '2k - 2', ('2i + 1', '2i + 3',
+              '2i + 3'), '1')),
+
+            (('a', ('i',), ('2i', '2i + 1'), 'k', 'k'),
+             ('a', ('4i + 1', '4i + 3'), None, ('2i + 1',), 'a')),
+        ]
+
+        for info in test_data:
+            pattern = CentralVertexNumbering(
+                *info[0][:3], left_len=info[0][3], right_len=info[0][4])
+            edges = pattern.edges()
+            expected = info[1]
+
+            for key, formula in zip(
+                    ['right center', 'left center'],
+                    [expected[0], expected[4]]):
+                self.assertTrue(
+                    edges[key].equivalent(LinearFormula(formula)))
+
+            for key, formulas in zip(
+                    ['right', 'left'], [expected[1], expected[3]]):
+                self.assertEqual(edges[key].n, len(formulas))
+                for formula, expected_formula in zip(
+                        edges[key].formulas, formulas):
+                    self.assertTrue(
+                        formula.equivalent(LinearFormula(expected_formula)))
+
+            if expected[2] is None:
+                self.assertIsNone(edges['closing'])
+            else:
+                self.assertTrue(
+                    edges['closing'].equivalent(LinearFormula(expected[2])))
+
+        # the edges are cached until the pattern is modified
+        pattern = CentralVertexNumbering(
+            'a', ('i',), ('2i', '2i + 1'), left_len='k', right_len='k')
+        edges = pattern.edges()
+        expected = {
+            key: None if value is None else value.copy()
+            for key, value in edges.items()
+        }
+
+        # modifying the returned formulas does not affect the cache
+        edges['right'] += NTermRecursionSequence('100')
+        edges['right center'] += 100
+        del edges['left']
+        self.assertEqual(pattern.edges(), expected)
+
+        pattern.set_lengths('2m', '2m', inplace=True)
+        self.assertTrue(
+            pattern.edges()['closing'].equivalent(LinearFormula('4m - 2')))
+
+        pattern.substitute(a=5, inplace=True)
+        self.assertEqual(pattern.edges()['right center'], LinearFormula(5))
+
+        pattern.reverse(inplace=True)
+        self.assertEqual(pattern.edges()['right'].n, 1)
+
+    def test_edge_array(self):
+
+        test_data = [
+            # init args/
+            # /values/
+            # /cycle length
+            (('2k', ('2i + 1', '2i + 2'), ('-i + 20',), '2k', 'k + 1'),
+             {'k': 2}, 8),
+            ((4, ('i', 'i'), ('2i', '2i'), 3, 'a'), {'a': 4}, 8),
+            (('a', ('i',), ('a',), 0, 2), {'a': 7}, 3),
+            (('a', ('i',), ('a',), 2, 0), {'a': 7}, 3),
+            ((1, ('i',), ('i',), 0, 0), {}, 1),
+            ((1, ('-i + k + 1', '-i + 2k + 1'), ('i + k + 2', 'i + 2'),
+              'k', 'k'), {'k': 10}, 21),
+        ]
+
+        for info in test_data:
+            pattern = CentralVertexNumbering(
+                *info[0][:3], left_len=info[0][3], right_len=info[0][4])
+            n = info[2]
+
+            labels = pattern.actualize(n, **info[1])
+            result = pattern.edge_array(n, **info[1])
+            self.assertEqual(result.dtype, np.int64)
+            self.assertEqual(
+                list(result), list(labels + np.roll(labels, -1)))
+
+        pattern = CentralVertexNumbering(
+            'a', ('i',), ('2i',), left_len='k', right_len='k')
+        self.assertEqual(
+            list(pattern.edge_array(5, a=9, k=2)), [9, 2, 3, 1, 9])
+        self.assertRaises(ValueError, pattern.edge_array, 6, a=9, k=2)
+
+    def test_actualize_to(self):
+
+        test_data = [
+            # init args/
+            # /values/
+            # /cycle length
+            (('2k', ('2i + 1', '2i + 2'), ('-i + 20',), '2k', 'k + 1'),
+             {'k': 2}, 8),
+            ((4, ('i', 'i'), ('2i', '2i'), 3, 'a'), {'a': 4}, 8),
+            (('a', ('i',), ('a',), 0, 2), {'a': 7}, 3),
+            (('a', ('i',), ('a',), 2, 0), {'a': 7}, 3),
+            ((1, ('i',), ('i',), 0, 0), {}, 1),
+            ((1, ('-i + k + 1', '-i + 2k + 1'), ('i + k + 2', 'i + 2'),
+              'k', 'k'), {'k': 10}, 21),
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'labeling.npy')
+
+            for info in test_data:
+                pattern = CentralVertexNumbering(
+                    *info[0][:3], left_len=info[0][3], right_len=info[0][4])
+                n = info[2]
+                labels = pattern.actualize(n, **info[1])
+                weights = pattern.edge_array(n, **info[1])
+
+                for chunk in [1, 2, 3, 100]:
+                    array = pattern.actualize_to(
+                        path, n, chunk=chunk, **info[1])
+                    self.assertEqual(array.shape, (2, n))
+                    self.assertEqual(list(array[0]), list(labels))
+                    self.assertEqual(list(array[1]), list(weights))
+
+                    array = np.load(path)
+                    self.assertEqual(array.dtype, np.int64)
+                    self.assertEqual(list(array[0]), list(labels))
+
+            pattern = CentralVertexNumbering(
+                'a', ('i',), ('2i',), left_len='k', right_len='k')
+            self.assertRaises(
+                ValueError, pattern.actualize_to, path, 6, a=9, k=2)
+            self.assertRaises(
+                ValueError, pattern.actualize_to, path, 5, chunk=0, a=9, k=2)
+            self.assertRaises(
+                TypeError, pattern.actualize_to, path, 5, chunk=2.0, a=9, k=2)
+
+
+    def test_canonical_key(self):
+
+        pattern = CentralVertexNumbering(
+            1, ('-i + k + 1', '-i + 2k + 1'), ('i + k + 2', 'i + 2'),
+            left_len='k', right_len='k'
+        )
+
+        equivalent_patterns = [
+            pattern.reverse(),
+            pattern.set_ntuple_index('j'),
+            pattern.reverse().set_ntuple_index('j'),
+            CentralVertexNumbering(
+                '1 + 0a', ('k + 1 - i', '-i + k + k + 1'),
+                ('2 + i + k', 'i + 2'), left_len='k + 0', right_len='k'
+            ),
+            CentralVertexNumbering(
+                1, pattern.left_seq.refine(2), pattern.right_seq.refine(3),
+                left_len='k', right_len='k'
+            ),
+        ]
+
+        different_patterns = [
+            pattern.substitute(k='2k'),
+            pattern.set_lengths('k', 'k + 1'),
+            CentralVertexNumbering(
+                1, ('-i + k + 1', '-i + 2k + 1'), ('i + 2', 'i + k + 2'),
+                left_len='k', right_len='k'
+            ),
+            CentralVertexNumbering(
+                1, ('-i + k + 1', '-i + 2k + 2'), ('i + k + 2', 'i + 2'),
+                left_len='k', right_len='k'
+            ),
+        ]
+
+        key = pattern.get_canonical_key()
+        self.assertIs(pattern.get_canonical_key(), key)
+        self.assertEqual(hash(pattern), hash(key))
+
+        for other in equivalent_patterns:
+            self.assertEqual(other.get_canonical_key(), key)
+            self.assertEqual(hash(other), hash(pattern))
+            self.assertTrue(pattern.equivalent(other))
+            self.assertTrue(other.equivalent(pattern))
+
+        for other in different_patterns:
+            self.assertNotEqual(other.get_canonical_key(), key)
+            self.assertFalse(pattern.equivalent(other))
+
+        keys = set(
+            other.get_canonical_key()
+            for other in [pattern] + equivalent_patterns + different_patterns
+        )
+        self.assertEqual(len(keys), 1 + len(different_patterns))
+
+        # the key is recomputed after modifying the pattern
+        pattern.substitute(k='2k', inplace=True)
+        self.assertEqual(
+            pattern.get_canonical_key(),
+            different_patterns[0].get_canonical_key()
+        )
+
+    def test_canonize(self):
+
+        pattern = CentralVertexNumbering(
+            1, ('-i + k + 1', '-i + 2k + 1'), ('i + k + 2', 'i + 2'),
+            left_len='k', right_len='k'
+        )
+        other = CentralVertexNumbering(
+            '1 + 0a', ('i + 2 + k', '2 + i'),
+            ('-2i + k + 1', '2k + 1 - 2i', 'k - 2i', '-2i + 2k'),
+            left_len='k', right_len='k'
+        ).set_ntuple_index('j')
+
+        canonical = pattern.canonize()
+        self.assertEqual(other.canonize(), canonical)
+        self.assertEqual(canonical.canonize(), canonical)
+        self.assertTrue(canonical.equivalent(pattern))
+        self.assertEqual(canonical.ntuple_index, 'i')
+        self.assertEqual(canonical.right_seq.n, 2)
+
+        pattern.canonize(inplace=True)
+        self.assertEqual(pattern, canonical)
+
+        # 'i' is a global variable
+        seq = NTermRecursionSequence('j', ntuple_index='j')
+        pattern = CentralVertexNumbering('i', seq, seq)
+        self.assertEqual(pattern.canonize().ntuple_index, 'j')
+
     #-------------------------------------------------------------------------
@@ -0,0 +1,187 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from ..source.double_cvn import SSACycleDoubleCVN
+from ..source.cv_numbering import CentralVertexNumbering
+from ..source.linear_formula import LinearFormula
+from ..source.ntr_sequence import NTermRecursionSequence
+from ..source.verifier import verify_numbering, verify_file
+
+
+# a numbering of the vertices of the odd cycles with consecutive weights
+UPPER = CentralVertexNumbering(
+    1, ('-i + k + 1', '-i + 2k + 1'), ('i + k + 2', 'i + 2'),
+    left_len='k', right_len='k'
+)
+
+
+class TestDoubleCVN(unittest.TestCase):
+
+    def test_init(self):
+
+        lower = CentralVertexNumbering(
+            '4k + 2', ('i + 2k + 2',), ('-i + 4k + 1',), ntuple_index='j')
+        pattern = SSACycleDoubleCVN(UPPER, lower)
+
+        self.assertEqual(pattern.upper, UPPER)
+        self.assertEqual(pattern.lower.ntuple_index, 'i')
+        self.assertEqual(pattern.lower.left_seq.length, LinearFormula('k'))
+        self.assertEqual(pattern.lower.right_seq.length, LinearFormula('k'))
+        self.assertEqual(lower.ntuple_index, 'j')
+
+        self.assertEqual(SSACycleDoubleCVN(pattern), pattern)
+        self.assertEqual(pattern.copy(), pattern)
+        self.assertEqual(pattern.get_variables(), {'i', 'k'})
+
+        self.assertRaises(TypeError, SSACycleDoubleCVN, UPPER)
+        self.assertRaises(TypeError, SSACycleDoubleCVN, UPPER, 'k')
+        self.assertRaises(TypeError, SSACycleDoubleCVN, UPPER, lower, lower)
+
+    def test_deduce_edges(self):
+
+        test_data = [
+            # lower/
+            # /expected weights: left center, right center, left, right
+            (('4k + 2', ('i + 2k + 2',), ('-i + 4k + 1',)),
+             '5k + 4', '5k + 4', ('5k + 4', '5k + 4'), ('5k + 4', '5k + 4')),
+
+            (('2k + 2', ('-i + 4k + 2',), ('i + 2k + 3',)),
+             '3k + 4', '3k + 6', ('-4i + 7k + 4', '-4i + 7k + 2'),
+             ('4i + 3k + 8', '4i + 3k + 10')),
+        ]
+
+        for info in test_data:
+            pattern = SSACycleDoubleCVN(
+                UPPER, CentralVertexNumbering(*info[0]))
+            edges = pattern.deduce_edges()
+
+            self.assertTrue(
+                edges['left center'].equivalent(LinearFormula(info[1])))
+            self.assertTrue(
+                edges['right center'].equivalent(LinearFormula(info[2])))
+            for side, formulas in zip(['left', 'right'], info[3:5]):
+                self.assertEqual(edges[side].n, len(formulas))
+                for formula, expected in zip(
+                        edges[side].formulas, formulas):
+                    self.assertTrue(
+                        formula.equivalent(LinearFormula(expected)))
+
+                self.assertTrue(
+                    edges[side].length.equivalent(LinearFormula('k - 1')))
+
+            # modifying the returned formulas does not affect the cache
+            expected = {
+                key: None if value is None else value.copy()
+                for key, value in edges.items()
+            }
+            edges['left'] += NTermRecursionSequence('100')
+            edges['left center'] += 100
+            self.assertEqual(pattern.deduce_edges(), expected)
+            edges = pattern.deduce_edges()
+
+            # the formulas agree with the actualized labelings
+            for k in range(1, 6):
+                n = 2*k + 1
+                weights = verify_numbering(pattern, n, k=k).edge_weights
+
+                self.assertEqual(
+                    weights[n - 1], edges['left center'].evaluate(k=k))
+                self.assertEqual(
+                    weights[0], edges['right center'].evaluate(k=k))
+                for j in range(k - 1):
+                    self.assertEqual(
+                        weights[n - 2 - j],
+                        edges['left'].evaluate(j).evaluate(k=k)
+                    )
+                    self.assertEqual(
+                        weights[j + 1],
+                        edges['right'].evaluate(j).evaluate(k=k)
+                    )
+
+            # the closing edge depends on the parity of k
+            self.assertIsNone(edges['closing'])
+            for k_formula, k_values in [
+                    ('2m', [(m, 2*m) for m in range(1, 6)]),
+                    ('2m + 1', [(m, 2*m + 1) for m in range(0, 6)])]:
+                closing = pattern.substitute(
+                    k=k_formula).deduce_edges()['closing']
+                for m, k in k_values:
+                    n = 2*k + 1
+                    weights = verify_numbering(pattern, n, k=k).edge_weights
+                    self.assertEqual(weights[k], closing.evaluate(m=m))
+
+        pattern = SSACycleDoubleCVN(
+            UPPER, CentralVertexNumbering(*test_data[0][0]))
+        edges = pattern.deduce_edges()
+        pattern.substitute(k='2m', inplace=True)
+        self.assertTrue(pattern.deduce_edges()['left center'].equivalent(
+            LinearFormula('10m + 4')))
+
+    def test_actualize(self):
+
+        # a super edge-magic and a super (a, 2)-edge-antimagic total
+        # labeling of the odd cycles
+        test_data = [
+            # lower/
+            # /difference
+            (('4k + 2', ('i + 2k + 2',), ('-i + 4k + 1',)), 0),
+            (('2k + 2', ('-i + 4k + 2',), ('i + 2k + 3',)), 2),
+        ]
+
+        for info in test_data:
+            pattern = SSACycleDoubleCVN(
+                UPPER, CentralVertexNumbering(*info[0]))
+
+            for k in range(1, 20):
+                n = 2*k + 1
+                vertex_labels, edge_labels = pattern.actualize(n, k=k)
+                self.assertEqual(
+                    list(vertex_labels), list(UPPER.actualize(n, k=k)))
+                self.assertEqual(
+                    sorted(edge_labels), list(range(n + 1, 2*n + 1)))
+
+                report = verify_numbering(pattern, n, k=k)
+                self.assertEqual(report.get_failures('bijective'), [])
+                self.assertEqual(report.difference, info[1])
+
+        pattern = SSACycleDoubleCVN(
+            UPPER, CentralVertexNumbering(*test_data[0][0]))
+        vertex_labels, edge_labels = pattern.actualize(5, k=2)
+        self.assertTrue(np.array_equal(vertex_labels, [1, 4, 2, 5, 3]))
+        self.assertTrue(np.array_equal(edge_labels, [9, 8, 7, 6, 10]))
+        self.assertRaises(ValueError, pattern.actualize, 6, k=2)
+
+    def test_actualize_to(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'labeling.npy')
+
+            for lower, difference in [
+                    (('4k + 2', ('i + 2k + 2',), ('-i + 4k + 1',)), 0),
+                    (('2k + 2', ('-i + 4k + 2',), ('i + 2k + 3',)), 2)]:
+                pattern = SSACycleDoubleCVN(
+                    UPPER, CentralVertexNumbering(*lower))
+
+                for k in range(1, 8):
+                    n = 2*k + 1
+                    vertex_labels, edge_labels = pattern.actualize(n, k=k)
+
+                    for chunk in [1, 2, 5]:
+                        array = pattern.actualize_to(path, n, chunk=chunk, k=k)
+                        self.assertEqual(array.shape, (3, n))
+                        self.assertEqual(list(array[0]), list(vertex_labels))
+                        self.assertEqual(list(array[1]), list(edge_labels))
+
+                        report = verify_file(path, chunk=chunk)
+                        expected = verify_numbering(pattern, n, k=k)
+                        self.assertEqual(
+                            list(array[2]), list(expected.edge_weights))
+                        self.assertEqual(
+                            report.counterexamples, expected.counterexamples)
+                        self.assertEqual(report.difference, difference)
+
+            self.assertRaises(
+                ValueError, pattern.actualize_to, path, 6, k=2)
+            self.assertRaises(
+                ValueError, pattern.actualize_to, path, 5, chunk=-1, k=2)
@@ -1,4 +1,7 @@
+import os
+import tempfile
 import unittest
+import numpy as np
 from ..source.linear_formula import LinearFormula
 from ..source.linear_relation import LinearRelation
 
@@ -73,6 +76,49 @@ class TestLinearRelation(unittest.TestCase):
             self.assertEqual(rel_2.right, right)
             self.assertEqual(rel_2.relation, relation)
 
+    def test_init_with_invalid_string(self):
+
+        test_data = [
+            'a + b',
+            'a <= b <= c',
+            'a == b == c',
+            'a = b = c',
+            'a =< b',
+            '',
+        ]
+
+        for string in test_data:
+            self.assertRaises(ValueError, LinearRelation, string)
+
+    def test_read_many(self):
+
+        lines = [
+            'a + b <= 3c',
+            '',
+            '# a comment',
+            '   2a = b - 4  ',
+            'x > 0',
+        ]
+        expected = [
+            LinearRelation('a + b', '3c', relation='<='),
+            LinearRelation('2a', 'b - 4'),
+            LinearRelation('x', 0, relation='>'),
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'relations.txt')
+            with open(path, 'w') as file:
+                file.write('\n'.join(lines))
+
+            relations = LinearRelation.read_many(path)
+            self.assertEqual(next(relations), expected[0])
+            self.assertEqual(list(relations), expected[1:])
+
+            with open(path, 'a') as file:
+                file.write('\na + b')
+
+            self.assertRaises(ValueError, list, LinearRelation.read_many(path))
+
     #-------------------------------------------------------------------------
 
 
@@ -655,11 +701,74 @@ class TestLinearRelation(unittest.TestCase):
             self.assertFalse(rel_2.equivalent(rel_1))
             self.assertFalse(rel_2.equivalent(info[0]))
 
+    def test_compile(self):
 
+        test_data = [
+            # relation          variables   values      result
+            ('a + 2b <= 5',     ('a', 'b'), (1, 2),     True    ),
+            ('a + 2b <= 5',     ('a', 'b'), (2, 2),     False   ),
+            ('a + 2b <= 5',     ('b', 'a'), (2, 1),     True    ),
+            ('a == b',          (),         (3, 3),     True    ),
+            ('a == b',          (),         (3, 4),     False   ),
+            ('a + a > 2b - 1',  (),         (1, 1),     True    ),
+            ('a - a < b',       ('b',),     (0,),       False   ),
+            ('a >= 0',          ('a', 'x'), (0, 100),   True    ),
+            ('1 >= 0',          (),         (),         True    ),
+        ]
+
+        for info in test_data:
+            rel = LinearRelation(info[0])
+            predicate = rel.compile(*info[1])
+            self.assertEqual(predicate(*info[2]), info[3])
+
+            # compare with <status>
+            # (the variables that the relation doesn't depend on are 0)
+            values = dict.fromkeys(rel.get_variables(), 0)
+            values.update(zip(predicate.variables, info[2]))
+            status = rel.evaluate(**values).status()
+            self.assertEqual(status, str(info[3]).lower())
 
+        # numpy arrays
+        predicate = LinearRelation('a + 2b <= 5').compile('a', 'b')
+        a = np.array([1, 2, 3, -10])
+        b = np.array([2, 2, 1, 7])
+        self.assertEqual(list(predicate(a, b)), [True, False, True, True])
+        self.assertEqual(list(predicate(a, 1)), [True, True, True, True])
 
+        self.assertRaises(ValueError, LinearRelation('a <= b').compile, 'a')
+        self.assertRaises(TypeError, LinearRelation('a <= b').compile, 3)
+        self.assertRaises(TypeError, LinearRelation('a <= b').compile(), 1)
 
+    def test_get_normal_key(self):
+
+        test_data = [
+            # relation          normal key
+            ('a == b',          ('==', (('a', 1), ('b', -1)))           ),
+            ('b == a',          ('==', (('a', 1), ('b', -1)))           ),
+            ('2a + 4 == 6b',    ('==', (('', 2), ('a', 1), ('b', -3)))  ),
+            ('2 >= 2a',         ('<=', (('', -1), ('a', 1)))            ),
+            ('a + a < b',       ('<', (('a', 2), ('b', -1)))            ),
+            ('a - a == 0',      ('==', ())                              ),
+        ]
+
+        for info in test_data:
+            rel = LinearRelation(info[0])
+            self.assertEqual(rel.get_normal_key(), info[1])
+            self.assertEqual(hash(rel.get_normal_key()), hash(info[1]))
 
+        # the normal form follows the modifications of the relation
+        rel = LinearRelation('a <= b')
+        rel.left += 'c'
+        self.assertEqual(
+            rel.get_normal_key(), ('<=', (('a', 1), ('b', -1), ('c', 1))))
+        self.assertEqual(rel.solve(), LinearRelation('a + c - b <= 0'))
 
+        rel.substitute(c='b', inplace=True)
+        self.assertEqual(rel.get_normal_key(), ('<=', (('a', 1),)))
+        self.assertEqual(rel.status(), 'unknown')
 
+        rel.relation = '>'
+        self.assertEqual(rel.get_normal_key(), ('<', (('a', -1),)))
 
+        rel.left.multipliers[0] = 0
+        self.assertEqual(rel.status(), 'false')
@@ -1,4 +1,6 @@
+import itertools
 import unittest
+import numpy as np
 from ..source.ntr_sequence import NTermRecursionSequence
 from ..source.linear_formula import LinearFormula
 from ..source.linear_relation import LinearRelation
@@ -139,6 +141,63 @@ class TestNTRSequence(unittest.TestCase):
                 *info[3], length=info[4], ntuple_index=info[5])
             self.assertNotEqual(seq_1, seq_2)
 
+    def test_arithmetic(self):
+
+        test_data = [
+            # args of the first     args of the second      sum
+            ((('i', '2i'), '2k'),   (('3', 'i', 'a'), '2k'),
+                (('3i + 3', '8i', '3i + 1 + a', '6i + 5', '5i + 3',
+                  '6i + 4 + a'), '2k')                                      ),
+            ((('i', '2i'), '4'),    (('i',), 'inf'),
+                (('3i', '4i + 1'), '4')                                     ),
+            ((('i + a',), 'inf'),   (('i', '-i'), 'k'),
+                (('3i + a', 'i + 1 + a'), 'k')                              ),
+            ((('i',), 'k + 1'),     (('-i',), '1 + k'),     (('0',), 'k + 1')),
+        ]
+
+        for info in test_data:
+            seq = NTermRecursionSequence(*info[0][0], length=info[0][1])
+            other = NTermRecursionSequence(*info[1][0], length=info[1][1])
+            expected_seq = NTermRecursionSequence(
+                *info[2][0], length=info[2][1])
+
+            self.assertEqual(seq + other, expected_seq)
+            self.assertEqual((seq - (-other)).zip(), expected_seq)
+
+            values = list(seq.iter_values(0, 8, a=3, k=7))
+            other_values = list(other.iter_values(0, 8, a=3, k=7))
+            self.assertEqual(
+                list((seq - other).iter_values(0, 8, a=3, k=7)),
+                [v - w for v, w in zip(values, other_values)]
+            )
+
+            seq += other
+            self.assertEqual(seq, expected_seq)
+
+        # numbers
+        seq = NTermRecursionSequence('i', '2i + a', length='2k')
+        self.assertEqual(
+            seq*3, NTermRecursionSequence('3i', '6i + 3a', length='2k'))
+        self.assertEqual(
+            -2*seq, NTermRecursionSequence('-2i', '-4i - 2a', length='2k'))
+        self.assertEqual(
+            seq + 1,
+            NTermRecursionSequence('i + 1', '2i + a + 1', length='2k')
+        )
+        self.assertEqual(
+            1 - seq,
+            NTermRecursionSequence('-i + 1', '-2i - a + 1', length='2k')
+        )
+
+        # the operands are not modified
+        self.assertEqual(
+            seq, NTermRecursionSequence('i', '2i + a', length='2k'))
+
+        seq = NTermRecursionSequence('i', length=3)
+        self.assertRaises(
+            ValueError, seq.__add__, NTermRecursionSequence('i', length=4))
+        self.assertRaises(TypeError, seq.__mul__, seq)
+
     #-------------------------------------------------------------------------
 
 
@@ -259,6 +318,55 @@ class TestNTRSequence(unittest.TestCase):
         self.assertRaises(TypeError, seq.set_ntuple_index, 3)
         self.assertRaises(TypeError, seq.set_ntuple_index, LinearFormula('j'))
 
+    def test_minimize(self):
+
+        test_data = [
+            # init args                         minimized args
+            (('2i', '5', '2i + 1', '5'),        ('i', '5')                  ),
+            (('3', '3', '3'),                   ('3',)                      ),
+            (('a + 2i', 'a + 2i + 1'),          ('a + i',)                  ),
+            (('2i', '2i + 5', '7', '2i + 1', '2i + 6', '7'),
+                                                ('i', 'i + 5', '7')         ),
+            (('i', '5', 'i', '5'),              ('i', '5', 'i', '5')        ),
+            (('a + 2i', 'b + 2i + 1'),          ('a + 2i', 'b + 2i + 1')    ),
+            (('i', '2i'),                       ('i', '2i')                 ),
+        ]
+
+        for info in test_data:
+            seq = NTermRecursionSequence(*info[0], length='6k')
+            expected_seq = NTermRecursionSequence(*info[1], length='6k')
+            self.assertEqual(seq.minimize(), expected_seq)
+
+            seq.minimize(inplace=True)
+            self.assertEqual(seq, expected_seq)
+            self.assertEqual(
+                list(seq.iter_values(a=1, b=2, k=2)),
+                list(NTermRecursionSequence(*info[0], length='6k')
+                     .iter_values(a=1, b=2, k=2))
+            )
+
+    def test_refine(self):
+
+        test_data = [
+            # init args     k   refined args
+            (('i', '5'),    2,  ('2i', '5', '2i + 1', '5')                  ),
+            (('3i + a',),   3,  ('9i + a', '9i + 3 + a', '9i + 6 + a')      ),
+            (('i', '2i'),   1,  ('i', '2i')                                 ),
+        ]
+
+        for info in test_data:
+            seq = NTermRecursionSequence(*info[0], length='3k')
+            expected_seq = NTermRecursionSequence(*info[2], length='3k')
+            self.assertEqual(seq.refine(info[1]), expected_seq)
+            self.assertEqual(seq.refine(info[1]).minimize(), seq.minimize())
+
+            seq.refine(info[1], inplace=True)
+            self.assertEqual(seq, expected_seq)
+
+        seq = NTermRecursionSequence('i', '5')
+        self.assertRaises(ValueError, seq.refine, 0)
+        self.assertRaises(TypeError, seq.refine, '2')
+
     #-------------------------------------------------------------------------
 
 
@@ -328,6 +436,56 @@ class TestNTRSequence(unittest.TestCase):
 
             self.assertEqual(seq.evaluate(index), expected_result)
 
+            # the same values with the cache
+            seq.set_cache_size(2)
+            for _ in range(2):
+                self.assertEqual(seq.evaluate(index), expected_result)
+
+            self.assertEqual((seq.cache_hits, seq.cache_misses), (1, 1))
+
+    def test_evaluate_cache(self):
+
+        seq = NTermRecursionSequence('a + i', 'b - i', length='2k')
+        self.assertEqual(seq.evaluate(4), LinearFormula('a + 2').zip())
+        self.assertEqual((seq.cache_hits, seq.cache_misses), (0, 0))
+
+        seq.set_cache_size(2)
+        for index in [0, 1, 0, 2, 1, 0]:
+            seq.evaluate(index)
+
+        # 1 is evicted by 2, then 0 by 1
+        self.assertEqual((seq.cache_hits, seq.cache_misses), (1, 5))
+
+        # modifying a returned value does not affect the cache
+        value = seq.evaluate(0)
+        value.add_segment(1, 'c', inplace=True)
+        self.assertEqual(seq.evaluate(0), LinearFormula('a'))
+
+        # the cache is emptied by the modifiers, copies keep its size
+        seq.substitute(a=3, inplace=True)
+        self.assertEqual(seq.evaluate(0), LinearFormula(3))
+        seq.set_ntuple_index('j', inplace=True)
+        self.assertEqual(seq.evaluate(1), LinearFormula('b'))
+        self.assertEqual(seq.evaluate(3), LinearFormula('b - 1').zip())
+
+        copy = seq.copy()
+        copy.set_length(5, inplace=True)
+        copy.evaluate(0)
+        copy.evaluate(0)
+        self.assertEqual((copy.cache_hits, copy.cache_misses), (1, 1))
+
+        # the index given as a keyword argument, with the cache off and on
+        for size in [0, 2]:
+            seq = NTermRecursionSequence('a + i', 'b - i', length='2k')
+            seq.set_cache_size(size)
+            self.assertEqual(seq.evaluate(index=3), LinearFormula('b - 1'))
+            self.assertEqual(seq.evaluate(3), LinearFormula('b - 1'))
+            expected = (1, 1) if size > 0 else (0, 0)
+            self.assertEqual((seq.cache_hits, seq.cache_misses), expected)
+
+        self.assertRaises(TypeError, seq.set_cache_size, '2')
+        self.assertRaises(ValueError, seq.set_cache_size, -1)
+
     def test_get_variables(self):
 
         test_data = [
@@ -482,6 +640,21 @@ class TestNTRSequence(unittest.TestCase):
                 actual = seq.get_ntuple_index_bound(no_formula=no_f)
                 self.assertEqual(expected, actual)
 
+        test_data = [
+            # n     length      bounds
+            (2,     '4k + 1',   ('2k', '2k - 1')            ),
+            (3,     '3k',       ('k - 1', 'k - 1', 'k - 1') ),
+            (3,     '6k + 4',   ('2k + 1', '2k', '2k')      ),
+        ]
+
+        for info in test_data:
+            seq = NTermRecursionSequence(*info[0]*[1], length=info[1])
+            for no_f in range(info[0]):
+                self.assertTrue(
+                    seq.get_ntuple_index_bound(no_f).equivalent(info[2][no_f]))
+
+            self.assertRaises(ValueError, seq.get_ntuple_index_bound, info[0])
+
     def test_get_edge(self):
 
         test_data = [
@@ -507,3 +680,376 @@ class TestNTRSequence(unittest.TestCase):
             self.assertEqual(seq, ctrl_seq)
 
     #-------------------------------------------------------------------------
+
+    def test_edge_sequence(self):
+
+        test_data = [
+            # init args                     length  edge args
+            (('i', '2i + 1'),               '2k',   ('3i + 1', '3i + 2')    ),
+            (('i', '2i', '3i'),             'inf',  ('3i', '5i', '4i + 1')  ),
+            (('a + i',),                    10,     ('2a + 2i + 1',)        ),
+            (('4 - 2i + i', '5i - 7'),      7,      ('-3 + 4i', '4i - 4')   ),
+        ]
+
+        for info in test_data:
+            seq = NTermRecursionSequence(*info[0], length=info[1])
+            edges = seq.edge_sequence()
+
+            expected_length = info[1] if info[1] == 'inf' else seq.length - 1
+            self.assertEqual(
+                edges,
+                NTermRecursionSequence(
+                    *info[2], length=LinearFormula(expected_length).zip())
+            )
+            for key in range(seq.n):
+                self.assertTrue(
+                    edges.formulas[key].equivalent(seq.get_edge(key)))
+
+            values = list(seq.iter_values(0, 12, a=2, k=5))
+            self.assertEqual(
+                list(edges.iter_values(0, 11, a=2, k=5)),
+                [v + w for v, w in zip(values, values[1:])]
+            )
+
+        # the edge sequence is cached until the sequence is modified,
+        # modifying the returned sequence does not affect the cache
+        seq = NTermRecursionSequence('i', '2i + a', length='2k')
+        edges = seq.edge_sequence()
+        expected = edges.copy()
+        edges += NTermRecursionSequence('100')
+        self.assertEqual(seq.edge_sequence(), expected)
+        self.assertIsNot(seq.edge_sequence(), seq.edge_sequence())
+
+        seq.set_length(5, inplace=True)
+        self.assertEqual(seq.edge_sequence().length, LinearFormula(4))
+
+        seq.substitute(a=3, inplace=True)
+        self.assertEqual(
+            seq.edge_sequence(),
+            NTermRecursionSequence('3i + 3', '3i + 4', length=4)
+        )
+
+    def test_last_value(self):
+
+        test_data = [
+            # init args                     length      last value
+            (('i', '2i + 1'),               '2k + 1',   'k'             ),
+            (('i', '2i + 1'),               '2k',       '2k - 1'        ),
+            (('3i + a',),                   'k',        '3k + a - 3'    ),
+            (('i', '2i + 1', '5'),          '3k + 2',   '2k + 1'        ),
+            (('i', '2i + 1', '5'),          7,          2               ),
+        ]
+
+        for info in test_data:
+            seq = NTermRecursionSequence(*info[0], length=info[1])
+            self.assertTrue(
+                seq.last_value().equivalent(LinearFormula(info[2])))
+
+        seq = NTermRecursionSequence('i', '2i + 1', length='k')
+        self.assertRaises(ValueError, seq.last_value)
+        seq = NTermRecursionSequence('i', '2i + 1')
+        self.assertRaises(ValueError, seq.last_value)
+
+    def test_iter_values(self):
+
+        test_data = [
+            # init args                     ntuple  length
+            #                               index
+            (('a + b', '3i + 4', '4i'),     'i',    'inf'   ),
+            (('i', 'i'),                    'i',    'inf'   ),
+            (('1', 'a'),                    'i',    '5'     ),
+            (('a + i', 'b - i'),            'i',    '2k'    ),
+            (('i + a - 3', '2 - 2i + b'),   'i',    '2k'    ),
+            (('4 + a - 2j + j', 'j + a'),   'j',    'inf'   ),
+            (('a + 0b + j - j', '2j - a'),  'j',    'inf'   ),
+            (('i', 'i'),                    'j',    'inf'   ),
+        ]
+
+        for info in test_data:
+            seq = NTermRecursionSequence(
+                *info[0], ntuple_index=info[1], length=info[2])
+
+            global_variables = seq.get_variables(global_only=True)
+            global_variables -= {'inf'}
+
+            for start, stop in [(0, 10), (3, 11), (4, 4), (7, 9)]:
+                expected = [seq.evaluate(k) for k in range(start, stop)]
+                if all(formula.get_variables(omit_zeros=True)
+                       <= {seq.ntuple_index} for formula in seq.formulas):
+                    expected = [formula.evaluate() for formula in expected]
+                self.assertEqual(list(seq.iter_values(start, stop)), expected)
+
+                values = dict.fromkeys(global_variables, 2)
+                expected = [
+                    seq.substitute(**values).evaluate(k).evaluate()
+                    for k in range(start, stop)
+                ]
+                self.assertEqual(
+                    list(seq.iter_values(start, stop, **values)), expected)
+
+        # the default <stop> is the length of the sequence
+        seq = NTermRecursionSequence('a + i', '2i', length='2k + 1')
+        self.assertEqual(list(seq.iter_values(k=2, a=1)), [1, 0, 2, 2, 3])
+        self.assertEqual(list(seq.iter_values(3, k=2, a=1)), [2, 3])
+
+        values = seq.iter_values()
+        for k in range(100):
+            self.assertEqual(next(values), seq.evaluate(k))
+
+        # symbolic values
+        self.assertEqual(
+            list(seq.iter_values(0, 3, a='b + 1')),
+            [LinearFormula('b + 1'), LinearFormula(0), LinearFormula('b + 2')]
+        )
+        self.assertRaises(ValueError, list, seq.iter_values(0, 4, a='i'))
+
+    def test_iter_sorted(self):
+
+        test_data = [
+            # init args                     length  values
+            (('a + b', '3i + 4', '4i'),     17,     {'a': 1, 'b': -3}   ),
+            (('i', '-i'),                   10,     {}                  ),
+            (('1', 'a'),                    'k',    {'a': 1, 'k': 9}    ),
+            (('a + i', 'b - 2i'),           12,     {'a': 2, 'b': 5}    ),
+            (('4 - 2i + i', '5i - 7'),      0,      {}                  ),
+        ]
+
+        for info in test_data:
+            seq = NTermRecursionSequence(*info[0], length=info[1])
+            values = list(seq.iter_values(**info[2]))
+
+            result = list(seq.iter_sorted(**info[2]))
+            self.assertEqual(
+                [value for value, _ in result], sorted(values))
+            self.assertEqual(
+                sorted(index for _, index in result),
+                list(range(len(values)))
+            )
+            for value, index in result:
+                self.assertEqual(value, values[index])
+
+        # infinite sequences
+        seq = NTermRecursionSequence('i', '5')
+        self.assertEqual(
+            list(itertools.islice(seq.iter_sorted(), 8)),
+            [(0, 0), (1, 2), (2, 4), (3, 6), (4, 8), (5, 1), (5, 3), (5, 5)]
+        )
+
+        seq = NTermRecursionSequence('i', '-i')
+        self.assertRaises(ValueError, next, seq.iter_sorted())
+
+        seq = NTermRecursionSequence('i', 'a', length=4)
+        self.assertRaises(ValueError, next, seq.iter_sorted())
+
+    def test_to_array(self):
+
+        test_data = [
+            # init args                     values
+            (('a + b', '3i + 4', '4i'),     {'a': 1, 'b': -3}   ),
+            (('i', 'i'),                    {}                  ),
+            (('1', 'a'),                    {'a': 7}            ),
+            (('a + i', 'b - i'),            {'a': 2, 'b': 5}    ),
+            (('4 + a - 2i + i', 'i + a'),   {'a': 0}            ),
+            (('a + 0b',),                   {'a': 3}            ),
+        ]
+
+        for info in test_data:
+            seq = NTermRecursionSequence(*info[0])
+
+            for length in [0, 1, 5, 6, 100]:
+                array = seq.to_array(length, **info[1])
+                self.assertEqual(array.dtype, np.int64)
+                self.assertEqual(
+                    list(array), list(seq.iter_values(0, length, **info[1])))
+
+                for start in [1, 2, 7]:
+                    array = seq.to_array(length, start=start, **info[1])
+                    self.assertEqual(list(array), list(seq.iter_values(
+                        start, start + length, **info[1])))
+
+        seq = NTermRecursionSequence('a + i', '2i')
+        self.assertRaises(TypeError, seq.to_array, 5)
+        self.assertRaises(ValueError, seq.to_array, -1, a=1)
+        self.assertRaises(ValueError, seq.to_array, 1, start=-1, a=1)
+
+        seq = NTermRecursionSequence('1000000000000i', '2i')
+        self.assertEqual(seq.to_array(3)[2], 1000000000000)
+        self.assertRaises(OverflowError, seq.to_array, 20000000)
+        self.assertRaises(OverflowError, seq.to_array, 1, start=20000000)
+        self.assertRaises(
+            OverflowError, NTermRecursionSequence('a').to_array, 1, a=2**63)
+
+    def test_range_aggregates(self):
+
+        test_data = [
+            # init args                 length  values
+            (('a + b', '3i + 4', '4i'), 17,     {'a': 1, 'b': -3}   ),
+            (('i', '-i'),               10,     {}                  ),
+            (('1', 'a'),                'k',    {'a': 7, 'k': 9}    ),
+            (('a + i', 'b - 2i'),       12,     {'a': 2, 'b': 5}    ),
+            (('4 - 2i + i', '5i - 7'),  'inf',  {}                  ),
+        ]
+
+        for info in test_data:
+            seq = NTermRecursionSequence(*info[0], length=info[1])
+
+            for start, stop in [(0, 1), (0, 9), (3, 4), (2, 9), (5, 8)]:
+                values = list(seq.iter_values(start, stop, **info[2]))
+
+                self.assertEqual(
+                    seq.range_sum(start, stop, **info[2]), sum(values))
+                self.assertEqual(
+                    seq.range_min(start, stop, **info[2]), min(values))
+                self.assertEqual(
+                    seq.range_max(start, stop, **info[2]), max(values))
+
+                for low, high in [(-3, 3), (0, 10), (5, 4), (-20, 20)]:
+                    self.assertEqual(
+                        seq.count_between(low, high, start, stop, **info[2]),
+                        len([v for v in values if low <= v <= high])
+                    )
+
+        # symbolic results
+        seq = NTermRecursionSequence('3', '5', length='2k')
+        self.assertEqual(seq.range_sum(), LinearFormula('8k'))
+        self.assertEqual(
+            seq.range_sum(start=1, stop='2k + 1'), LinearFormula('8k'))
+
+        seq = NTermRecursionSequence('a + i', '2i', 'a', length='3k')
+        self.assertEqual(seq.range_sum(stop=6), LinearFormula('4a + 3'))
+        self.assertEqual(seq.range_sum(a=1, k=2), 7)
+        self.assertRaises(ValueError, seq.range_sum)
+        self.assertRaises(ValueError, seq.range_min)
+        self.assertEqual(seq.range_max(stop=6, a=0), 2)
+
+        seq = NTermRecursionSequence('a + 3', 'a', length='2k')
+        self.assertEqual(seq.range_min(), LinearFormula('a'))
+        self.assertEqual(seq.range_max(start=1), LinearFormula('a + 3'))
+
+        seq = NTermRecursionSequence('2i + 1', '2i + 4', length='2k')
+        self.assertEqual(seq.range_max(), LinearFormula('2 + 2k'))
+        self.assertEqual(seq.range_min(), 1)
+
+        seq = NTermRecursionSequence('2i + 1', '-2i + 2', length='2k')
+        self.assertRaises(ValueError, seq.range_max)
+        self.assertRaises(ValueError, seq.count_between, 0, 5)
+        self.assertEqual(seq.count_between(0, 5, k=4), 5)
+
+        # the position of the end of the range has to be known modulo n
+        self.assertRaises(ValueError, seq.range_sum, stop='k')
+        self.assertRaises(ValueError, seq.range_min, start=3, stop=3)
+        self.assertRaises(ValueError, NTermRecursionSequence('i').range_sum)
+
+    def test_find_collisions(self):
+
+        test_data = [
+            # sequence args                 other args              collisions
+            ((('2i', '2i + 1'), {}),        (('3i + 7', '5'), {}),
+                [(10, 2), (7, 0), (5, 1)]                                   ),
+            ((('2i', '2i + 1'), {'length': 6}),
+                                            (('3i + 7', '5'), {}),
+                [(5, 1)]                                                    ),
+            ((('4i', '4i + 2'), {}),        (('2i + 1',), {}),      []      ),
+            ((('5',), {'length': 1}),       (('i',), {}),           [(0, 5)]),
+            ((('-3i + 9',), {}),            (('2i', '7'), {'length': 4}),
+                [(3, 0)]                                                    ),
+        ]
+
+        for info in test_data:
+            seq = NTermRecursionSequence(*info[0][0], **info[0][1])
+            other = NTermRecursionSequence(*info[1][0], **info[1][1])
+            self.assertEqual(seq.find_collisions(other), info[2])
+
+        # collisions within the sequence
+        test_data = [
+            # init args                 length  values      collisions
+            (('i', '-i'),               'inf',  {},         [(0, 1)]        ),
+            (('i', 'i + a'),            10,     {'a': 2},   [(1, 4)]        ),
+            (('2i', '2i + 1'),          'inf',  {},         []              ),
+            (('a', '3'),                'k',    {'a': 3, 'k': 4},
+                [(0, 2), (0, 1), (1, 3)]                                    ),
+            (('a', '3'),                'k',    {'a': 3, 'k': 2},   [(0, 1)]),
+        ]
+
+        for info in test_data:
+            seq = NTermRecursionSequence(*info[0], length=info[1])
+            self.assertEqual(seq.find_collisions(**info[2]), info[3])
+
+        # compare with the evaluated sequences
+        seq = NTermRecursionSequence('3i - 7', '-2i + 20', '5', length=30)
+        other = NTermRecursionSequence('4i + 1', '6i + 2', length=25)
+        values = list(seq.iter_values())
+        other_values = list(other.iter_values())
+
+        collisions = seq.find_collisions(other)
+        for index, other_index in collisions:
+            self.assertEqual(values[index], other_values[other_index])
+
+        common = set(values) & set(other_values)
+        self.assertEqual(
+            len(collisions),
+            len({(values.index(v) % 3, other_values.index(v) % 2)
+                 for v in common})
+        )
+
+        seq = NTermRecursionSequence('a + i', '2i')
+        self.assertRaises(ValueError, seq.find_collisions)
+        self.assertRaises(ValueError, seq.find_collisions, a='b')
+
+    def test_index_of(self):
+
+        test_data = [
+            # init args                 length  values
+            (('a + b', '3i + 4', '4i'), 17,     {'a': 1, 'b': -3}   ),
+            (('i', '-i'),               'inf',  {}                  ),
+            (('1', 'a'),                'k',    {'a': 7, 'k': 9}    ),
+            (('a + i', 'b - 2i'),       12,     {'a': 2, 'b': 5}    ),
+            (('4 - 2i + i', '5i - 7'),  0,      {}                  ),
+        ]
+
+        for info in test_data:
+            seq = NTermRecursionSequence(*info[0], length=info[1])
+            stop = 100 if info[1] == 'inf' else None
+            values = list(seq.iter_values(0, stop, **info[2]))
+            array = np.arange(-20, 20).reshape(4, 10)
+
+            indices = seq.index_of_array(array, **info[2])
+            self.assertEqual(indices.dtype, np.int64)
+            self.assertEqual(indices.shape, (4, 10))
+
+            for value, index in zip(array.ravel(), indices.ravel()):
+                if value in values:
+                    self.assertEqual(index, values.index(value))
+                    self.assertEqual(
+                        seq.index_of(value, **info[2]), values.index(value))
+                else:
+                    self.assertEqual(index, -1)
+                    self.assertRaises(
+                        ValueError, seq.index_of, value, **info[2])
+
+        seq = NTermRecursionSequence('a + i', '2i')
+        self.assertRaises(ValueError, seq.index_of, 4)
+        self.assertRaises(ValueError, seq.index_of_array, [4])
+        self.assertEqual(seq.index_of(4, a=1), 5)
+
+    def test_cache(self):
+
+        # the split of the formulas is recomputed after modifications
+        seq = NTermRecursionSequence('a + i', '2i - b')
+        self.assertEqual(seq.evaluate(3), LinearFormula('2 - b'))
+
+        seq.substitute(b='3i', formulas_only=True, inplace=True)
+        self.assertEqual(seq.evaluate(3), LinearFormula('-1'))
+
+        seq.set_ntuple_index('j', inplace=True)
+        self.assertEqual(seq.evaluate(2), LinearFormula('a + 1'))
+        self.assertEqual(seq.get_edge(1), LinearFormula('2j - 3j + a + j + 1'))
+
+        seq.substitute(a=5, inplace=True)
+        self.assertEqual(list(seq.iter_values(0, 4)), [5, 0, 6, -1])
+
+        # the copies are independent
+        copy_of_seq = seq.copy()
+        copy_of_seq.substitute(j='2j', formulas_only=True, inplace=True)
+        self.assertEqual(seq.evaluate(2), LinearFormula(6))
+        self.assertEqual(copy_of_seq.evaluate(2), LinearFormula(7))
@@ -0,0 +1,72 @@
+import unittest
+from ..source.pattern_verifier import verify_pattern
+from ..source.sweep import sweep
+from ..source.cv_numbering import CentralVertexNumbering
+
+
+class TestPatternVerifier(unittest.TestCase):
+
+    def test_verify_pattern(self):
+
+        test_data = [
+            # init args/
+            # /properties that hold/
+            # /modulus
+            ((1, ('-i + k + 1', '-i + 2k + 1'), ('i + k + 2', 'i + 2'),
+              'k', 'k'),
+             ['bijective', 'distinct', 'consecutive', 'arithmetic'],
+             4),
+
+            ((1, ('2i + 2',), ('2i + 3',), 'k', 'k'),
+             ['bijective', 'distinct'],
+             2),
+
+            (('n', ('i + 1',), ('0',), 'n - 1', 0),
+             ['bijective'],
+             1),
+
+            ((0, ('i',), ('i',), 3, 2),
+             [],
+             0),
+        ]
+
+        for info in test_data:
+            pattern = CentralVertexNumbering(
+                *info[0][:3], left_len=info[0][3], right_len=info[0][4])
+            report = verify_pattern(pattern)
+
+            self.assertEqual(report.modulus, info[2])
+            self.assertEqual(report.unproven, [])
+            for prop in report.properties:
+                self.assertEqual(report.holds(prop), prop in info[1])
+
+            # the failures agree with the labelings of small cycles
+            failures = sweep(pattern, range(1, 30), workers=1)
+            failed = set(
+                prop for _, props in failures for prop, _ in props)
+            self.assertEqual(
+                failed, set(report.properties) - set(info[1]))
+
+    def test_verify_pattern_failures(self):
+
+        # the weights are distinct only for odd n
+        pattern = CentralVertexNumbering(
+            'n', ('i + 1',), ('0',), left_len='n - 1', right_len=0)
+        report = verify_pattern(pattern, properties=['bijective', 'distinct'])
+
+        self.assertEqual(report.properties, ['bijective', 'distinct'])
+        self.assertEqual(report.get_failures('bijective'), [])
+        self.assertEqual(report.get_failures()[0], (2, 'distinct', (1, 0)))
+        self.assertRaises(ValueError, report.holds, 'consecutive')
+
+    def test_verify_pattern_errors(self):
+
+        pattern = CentralVertexNumbering(
+            0, ('i',), ('i',), left_len='a', right_len='b')
+        self.assertRaises(ValueError, verify_pattern, pattern)
+        self.assertRaises(
+            ValueError, verify_pattern, pattern, properties=['x'], a=1)
+
+        pattern = CentralVertexNumbering(
+            0, ('i',), ('i',), left_len='5 - k', right_len='2k')
+        self.assertRaises(ValueError, verify_pattern, pattern)
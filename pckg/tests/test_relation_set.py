@@ -0,0 +1,179 @@
+import unittest
+from ..source.relation_set import RelationSet
+from ..source.linear_formula import LinearFormula
+from ..source.linear_relation import LinearRelation
+
+
+class TestRelationSet(unittest.TestCase):
+
+
+    #-INIT--------------------------------------------------------------------
+
+    def test_init(self):
+
+        test_data = [
+            # relations                             expected relations
+            (('a == b', 'b == a', '2a == 2b'),      ('a == b',)             ),
+            (('a <= 3', 'a <= 5'),                  ('a <= 3',)             ),
+            (('a <= 5', 'a <= 3'),                  ('a <= 3',)             ),
+            (('a <= 5', '2a <= 6', 'a < 3'),        ('a < 3',)              ),
+            (('a < 3', 'a <= 3'),                   ('a < 3',)              ),
+            (('a + b <= 3', '3 >= b + a + 1'),      ('a + b <= 2',)         ),
+            (('a <= 3', 'a >= 3', 'a == 3'),
+             ('a <= 3', 'a >= 3', 'a == 3')                                 ),
+            (('a <= 3', '-a <= -5', 'a >= 4'),      ('a <= 3', 'a >= 5')    ),
+            (('2a + 2b <= 3', 'a + b <= 1'),        ('a + b <= 1',)         ),
+            (('a - b <= 1', 'a + b <= 0'),
+             ('a - b <= 1', 'a + b <= 0')                                   ),
+        ]
+
+        for info in test_data:
+            relation_set = RelationSet(*info[0])
+            self.assertEqual(len(relation_set), len(info[1]))
+            for relation in info[1]:
+                self.assertIn(relation, relation_set)
+
+            # init with another set
+            self.assertEqual(RelationSet(relation_set), relation_set)
+
+    #-------------------------------------------------------------------------
+
+
+    #-MODIFIERS---------------------------------------------------------------
+
+    def test_add(self):
+
+        relation_set = RelationSet()
+        self.assertTrue(relation_set.add('a + b <= 5'))
+        self.assertFalse(relation_set.add('b + a <= 5'))
+        self.assertFalse(relation_set.add('2a + 2b <= 11'))
+        self.assertTrue(relation_set.add(LinearRelation('a + b < 5')))
+        self.assertNotIn('a + b <= 5', relation_set)
+        self.assertTrue(relation_set.add('a == c'))
+        self.assertFalse(relation_set.add('c - a == 0'))
+        self.assertEqual(len(relation_set), 2)
+
+        # the set keeps it's own copies of the relations
+        relation = LinearRelation('x <= 0')
+        relation_set.add(relation)
+        relation.left += 'y'
+        self.assertIn('x <= 0', relation_set)
+
+    def test_remove(self):
+
+        relation_set = RelationSet('a <= 3', 'a == b')
+        relation_set.remove('2a <= 6')
+        self.assertEqual(relation_set, RelationSet('a == b'))
+        self.assertRaises(KeyError, relation_set.remove, 'a <= 3')
+
+        relation_set.discard('a <= 3')
+        relation_set.discard('b == a')
+        self.assertEqual(len(relation_set), 0)
+
+        # removed inequalities don't imply anything
+        self.assertTrue(relation_set.add('a <= 5'))
+
+    #-------------------------------------------------------------------------
+
+
+    #-OTHER-------------------------------------------------------------------
+
+    def test_implies(self):
+
+        relation_set = RelationSet('a + b <= 3', 'a >= 1', 'c == d')
+
+        test_data = [
+            ('a + b <= 3',  True    ),
+            ('a + b <= 4',  True    ),
+            ('a + b < 4',   True    ),
+            ('a + b < 3',   False   ),
+            ('a + b >= 3',  False   ),
+            ('a >= 0',      True    ),
+            ('a > 0',       True    ),
+            ('a > 1',       False   ),
+            ('a <= 1',      False   ),
+            ('d == c',      True    ),
+            ('c == d + 1',  False   ),
+        ]
+
+        for info in test_data:
+            self.assertEqual(relation_set.implies(info[0]), info[1])
+
+    def test_propagate_bounds(self):
+
+        test_data = [
+            # relations/
+            # /given lower and upper bounds/
+            # /expected lower and upper bounds
+            (('a >= 1', 'b >= 1', 'a + b <= 10'),
+             {},                    {},
+             {'a': 1, 'b': 1},      {'a': 9, 'b': 9}                    ),
+
+            (('a >= 1', 'b >= 1', 'a + b <= 10', 'b == 2a'),
+             {},                    {},
+             {'a': 1, 'b': 2},      {'a': 4, 'b': 8}                    ),
+
+            (('a < b', 'b < c'),
+             {'a': 0},              {'c': 5},
+             {'a': 0, 'b': 1, 'c': 2},
+             {'a': 3, 'b': 4, 'c': 5}                                   ),
+
+            (('2a <= 7',),
+             {},                    {},
+             {},                    {'a': 3}                            ),
+
+            (('2a >= 7', 'a <= b'),
+             {'b': 'c'},            {},
+             {'a': 4, 'b': 4},      {}                                  ),
+
+            (('n == 4k + 1', 'k >= 1'),
+             {},                    {'n': 21},
+             {'n': 5, 'k': 1},      {'n': 21, 'k': 5}                   ),
+        ]
+
+        for info in test_data:
+            relation_set = RelationSet(*info[0])
+            lower, upper = relation_set.propagate_bounds(info[1], info[2])
+            self.assertEqual(lower, info[3])
+            self.assertEqual(upper, info[4])
+
+        # the results can be passed to <LinearFormula.get_bounds>
+        relation_set = RelationSet('a >= 1', 'b >= 1', 'a + b <= 10')
+        bounds = LinearFormula('a - b').get_bounds(
+            *relation_set.propagate_bounds())
+        self.assertEqual(bounds, (LinearFormula(-8), LinearFormula(8)))
+
+        test_data = [
+            ('a >= 1', 'a <= 0'),
+            ('a < b', 'b < a', 'a >= 0', 'b <= 10'),
+            ('1 <= 0',),
+        ]
+
+        for relations in test_data:
+            relation_set = RelationSet(*relations)
+            self.assertRaises(ValueError, relation_set.propagate_bounds)
+
+        # the number of revisions is limited, the bounds that did not
+        # converge are not returned
+        relation_set = RelationSet('a < b', 'b < a', 'a >= 0')
+        self.assertRaises(
+            ValueError, relation_set.propagate_bounds, max_revisions=10)
+
+        relation_set = RelationSet('a >= 0', 'a < b', 'b < c', 'c <= 10')
+        self.assertRaises(
+            ValueError, relation_set.propagate_bounds, max_revisions=2)
+        self.assertEqual(
+            relation_set.propagate_bounds(max_revisions=100),
+            ({'a': 0, 'b': 1, 'c': 2}, {'a': 8, 'b': 9, 'c': 10})
+        )
+
+    def test_copy(self):
+
+        relation_set = RelationSet('a <= 3', 'a == b')
+        copy_of_set = relation_set.copy()
+        self.assertEqual(relation_set, copy_of_set)
+
+        copy_of_set.add('c == 0')
+        self.assertNotEqual(relation_set, copy_of_set)
+
+    #-------------------------------------------------------------------------
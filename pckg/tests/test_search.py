@@ -0,0 +1,77 @@
+import unittest
+from ..source.search import search
+from ..source.pattern_verifier import verify_pattern
+from ..source.cv_numbering import CentralVertexNumbering
+from ..source.verifier import verify_labeling
+
+
+class TestSearch(unittest.TestCase):
+
+    def test_search(self):
+
+        properties = ['bijective', 'consecutive']
+        keys = {}
+        for workers in [1, 2]:
+            patterns = list(search(
+                'k', 'k', 2, 2, slopes=range(-1, 2), multipliers=range(3),
+                constants=range(-1, 3), properties=properties,
+                workers=workers
+            ))
+
+            # the three known patterns with consecutive weights of the odd
+            # cycles, each found once
+            keys[workers] = [
+                pattern.get_canonical_key() for pattern in patterns]
+            self.assertEqual(len(patterns), 3)
+            self.assertEqual(len(set(keys[workers])), 3)
+
+            for pattern in patterns:
+                self.assertEqual(type(pattern), CentralVertexNumbering)
+                report = verify_pattern(pattern, properties=properties)
+                self.assertEqual(report.unproven, [])
+                self.assertTrue(all(report.holds(prop) for prop in properties))
+
+        self.assertEqual(set(keys[1]), set(keys[2]))
+
+    def test_search_numbers(self):
+
+        # the lengths do not depend on any variable
+        patterns = list(search(
+            2, 2, slopes=[1], constants=range(1, 6), properties=('bijective',),
+            workers=1
+        ))
+
+        # one labeling of every pair of mirror images
+        labelings = sorted(
+            [int(x) for x in pattern.actualize(5)] for pattern in patterns)
+        self.assertEqual(labelings, [
+            [1, 2, 3, 5, 4], [3, 1, 2, 5, 4], [5, 1, 2, 4, 3]
+        ])
+
+    def test_search_consecutive(self):
+
+        # without 'bijective' the labels are not 1, 2, ..., n, so the
+        # consecutive weights can be any consecutive numbers
+        patterns = list(search(
+            2, 2, slopes=range(-1, 2), constants=range(1, 6),
+            properties=('consecutive',), workers=1
+        ))
+
+        labelings = [
+            [int(x) for x in pattern.actualize(5)] for pattern in patterns]
+        self.assertEqual(len(labelings), 13)
+        self.assertIn([2, 4, 4, 5, 5], labelings)
+        self.assertIn([3, 5, 5, 4, 3], labelings)
+        for labels in labelings:
+            self.assertTrue(verify_labeling(labels).holds('consecutive'))
+
+    def test_search_errors(self):
+
+        self.assertRaises(
+            ValueError, list, search('k', 'k', properties=['injective']))
+        self.assertRaises(ValueError, list, search('k', 'k', workers=0))
+        self.assertRaises(ValueError, list, search('k', 'k', 0, 1))
+        self.assertRaises(ValueError, list, search('a', 'b'))
+        self.assertRaises(ValueError, list, search('i', 'i'))
+        self.assertRaises(ValueError, list, search('5 - k', 'k'))
+        self.assertRaises(ValueError, list, search(1, 'k'))
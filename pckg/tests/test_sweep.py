@@ -0,0 +1,107 @@
+import itertools
+import unittest
+from ..source.sweep import sweep, get_values
+from ..source.verifier import verify_numbering
+from ..source.cv_numbering import CentralVertexNumbering
+
+
+class TestSweep(unittest.TestCase):
+
+    def test_get_values(self):
+
+        test_data = [
+            # init args/
+            # /values/
+            # /(n, expected values) cd.
+            ((1, ('2i + 2',), ('2i + 3',), 'k', 'k'),
+             {},
+             (7, {'k': 3}),     (8, None),  (1, {'k': 0}),  (0, None)),
+
+            (('n', ('i + 1',), ('a',), 'n - 1', 0),
+             {'a': 2},
+             (5, {'a': 2, 'n': 5}),         (1, {'a': 2, 'n': 1})),
+
+            ((0, ('i',), ('i',), 'k + 1', '2k'),
+             {},
+             (8, {'k': 2}),     (9, None),      (2, {'k': 0})),
+
+            ((0, ('i',), ('i',), 3, 2),
+             {},
+             (6, {}),           (7, None)),
+        ]
+
+        for info in test_data:
+            pattern = CentralVertexNumbering(
+                *info[0][:3], left_len=info[0][3], right_len=info[0][4])
+            for n, expected_values in info[2:]:
+                self.assertEqual(
+                    get_values(pattern, n, **info[1]), expected_values)
+
+        pattern = CentralVertexNumbering(
+            0, ('i',), ('i',), left_len='a', right_len='b')
+        self.assertRaises(ValueError, get_values, pattern, 5)
+        self.assertEqual(get_values(pattern, 5, a=1), {'a': 1, 'b': 3})
+
+    def test_sweep(self):
+
+        pattern = CentralVertexNumbering(
+            1, ('2i + 2',), ('2i + 3',), left_len='k', right_len='k')
+
+        expected_results = []
+        for n in range(1, 30, 2):
+            report = verify_numbering(pattern, n, k=(n - 1) // 2)
+            expected_results.append((n, report.get_failures()))
+
+        for workers in [1, 2]:
+            results = list(sweep(
+                pattern, range(1, 30), workers=workers, chunk_size=4))
+            self.assertEqual(sorted(results), expected_results)
+
+        results = list(sweep(
+            pattern, range(1, 30), workers=2, properties=['bijective']))
+        self.assertEqual(
+            sorted(results), [(n, []) for n in range(1, 30, 2)])
+
+        # iterables without a length, read lazily
+        for workers in [1, 2]:
+            results = list(sweep(
+                pattern, (n for n in range(1, 30)), workers=workers))
+            self.assertEqual(sorted(results), expected_results)
+
+        self.assertRaises(
+            ValueError, list, sweep(pattern, [3], properties=['injective']))
+        self.assertRaises(ValueError, list, sweep(pattern, [3], workers=0))
+
+    def test_sweep_stop_on_failure(self):
+
+        # the weights are distinct only for odd n
+        pattern = CentralVertexNumbering(
+            'n', ('i + 1',), ('0',), left_len='n - 1', right_len=0)
+
+        results = list(sweep(
+            pattern, range(1, 40), workers=1, chunk_size=1,
+            properties=['bijective', 'distinct'], stop_on_failure=True
+        ))
+        self.assertEqual(results, [(1, []), (2, [('distinct', (1, 0))])])
+
+        results = list(sweep(
+            pattern, range(1, 40), workers=2, chunk_size=1,
+            properties=['bijective', 'distinct'], stop_on_failure=True
+        ))
+        self.assertTrue(results[-1][1] != [])
+        self.assertTrue(all(failures == [] for _, failures in results[:-1]))
+
+        results = list(sweep(
+            pattern, range(1, 40), workers=2, chunk_size=5,
+            properties=['bijective', 'distinct']
+        ))
+        self.assertEqual(len(results), 39)
+
+        # an unbounded range, only the lengths up to the failure are verified
+        for workers in [1, 2]:
+            results = list(sweep(
+                pattern, itertools.count(1), workers=workers, chunk_size=3,
+                properties=['bijective', 'distinct'], stop_on_failure=True
+            ))
+            self.assertTrue(any(failures != [] for _, failures in results))
+            self.assertTrue(all(n < 100 for n, _ in results))
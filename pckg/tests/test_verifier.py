@@ -0,0 +1,212 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from ..source.verifier import (
+    LabelingReport, verify_labeling, verify_total_labeling, verify_numbering,
+    verify_file)
+from ..source.cv_numbering import CentralVertexNumbering
+
+
+class TestVerifier(unittest.TestCase):
+
+    def test_verify_labeling(self):
+
+        test_data = [
+            # labels/
+            # /counterexamples of bijective, distinct, consecutive,
+            # arithmetic/
+            # /difference
+            ([1, 2, 3],
+             None, None, None, None, 1),
+
+            ([1, 3, 5, 2, 4],
+             None, None, None, None, 1),
+
+            ([3, 1, 2, 4],
+             None, None, (4, 6), (4, 6), None),
+
+            ([1, 4, 2, 3],
+             None, (2, 0), (5, 5), (5, 5), None),
+
+            ([1, 2, 2, 5],
+             (2, 2), None, (4, 6), (4, 6), None),
+
+            ([1, 0, 2],
+             (1, 0), None, None, None, 1),
+
+            ([2, 2, 7, 1],
+             (1, 2), None, (4, 8), (4, 8), None),
+
+            ([1, 1, 3, 5],
+             (1, 1), None, (2, 4), None, 2),
+
+            ([1],
+             None, None, None, None, 0),
+        ]
+
+        for info in test_data:
+            report = verify_labeling(info[0])
+            self.assertEqual(type(report), LabelingReport)
+            self.assertEqual(report.n, len(info[0]))
+
+            for prop, counterexample in zip(
+                    LabelingReport.properties, info[1:5]):
+                self.assertEqual(
+                    report.get_counterexample(prop), counterexample)
+                self.assertEqual(report.holds(prop), counterexample is None)
+
+            self.assertEqual(report.difference, info[5])
+
+            weights = [
+                info[0][k] + info[0][(k + 1) % len(info[0])]
+                for k in range(len(info[0]))
+            ]
+            self.assertEqual(list(report.edge_weights), weights)
+
+        report = verify_labeling(np.array([1, 4, 2, 3]))
+        self.assertEqual(
+            report.get_failures(),
+            [('distinct', (2, 0)), ('consecutive', (5, 5)),
+             ('arithmetic', (5, 5))]
+        )
+        self.assertEqual(report.get_failures('bijective'), [])
+        self.assertRaises(ValueError, report.holds, 'injective')
+
+        self.assertRaises(ValueError, verify_labeling, [])
+        self.assertRaises(ValueError, verify_labeling, [[1, 2], [3, 4]])
+
+    def test_verify_total_labeling(self):
+
+        test_data = [
+            # vertex labels/
+            # /edge labels/
+            # /counterexamples of bijective, distinct, consecutive,
+            # arithmetic/
+            # /difference
+            ([1, 3, 2], [5, 4, 6],
+             None, (1, 0), (9, 9), None, 0),
+
+            ([1, 2, 3], [4, 5, 6],
+             None, (2, 1), (7, 10), (10, 10), None),
+
+            ([4, 2, 3], [1, 5, 6],
+             (0, 4), None, (7, 10), None, 3),
+
+            ([1, 2, 3], [3, 5, 6],
+             (3, 3), (2, 1), (6, 10), (10, 10), None),
+        ]
+
+        for info in test_data:
+            report = verify_total_labeling(info[0], info[1])
+            self.assertEqual(report.n, len(info[0]))
+            self.assertEqual(list(report.labels), info[0] + info[1])
+
+            for prop, counterexample in zip(
+                    LabelingReport.properties, info[2:6]):
+                self.assertEqual(
+                    report.get_counterexample(prop), counterexample)
+
+            self.assertEqual(report.difference, info[6])
+
+        self.assertRaises(ValueError, verify_total_labeling, [1, 2], [3])
+        self.assertRaises(ValueError, verify_total_labeling, [], [])
+
+    def test_verify_labeling_large(self):
+
+        # the weights of the labels 1, 2, ..., n are 3, 5, ..., 2n - 1 and
+        # n + 1, so for odd n they are distinct
+        n = 200001
+        labels = np.arange(1, n + 1)
+
+        report = verify_labeling(labels)
+        self.assertEqual(
+            report.get_failures(),
+            [('consecutive', (3, 5)), ('arithmetic', (n, n + 1))]
+        )
+
+        labels[1000] = labels[999]
+        report = verify_labeling(labels)
+        self.assertEqual(report.get_counterexample('bijective'), (1000, 1000))
+
+        labels[10] = 0
+        report = verify_labeling(labels)
+        self.assertEqual(report.get_counterexample('bijective'), (10, 0))
+
+    def test_verify_numbering(self):
+
+        pattern = CentralVertexNumbering(
+            1, ('2i + 2',), ('2i + 3',), left_len='k', right_len='k')
+        report = verify_numbering(pattern, 7, k=3)
+        self.assertEqual(list(report.labels), [1, 3, 5, 7, 6, 4, 2])
+        self.assertEqual(report.get_failures('bijective', 'distinct'), [])
+        self.assertEqual(report.get_counterexample('consecutive'), (4, 6))
+
+        self.assertRaises(ValueError, verify_numbering, pattern, 8, k=3)
+
+    def test_verify_file(self):
+
+        test_data = [
+            # vertex labels/
+            # /edge labels (None for labelings of the vertices)
+            ([1, 2, 3], None),
+            ([1, 3, 5, 2, 4], None),
+            ([3, 1, 2, 4], None),
+            ([1, 4, 2, 3], None),
+            ([1, 2, 2, 5], None),
+            ([1, 0, 2], None),
+            ([2, 2, 7, 1], None),
+            ([1, 1, 3, 5], None),
+            ([1], None),
+            ([5, 1, 9, 9, 2, 7, 7, 3, 0, 4], None),
+            ([1, 3, 2], [5, 4, 6]),
+            ([1, 2, 3], [4, 5, 6]),
+            ([4, 2, 3], [1, 5, 6]),
+            ([1, 2, 3], [3, 5, 6]),
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'labeling.npy')
+
+            for info in test_data:
+                if info[1] is None:
+                    expected = verify_labeling(info[0])
+                    rows = [info[0]]
+                else:
+                    expected = verify_total_labeling(info[0], info[1])
+                    rows = [info[0], info[1]]
+
+                rows.append(list(expected.edge_weights))
+                np.save(path, np.array(rows, dtype=np.int64))
+
+                # the result does not depend on the size of the chunks
+                for chunk in [1, 2, 3, 100]:
+                    report = verify_file(path, chunk=chunk)
+                    self.assertEqual(report.n, len(info[0]))
+                    self.assertEqual(
+                        report.counterexamples, expected.counterexamples)
+                    self.assertEqual(report.difference, expected.difference)
+                    self.assertEqual(
+                        list(report.labels), list(expected.labels))
+
+            # the labels of a big cycle, the weights of the edges are
+            # 3, 5, ..., 2n - 1 and n + 1
+            n = 200001
+            labels = np.arange(1, n + 1)
+            np.save(path, np.array([labels, labels + np.roll(labels, -1)]))
+            report = verify_file(path, chunk=1000, bitmap_dir=directory)
+            self.assertEqual(
+                report.get_failures(),
+                [('consecutive', (3, 5)), ('arithmetic', (n, n + 1))]
+            )
+
+            self.assertRaises(ValueError, verify_file, path, chunk=0)
+            self.assertRaises(TypeError, verify_file, path, chunk=1.5)
+
+            for array in [
+                    np.arange(5),
+                    np.ones((4, 3), dtype=np.int64),
+                    np.ones((2, 0), dtype=np.int64),
+                    np.ones((2, 3), dtype=np.float64)]:
+                np.save(path, array)
+                self.assertRaises(ValueError, verify_file, path)